@@ -0,0 +1,251 @@
+"""Módulo do pipeline produtor/consumidor que sobrepõe a leitura do banco e a gravação em disco.
+
+O produtor lê os lotes do cursor e o consumidor os grava, ligados por uma fila limitada que
+aplica contrapressão: quando a gravação é mais lenta, o produtor aguarda espaço na fila; quando a
+leitura é mais lenta, o consumidor aguarda novos lotes. Assim, o tempo total tende a
+`max(leitura, gravação)` em vez da soma das duas etapas.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+import queue
+import threading
+import time
+from typing import Any
+
+QUEUE_POLL_INTERVAL: float = 0.1
+"""Intervalo, em segundos, em que o produtor verifica a interrupção enquanto a fila está cheia."""
+
+
+@dataclass
+class PipelineMetrics:
+    """Métricas de uma execução do pipeline."""
+
+    batches: int = 0
+    """Quantidade de lotes transferidos do produtor para o consumidor."""
+
+    max_depth: int = 0
+    """Maior quantidade de lotes aguardando na fila."""
+
+    depth_total: int = 0
+    """Soma da profundidade da fila observada a cada lote consumido (para a média)."""
+
+    producer_stall: float = 0.0
+    """Tempo, em segundos, que o produtor aguardou espaço na fila (gravação mais lenta)."""
+
+    consumer_stall: float = 0.0
+    """Tempo, em segundos, que o consumidor aguardou novos lotes (leitura mais lenta)."""
+
+    produce_time: float = 0.0
+    """Tempo, em segundos, gasto na leitura dos lotes."""
+
+    consume_time: float = 0.0
+    """Tempo, em segundos, gasto na gravação dos lotes."""
+
+    elapsed: float = 0.0
+    """Tempo total da execução, em segundos."""
+
+    @property
+    def avg_depth(self) -> float:
+        """Profundidade média da fila observada pelo consumidor."""
+        return self.depth_total / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Retorna as métricas em um dicionário, com os tempos arredondados."""
+        metrics = {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+        metrics["avg_depth"] = round(self.avg_depth, 2)
+        return metrics
+
+    def __str__(self) -> str:
+        """Resume as métricas em uma linha para o log."""
+        return (
+            f"{self.batches} lotes em {self.elapsed:.3f}s (leitura {self.produce_time:.3f}s, "
+            f"gravação {self.consume_time:.3f}s); fila média {self.avg_depth:.1f}, "
+            f"máxima {self.max_depth}; espera do produtor {self.producer_stall:.3f}s, "
+            f"do consumidor {self.consumer_stall:.3f}s"
+        )
+
+
+class _EndOfStream:
+    """Marca o fim dos lotes do produtor, com o erro ocorrido, se houver."""
+
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+class BatchPipeline:
+    """Executa a leitura e a gravação dos lotes em paralelo, ligadas por uma fila limitada.
+
+    **Exemplo de uso**:
+
+        pipeline = BatchPipeline(max_depth=4)
+        metrics = pipeline.run(db_handler.fetch_batches(query, 50_000), writer.write_batch)
+    """
+
+    def __init__(self, max_depth: int = 4) -> None:
+        """Inicializa o pipeline com a quantidade máxima de lotes em espera na fila."""
+        if max_depth < 1:
+            msg = f"Profundidade de fila inválida: {max_depth}"
+            raise ValueError(msg)
+        self.max_depth: int = max_depth
+        """Quantidade máxima de lotes lidos aguardando a gravação."""
+
+    def run(self, batches: Iterator[Any], consume: Callable[[Any], None]) -> PipelineMetrics:
+        """Lê os lotes em uma thread produtora e os consome na thread atual.
+
+        Erros do produtor são relançados no consumidor. Se o consumidor falhar, o produtor é
+        interrompido antes de ler o próximo lote.
+        """
+        metrics = PipelineMetrics()
+        batch_queue: queue.Queue[Any] = queue.Queue(maxsize=self.max_depth)
+        stop_event = threading.Event()
+        started_at = time.perf_counter()
+        producer = threading.Thread(
+            target=self._produce,
+            args=(batches, batch_queue, stop_event, metrics),
+            name="pipeline-producer",
+            daemon=True,
+        )
+        producer.start()
+        try:
+            while True:
+                wait_started_at = time.perf_counter()
+                depth = batch_queue.qsize()
+                item = batch_queue.get()
+                metrics.consumer_stall += time.perf_counter() - wait_started_at
+                if isinstance(item, _EndOfStream):
+                    if item.error is not None:
+                        raise item.error
+                    break
+                metrics.batches += 1
+                metrics.depth_total += depth
+                metrics.max_depth = max(metrics.max_depth, depth)
+                consume_started_at = time.perf_counter()
+                consume(item)
+                metrics.consume_time += time.perf_counter() - consume_started_at
+        finally:
+            stop_event.set()
+            producer.join()
+            metrics.elapsed = time.perf_counter() - started_at
+        return metrics
+
+    def _produce(
+        self,
+        batches: Iterator[Any],
+        batch_queue: "queue.Queue[Any]",
+        stop_event: threading.Event,
+        metrics: PipelineMetrics,
+    ) -> None:
+        """Lê os lotes e os envia para a fila, aguardando espaço quando ela está cheia."""
+        error: BaseException | None = None
+        try:
+            while not stop_event.is_set():
+                produce_started_at = time.perf_counter()
+                batch = next(batches, None)
+                metrics.produce_time += time.perf_counter() - produce_started_at
+                if batch is None:
+                    break
+                if not self._put(batch_queue, batch, stop_event, metrics):
+                    return
+        except Exception as e:  # noqa: BLE001
+            error = e
+        self._put(batch_queue, _EndOfStream(error), stop_event, metrics)
+
+    @staticmethod
+    def _put(
+        batch_queue: "queue.Queue[Any]",
+        item: Any,
+        stop_event: threading.Event,
+        metrics: PipelineMetrics,
+    ) -> bool:
+        """Envia o item para a fila, retornando `False` se o pipeline foi interrompido."""
+        wait_started_at = time.perf_counter()
+        while not stop_event.is_set():
+            try:
+                batch_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            metrics.producer_stall += time.perf_counter() - wait_started_at
+            return True
+        return False
+
+    async def run_async(
+        self,
+        batches: Iterator[Any],
+        consume: Callable[[Any], None],
+        executor: Executor | None = None,
+    ) -> PipelineMetrics:
+        """Versão `asyncio` de `run`: leitura e gravação executadas em threads do loop.
+
+        As chamadas bloqueantes (`next` no cursor e `consume`) são delegadas ao `executor` (ou ao
+        executor padrão do loop), sem bloquear o loop de eventos, e ligadas por uma
+        `asyncio.Queue`. Se a tarefa for cancelada ou o consumidor falhar, a leitura e a gravação
+        em andamento são aguardadas antes do retorno, já que as threads não podem ser
+        interrompidas.
+        """
+        loop = asyncio.get_running_loop()
+        metrics = PipelineMetrics()
+        batch_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.max_depth)
+        started_at = time.perf_counter()
+
+        async def produce() -> None:
+            error: BaseException | None = None
+            try:
+                while True:
+                    produce_started_at = time.perf_counter()
+                    batch = await _run_to_completion(loop, executor, next, batches, None)
+                    metrics.produce_time += time.perf_counter() - produce_started_at
+                    if batch is None:
+                        break
+                    wait_started_at = time.perf_counter()
+                    await batch_queue.put(batch)
+                    metrics.producer_stall += time.perf_counter() - wait_started_at
+            except Exception as e:  # noqa: BLE001
+                error = e
+            await batch_queue.put(_EndOfStream(error))
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                wait_started_at = time.perf_counter()
+                depth = batch_queue.qsize()
+                item = await batch_queue.get()
+                metrics.consumer_stall += time.perf_counter() - wait_started_at
+                if isinstance(item, _EndOfStream):
+                    if item.error is not None:
+                        raise item.error
+                    break
+                metrics.batches += 1
+                metrics.depth_total += depth
+                metrics.max_depth = max(metrics.max_depth, depth)
+                consume_started_at = time.perf_counter()
+                await _run_to_completion(loop, executor, consume, item)
+                metrics.consume_time += time.perf_counter() - consume_started_at
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            metrics.elapsed = time.perf_counter() - started_at
+        return metrics
+
+
+async def _run_to_completion(
+    loop: asyncio.AbstractEventLoop, executor: Executor | None, func: Callable[..., Any], *args: Any
+) -> Any:
+    """Executa a chamada bloqueante no executor e, se a tarefa for cancelada, aguarda o seu fim.
+
+    Sem a espera, a chamada continuaria na thread após o retorno do pipeline (ex.: `next` no
+    cursor concorrendo com o seu fechamento).
+    """
+    future = loop.run_in_executor(executor, func, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        with suppress(Exception):
+            await future
+        raise
@@ -0,0 +1,174 @@
+"""Módulo do cancelamento cooperativo das consultas de uma exportação.
+
+O token é compartilhado pelas conexões de uma exportação (inclusive as das consultas paralelas e
+das faixas). Ao ser cancelado, interrompe as consultas em execução no banco (ex.:
+`cursor.cancel()`) e faz com que as leituras seguintes falhem com `QueryCancelledError`, de modo
+que as conexões sejam devolvidas e os arquivos temporários descartados pelo fluxo de erro usual.
+
+Os prazos (`deadline`) cancelam o token com `timed_out`, e o `Ctrl+C` (`cancel_on_interrupt`)
+cancela as consultas em execução no banco antes de interromper o programa.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import signal
+import threading
+import types
+from typing import Protocol, Self
+
+
+class QueryCancelledError(RuntimeError):
+    """Consulta interrompida pelo cancelamento da exportação."""
+
+
+class QueryTimeoutError(QueryCancelledError):
+    """Consulta interrompida pelo fim do prazo da consulta ou da execução."""
+
+
+class Cancellable(Protocol):
+    """Objeto cuja operação em andamento pode ser interrompida por outra thread."""
+
+    def cancel(self) -> None:
+        """Interrompe a operação em andamento."""
+
+
+class CancellationToken:
+    """Sinaliza o cancelamento de uma exportação às conexões registradas, de forma thread-safe.
+
+    **Exemplo de uso**:
+
+        token = CancellationToken()
+        db_handler.cancel_token = token
+        threading.Timer(60, token.cancel, args=("tempo esgotado",)).start()
+    """
+
+    def __init__(self, parent: "CancellationToken | None" = None) -> None:
+        """Inicializa o token sem cancelamento.
+
+        Com `parent`, o token é cancelado junto com ele (ex.: o token de uma consulta é cancelado
+        pelo fim do prazo da execução), mas o seu cancelamento não afeta o `parent`.
+        """
+        self.reason: str | None = None
+        """Motivo do cancelamento, ou `None` se o token não foi cancelado."""
+
+        self.timed_out: bool = False
+        """Indica se o cancelamento ocorreu pelo fim de um prazo."""
+
+        self.parent: CancellationToken | None = parent
+        """Token cujo cancelamento também cancela este."""
+
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._active: set[Cancellable] = set()
+        self._children: set[CancellationToken] = set()
+        if parent is not None:
+            parent.add_child(self)
+
+    def __enter__(self) -> Self:
+        """Retorna o token ao entrar no contexto."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Desvincula o token do `parent` ao sair do contexto."""
+        if self.parent is not None:
+            self.parent.remove_child(self)
+
+    @property
+    def cancelled(self) -> bool:
+        """Indica se o token foi cancelado."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "exportação cancelada", *, timed_out: bool = False) -> None:
+        """Cancela o token e interrompe as operações registradas em andamento."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self.timed_out = timed_out
+            self._event.set()
+            active = list(self._active)
+            children = list(self._children)
+        for child in children:
+            child.cancel(reason, timed_out=timed_out)
+        for operation in active:
+            operation.cancel()
+
+    def register(self, operation: Cancellable) -> None:
+        """Registra uma operação em andamento, interrompida se o token for cancelado."""
+        with self._lock:
+            self._active.add(operation)
+            cancelled = self._event.is_set()
+        if cancelled:
+            operation.cancel()
+
+    def unregister(self, operation: Cancellable) -> None:
+        """Remove o registro de uma operação concluída."""
+        with self._lock:
+            self._active.discard(operation)
+
+    def raise_if_cancelled(self, cause: BaseException | None = None) -> None:
+        """Lança `QueryCancelledError`, ou `QueryTimeoutError`, se o token foi cancelado."""
+        if self._event.is_set():
+            error_class = QueryTimeoutError if self.timed_out else QueryCancelledError
+            raise error_class(self.reason) from cause
+
+    def add_child(self, child: "CancellationToken") -> None:
+        """Vincula um token filho, cancelado imediatamente se este já foi cancelado."""
+        with self._lock:
+            self._children.add(child)
+            cancelled = self._event.is_set()
+        if cancelled:
+            child.cancel(self.reason or "exportação cancelada", timed_out=self.timed_out)
+
+    def remove_child(self, child: "CancellationToken") -> None:
+        """Desvincula um token filho concluído."""
+        with self._lock:
+            self._children.discard(child)
+
+
+@contextmanager
+def deadline(token: CancellationToken, seconds: float | None, reason: str) -> Iterator[None]:
+    """Cancela o token com `timed_out` se o bloco não terminar em `seconds` segundos.
+
+    O prazo é controlado por um `threading.Timer`, que interrompe a consulta em execução no banco
+    a partir de outra thread. Sem `seconds` (ou com `0`), não há prazo.
+    """
+    if not seconds:
+        yield
+        return
+    timer = threading.Timer(seconds, token.cancel, args=(reason,), kwargs={"timed_out": True})
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+
+
+@contextmanager
+def cancel_on_interrupt(token: CancellationToken) -> Iterator[None]:
+    """Cancela o token no `Ctrl+C` (SIGINT) antes de lançar `KeyboardInterrupt`.
+
+    Assim, as consultas em execução nas threads da exportação são canceladas no banco em vez de
+    continuarem no servidor. Fora da thread principal, onde os sinais não são tratados, não tem
+    efeito. Uma leitura bloqueada no driver na própria thread principal só é interrompida quando
+    o driver devolve o controle ao Python.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle_interrupt(_signum: int, _frame: types.FrameType | None) -> None:
+        token.cancel("interrompida pelo usuário")
+        raise KeyboardInterrupt
+
+    previous_handler = signal.signal(signal.SIGINT, handle_interrupt)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
@@ -0,0 +1,155 @@
+"""Módulo de instrumentação das etapas de cada consulta de uma execução.
+
+Cada etapa (leitura do `.sql`, conexão, execução, primeira linha, leitura dos lotes, serialização
+e gravação) acumula a quantidade de chamadas, linhas, bytes e os tempos de parede e de CPU. O
+tempo de CPU é o da thread que executou a etapa (`time.thread_time`), de modo que as etapas
+executadas em paralelo (ex.: leitura e gravação no pipeline) são medidas separadamente.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import datetime as dt
+import threading
+import time
+from typing import Any
+
+from src.config.constants import BRT
+
+STAGES: tuple[str, ...] = (
+    "parse",
+    "connect",
+    "execute",
+    "first_row",
+    "fetch",
+    "serialize",
+    "write",
+)
+"""Etapas instrumentadas, na ordem em que ocorrem em uma consulta."""
+
+RUN_SCOPE: str = "*"
+"""Escopo das etapas comuns a todas as consultas da execução (ex.: leitura do `.sql`)."""
+
+
+@dataclass
+class StageMetrics:
+    """Métricas acumuladas de uma etapa."""
+
+    calls: int = 0
+    """Quantidade de execuções da etapa."""
+
+    wall_time: float = 0.0
+    """Tempo de parede, em segundos."""
+
+    cpu_time: float = 0.0
+    """Tempo de CPU da thread que executou a etapa, em segundos."""
+
+    rows: int = 0
+    """Linhas processadas na etapa."""
+
+    bytes: int = 0
+    """Bytes processados na etapa, quando conhecidos."""
+
+    def add(self, other: "StageMetrics") -> None:
+        """Acumula as métricas de outra execução da etapa."""
+        self.calls += other.calls
+        self.wall_time += other.wall_time
+        self.cpu_time += other.cpu_time
+        self.rows += other.rows
+        self.bytes += other.bytes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Retorna as métricas em um dicionário, com os tempos arredondados."""
+        return {
+            key: round(value, 6) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+
+
+class RunInstrumentation:
+    """Acumula as métricas das etapas de cada consulta de uma execução, de forma thread-safe.
+
+    **Exemplo de uso**:
+
+        instrumentation = RunInstrumentation()
+        stages = instrumentation.for_query("clientes")
+        with stages.stage("serialize") as metrics:
+            writer.write_batch(batch)
+            metrics.rows = len(batch)
+    """
+
+    def __init__(self) -> None:
+        """Inicializa a instrumentação de uma nova execução."""
+        self.started_at: dt.datetime = dt.datetime.now(BRT)
+        """Data e hora de início da execução."""
+
+        self._lock = threading.Lock()
+        self._queries: dict[str, dict[str, StageMetrics]] = {}
+
+    def for_query(self, query_name: str) -> "QueryStages":
+        """Retorna o registrador das etapas da consulta."""
+        return QueryStages(self, query_name)
+
+    def record(self, query_name: str, stage: str, metrics: StageMetrics) -> None:
+        """Acumula as métricas de uma execução da etapa da consulta."""
+        with self._lock:
+            stages = self._queries.setdefault(query_name, {})
+            stages.setdefault(stage, StageMetrics()).add(metrics)
+
+    def query_stages(self, query_name: str) -> dict[str, dict[str, Any]]:
+        """Retorna as métricas das etapas da consulta, na ordem de `STAGES`."""
+        with self._lock:
+            stages = self._queries.get(query_name, {})
+            return {stage: stages[stage].as_dict() for stage in sorted(stages, key=_stage_order)}
+
+    def query_names(self) -> list[str]:
+        """Retorna as consultas com etapas registradas, exceto o escopo da execução."""
+        with self._lock:
+            return [name for name in self._queries if name != RUN_SCOPE]
+
+    def totals(self) -> dict[str, dict[str, Any]]:
+        """Retorna as métricas de cada etapa somadas em todas as consultas."""
+        totals: dict[str, StageMetrics] = {}
+        with self._lock:
+            for stages in self._queries.values():
+                for stage, metrics in stages.items():
+                    totals.setdefault(stage, StageMetrics()).add(metrics)
+        return {stage: totals[stage].as_dict() for stage in sorted(totals, key=_stage_order)}
+
+
+class QueryStages:
+    """Registra as etapas de uma consulta na instrumentação da execução.
+
+    Sem instrumentação (`NO_STAGES`), as etapas são executadas sem registro.
+    """
+
+    def __init__(self, instrumentation: RunInstrumentation | None, query_name: str) -> None:
+        """Inicializa o registrador com a instrumentação e o nome da consulta."""
+        self.instrumentation: RunInstrumentation | None = instrumentation
+        """Instrumentação da execução, ou `None` para não registrar as etapas."""
+
+        self.query_name: str = query_name
+        """Nome da consulta das etapas registradas."""
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[StageMetrics]:
+        """Mede a etapa executada no bloco, que pode informar as linhas e os bytes processados."""
+        metrics = StageMetrics(calls=1)
+        wall_started_at = time.perf_counter()
+        cpu_started_at = time.thread_time()
+        try:
+            yield metrics
+        finally:
+            if self.instrumentation is not None:
+                metrics.wall_time = time.perf_counter() - wall_started_at
+                metrics.cpu_time = time.thread_time() - cpu_started_at
+                self.instrumentation.record(self.query_name, stage, metrics)
+
+
+NO_STAGES: QueryStages = QueryStages(None, "")
+"""Registrador que executa as etapas sem registrá-las."""
+
+
+def _stage_order(stage: str) -> int:
+    """Retorna a posição da etapa em `STAGES`, com as desconhecidas ao final."""
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
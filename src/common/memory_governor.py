@@ -0,0 +1,229 @@
+"""Módulo do controle adaptativo do consumo de memória das exportações.
+
+O governador compara a memória do processo com um orçamento configurado e ajusta o tamanho dos
+lotes lidos do cursor e a quantidade de consultas simultâneas: reduz ambos quando o consumo se
+aproxima do orçamento e os restabelece gradualmente quando há folga. Cada decisão é registrada
+no log, com o consumo medido, para calibrar o orçamento.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import threading
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+STATM_FILE: Path = Path("/proc/self/statm")
+"""Arquivo do Linux com a quantidade de páginas residentes do processo."""
+
+MIN_BATCH_SIZE: int = 1_000
+"""Menor tamanho de lote utilizado sob pressão de memória."""
+
+MIN_BATCH_SCALE: float = 1 / 64
+"""Menor fração do tamanho de lote configurado, após sucessivas reduções."""
+
+CHECK_INTERVAL: float = 0.5
+"""Intervalo mínimo, em segundos, entre duas medições da memória."""
+
+
+def _psutil_rss() -> int:
+    """Retorna o RSS do processo, em bytes, via `psutil`."""
+    import psutil  # noqa: PLC0415  # type: ignore[import-untyped]
+
+    return int(psutil.Process().memory_info().rss)
+
+
+def _statm_rss() -> int:
+    """Retorna o RSS do processo, em bytes, a partir de `/proc/self/statm`."""
+    resident_pages = int(STATM_FILE.read_text(encoding="ascii").split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _tracemalloc_usage() -> int:
+    """Retorna a memória alocada pelo Python, em bytes, rastreada pelo `tracemalloc`."""
+    return tracemalloc.get_traced_memory()[0]
+
+
+def select_memory_probe() -> tuple[str, Callable[[], int]]:
+    """Retorna o nome e a função da medição de memória disponível no ambiente.
+
+    Utiliza o `psutil`, se instalado, ou o `/proc/self/statm`. Na falta de ambos, inicia o
+    `tracemalloc`, que mede apenas as alocações do Python e torna a execução mais lenta.
+    """
+    try:
+        _psutil_rss()
+    except ImportError:
+        pass
+    else:
+        return "psutil", _psutil_rss
+    try:
+        _statm_rss()
+    except (OSError, IndexError, ValueError):
+        pass
+    else:
+        return "statm", _statm_rss
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return "tracemalloc", _tracemalloc_usage
+
+
+class MemoryGovernor:
+    """Adapta o tamanho dos lotes e a concorrência das consultas a um orçamento de memória.
+
+    Acima de `high_watermark` do orçamento, a escala dos lotes é reduzida à metade e a
+    concorrência em uma consulta; abaixo de `low_watermark`, ambas voltam a crescer até os
+    valores configurados. O orçamento vale para cada processo.
+
+    **Exemplo de uso**:
+
+        governor = MemoryGovernor(4 * 1024**3, max_concurrency=4)
+        with governor.slot():
+            for batch in db_handler.fetch_batches(query, governor.batch_size_for(50_000)):
+                ...
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        *,
+        max_concurrency: int = 1,
+        min_batch_size: int = MIN_BATCH_SIZE,
+        high_watermark: float = 0.85,
+        low_watermark: float = 0.6,
+    ) -> None:
+        """Inicializa o governador com o orçamento, em bytes, e os limites de ajuste."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        if budget_bytes <= 0:
+            msg = f"Orçamento de memória inválido: {budget_bytes}"
+            raise ValueError(msg)
+        if not 0 < low_watermark < high_watermark <= 1:
+            msg = f"Limites de memória inválidos: {low_watermark} e {high_watermark}"
+            raise ValueError(msg)
+
+        self.budget_bytes: int = budget_bytes
+        """Orçamento de memória do processo, em bytes."""
+
+        self.max_concurrency: int = max(1, max_concurrency)
+        """Quantidade máxima de consultas simultâneas, restabelecida quando há folga."""
+
+        self.min_batch_size: int = min_batch_size
+        """Menor tamanho de lote utilizado sob pressão de memória."""
+
+        self.high_watermark: float = high_watermark
+        """Fração do orçamento a partir da qual os lotes e a concorrência são reduzidos."""
+
+        self.low_watermark: float = low_watermark
+        """Fração do orçamento abaixo da qual os lotes e a concorrência voltam a crescer."""
+
+        self.probe_name: str
+        """Origem da medição de memória (`psutil`, `statm` ou `tracemalloc`)."""
+        self.probe_name, self._probe = select_memory_probe()
+
+        self.batch_scale: float = 1.0
+        """Fração do tamanho de lote configurado atualmente utilizada."""
+
+        self.concurrency: int = self.max_concurrency
+        """Quantidade de consultas simultâneas atualmente permitida."""
+
+        self.peak_usage: int = 0
+        """Maior consumo de memória medido, em bytes."""
+
+        self.shrinks: int = 0
+        """Quantidade de reduções decididas."""
+
+        self.grows: int = 0
+        """Quantidade de ampliações decididas."""
+
+        self._active = 0
+        self._last_check = 0.0
+        self._condition = threading.Condition()
+        self.logger.info(
+            f"Orçamento de memória: {self.budget_bytes / 1024**2:.0f} MB "
+            f"(medição via {self.probe_name})."
+        )
+
+    def usage(self) -> int:
+        """Retorna o consumo de memória atual do processo, em bytes."""
+        return self._probe()
+
+    def batch_size(self, requested: int) -> int:
+        """Retorna o tamanho do próximo lote, reduzido conforme a pressão de memória."""
+        with self._condition:
+            self._evaluate()
+            scaled = int(requested * self.batch_scale)
+        return max(min(requested, self.min_batch_size), scaled)
+
+    def batch_size_for(self, requested: int) -> Callable[[], int]:
+        """Retorna uma função que calcula o tamanho de cada lote a partir do configurado."""
+        return lambda: self.batch_size(requested)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Aguarda uma vaga de consulta simultânea, conforme a concorrência permitida."""
+        with self._condition:
+            self._evaluate()
+            while self._active >= self.concurrency:
+                self._condition.wait(CHECK_INTERVAL)
+                self._evaluate()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """Retorna o estado e as decisões do governador."""
+        with self._condition:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "probe": self.probe_name,
+                "peak_usage_bytes": self.peak_usage,
+                "batch_scale": self.batch_scale,
+                "concurrency": self.concurrency,
+                "shrinks": self.shrinks,
+                "grows": self.grows,
+            }
+
+    def _evaluate(self) -> None:
+        """Mede a memória e ajusta a escala dos lotes e a concorrência (com o lock adquirido)."""
+        now = time.monotonic()
+        if now - self._last_check < CHECK_INTERVAL:
+            return
+        self._last_check = now
+        usage = self.usage()
+        self.peak_usage = max(self.peak_usage, usage)
+        ratio = usage / self.budget_bytes
+        if ratio >= self.high_watermark and (
+            self.batch_scale > MIN_BATCH_SCALE or self.concurrency > 1
+        ):
+            self.batch_scale = max(MIN_BATCH_SCALE, self.batch_scale / 2)
+            self.concurrency = max(1, self.concurrency - 1)
+            self.shrinks += 1
+            self._log_decision("Reduzindo", usage, ratio)
+        elif ratio <= self.low_watermark and (
+            self.batch_scale < 1 or self.concurrency < self.max_concurrency
+        ):
+            self.batch_scale = min(1.0, self.batch_scale * 2)
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self.grows += 1
+            self._log_decision("Ampliando", usage, ratio)
+            self._condition.notify_all()
+
+    def _log_decision(self, action: str, usage: int, ratio: float) -> None:
+        """Registra no log a decisão tomada e o consumo que a motivou."""
+        self.logger.info(
+            f"{action} lotes e concorrência: memória {usage / 1024**2:.0f} MB "
+            f"({ratio:.0%} do orçamento); lotes a {self.batch_scale:.1%} do configurado, "
+            f"{self.concurrency} de {self.max_concurrency} consultas simultâneas."
+        )
@@ -3,7 +3,7 @@
 from pathlib import Path
 import shutil
 
-from src.config.constants import EXPORT_DIR
+from src.config.constants import EXPORT_DIR, EXPORT_FILE_PATTERNS
 from src.infrastructure.logger import LoggerSingleton
 
 # Constantes
@@ -35,15 +35,17 @@ class CSVFileSorter:
     def move_files(
         self, client_folder: Path, date_folder: Path, *, overwrite: bool = False
     ) -> None:
-        """Move arquivos CSV da pasta do cliente para a estrutura organizada."""
+        """Move arquivos exportados (CSV, inclusive comprimidos) do cliente para a estrutura."""
         # Garante que o caminho de destino para os arquivos organizados exista
         destination_folder = self.sorted_path / client_folder.name / date_folder.name
         if not destination_folder.exists():
             destination_folder.mkdir(parents=True, exist_ok=True)
             self.logger.info(f"Criada a pasta de destino: {destination_folder}")
 
-        # Itera sobre os arquivos CSV na pasta do cliente
-        csv_files = list(client_folder.glob("*.csv"))
+        # Itera sobre os arquivos exportados na pasta do cliente
+        csv_files = [
+            file for pattern in EXPORT_FILE_PATTERNS for file in client_folder.glob(pattern)
+        ]
         if not csv_files:
             self.logger.info(f"Nenhum arquivo CSV encontrado na pasta do cliente: {client_folder}")
         for file in csv_files:
@@ -1,6 +1,7 @@
 """Módulo de definição de constantes globais para o projeto."""
 
 from pathlib import Path
+from typing import Any
 from zoneinfo import ZoneInfo
 
 APP_NAME: str = "py-sql-importer-exporter"
@@ -21,8 +22,198 @@ IMPORT_DIR: Path = Path("./src/config/files/import")
 SQL_DIR: Path = Path("./src/config/files/sql")
 """Caminho para o diretório de arquivos SQL: `./src/config/files/sql`"""
 
+STATE_DIR: Path = Path("./src/config/files/state")
+"""Caminho para o diretório de estado das exportações incrementais: `./src/config/files/state`"""
+
+CACHE_DIR: Path = Path("./src/config/files/cache")
+"""Caminho para o diretório de cache dos resultados das consultas: `./src/config/files/cache`"""
+
 BRT: ZoneInfo = ZoneInfo("America/Sao_Paulo")
 """Define o objeto de fuso horário para o horário de Brasília:  `America/Sao_Paulo`"""
 
+EXPORT_FILE_PATTERNS: list[str] = [
+    "*.csv",
+    "*.csv.gz",
+    "*.csv.bz2",
+    "*.csv.zst",
+    "*.parquet",
+    "*.feather",
+    "*.manifest.json",
+    "*.report.json",
+    "*.prom",
+]
+"""Padrões dos arquivos gerados pela exportação, incluindo os CSV comprimidos, os manifestos e os
+relatórios de desempenho."""
+
 REQUIRED_KEYWORDS = ["DRIVER=", "SERVER=", "UID=", "PWD="]
 """Keywords obrigatórias na string de conexão: `["DRIVER=", "SERVER=", "UID=", "PWD="]`"""
+
+STREAM_CHUNKSIZE: int = 50_000
+"""Linhas por lote da leitura em lotes quando `chunksize` é `0` e outra opção a exige."""
+
+DEFAULT_EXPORT_OPTIONS: dict[str, Any] = {
+    "encoding": "utf-8",
+    "delimiter": ",",
+    "quotechar": '"',
+    "chunksize": 0,
+    "max_workers": 1,
+    "pipeline_depth": 4,
+    "add_date_to_filename": None,
+    "output_format": "csv",
+    "csv_engine": "pandas",
+    "compression": None,
+    "compression_level": None,
+    "row_group_size": 100_000,
+    "incremental": True,
+    "cache": False,
+    "cache_ttl": 3600,
+    "cache_max_bytes": 10 * 1024**3,
+    "refresh_cache": False,
+    "split_rows": 0,
+    "split_bytes": 0,
+    "shards": 4,
+    "shard_strategy": "minmax",
+    "shard_output": "merge",
+    "resume": False,
+    "compact_dtypes": False,
+    "downcast_numerics": False,
+    "categorical_threshold": 0.5,
+    "memory_report": False,
+    "memory_budget_mb": 0,
+    "run_report": False,
+    "prometheus_report": False,
+    "pool_size": 8,
+    "pool_min_size": 0,
+    "pool_idle_timeout": 300,
+    "pool_pre_ping": True,
+    "arraysize": 0,
+    "packet_size": 0,
+    "output_converters": ["datetimeoffset"],
+    "decimal_as": "decimal",
+    "query_timeout": 0,
+    "run_timeout": 0,
+}
+"""Opções padrão de exportação, sobrescritas pela chave `export` do `settings.yaml`, do servidor
+(`servers.<servidor>.export`) e do cliente.
+
+- `chunksize`: quantidade de linhas lidas do cursor por lote. Com `0` (padrão), o resultado
+  completo é carregado em memória antes da gravação (comportamento legado). As opções que exigem
+  a leitura em lotes (formatos colunares, `compression`, `cache`, `csv_engine: native`, divisão
+  em partes e prazos) utilizam lotes de `STREAM_CHUNKSIZE` linhas. Na leitura em lotes, o CSV é
+  formatado pelo tipo de cada coluna, e não pelos valores do resultado completo: os inteiros com
+  `NULL` são gravados sem a casa decimal (`1` em vez de `1.0`) e as datas e horas com as casas
+  da escala da coluna (ex.: `2024-01-01 10:00:00.000` em `DATETIME`), mesmo à meia-noite.
+- `max_workers`: quantidade de consultas do arquivo `.sql` executadas em paralelo, cada uma com
+  a sua própria conexão. Use `1` para a execução sequencial.
+- `pipeline_depth`: quantidade máxima de lotes lidos aguardando gravação. A leitura do banco e a
+  gravação do arquivo são executadas em paralelo, ligadas por uma fila desse tamanho. Use `0`
+  para ler e gravar sequencialmente.
+- `add_date_to_filename`: adiciona a data no nome dos arquivos dos clientes de
+  `general_rules.contains_date`. Quando `None`, a decisão é solicitada ao usuário.
+- `output_format`: formato dos arquivos gerados (`csv`, `parquet` ou `feather`). Os formatos
+  colunares requerem o `pyarrow` e são sempre gravados em lotes.
+- `csv_engine`: gravação do CSV via pandas (`pandas`) ou diretamente das linhas do cursor com o
+  módulo `csv` (`native`), com a mesma formatação e menor consumo de CPU e memória.
+- `compression` e `compression_level`: codec e nível de compressão (`gzip`, `bz2` ou `zstd` no
+  CSV; ex.: `snappy` ou `zstd` no Parquet; `lz4` ou `zstd` no Feather).
+- `row_group_size`: quantidade de linhas por row group nos arquivos Parquet.
+- `incremental`: exporta apenas as linhas novas das consultas anotadas com `-- @watermark: col`,
+  gravando-as em arquivos delta. Use `false` para forçar a exportação completa.
+- `cache`: reutiliza o resultado em disco de consultas idênticas (mesmo servidor, banco, texto,
+  `output_converters` e `decimal_as`), sem executá-las novamente. `cache_ttl` define a validade
+  padrão, em segundos (por consulta, com `-- @cache_ttl: <segundos>`), `cache_max_bytes` o
+  tamanho máximo do cache (LRU) e `refresh_cache` força a releitura do banco.
+- `split_rows` e `split_bytes`: dividem cada arquivo em partes (`<nome>_part0001.csv`, ...) com
+  no máximo essa quantidade de linhas ou bytes (aproximado), cada uma com o seu cabeçalho, e
+  gravam o manifesto `<nome>.manifest.json` com as linhas de cada parte. Use `0` para não dividir.
+- `shards`, `shard_strategy` e `shard_output`: as consultas anotadas com `-- @partition: col` são
+  lidas em `shards` faixas paralelas da coluna (mais uma para os `NULL`), cada uma com a sua
+  conexão. As faixas são calculadas por `minmax` (amplitude) ou `ntile` (quantis) e gravadas em
+  um único arquivo (`merge`) ou em partes (`parts`). Por consulta, use `-- @shards: n` e
+  `-- @shard_strategy: ntile`. No `merge`, as linhas das faixas ficam intercaladas na ordem em
+  que são lidas: o arquivo tem as mesmas linhas da consulta sem faixas, mas não na mesma ordem.
+- As anotações `@watermark`, `@partition` e `@order_by` leem a consulta como subconsulta. No SQL
+  Server, as consultas com CTE (`WITH`) ou `ORDER BY` sem `TOP` não o permitem e são exportadas
+  por inteiro, sem essas anotações, com um aviso no log.
+- `resume`: retoma a execução anterior do dia a partir do journal `.checkpoint.json` da pasta do
+  cliente, ignorando as consultas já concluídas. As consultas anotadas com `-- @order_by: col`
+  (chave única) continuam do último lote gravado, no CSV sem compressão.
+- `compact_dtypes`: monta os DataFrames com os tipos definidos por `cursor.description` (inteiros
+  anuláveis, textos no Arrow e categorias) em vez dos inferidos pelo pandas. Na exportação
+  legada (`chunksize: 0`), os inteiros com `NULL` passam a ser gravados sem a casa decimal (`1`
+  em vez de `1.0`), como já ocorre na leitura em lotes. `downcast_numerics`
+  utiliza o menor inteiro que comporta a precisão da coluna e `categorical_threshold` é a
+  proporção máxima de valores distintos para que um texto vire categoria.
+- `memory_report`: registra no log a memória do DataFrame de cada consulta na exportação legada
+  (`chunksize: 0`), antes e depois do plano de tipos.
+- `memory_budget_mb`: orçamento de memória de cada processo de exportação, em MB. Próximo do
+  limite, o tamanho dos lotes e a quantidade de consultas simultâneas são reduzidos, voltando a
+  crescer quando há folga, e cada decisão é registrada no log. Use `0` para desligar.
+- `run_report`: grava, na pasta do cliente, o relatório
+  `run_<data>_<hora>_<microssegundos>.report.json` com as linhas, os bytes e os tempos de parede
+  e de CPU de cada etapa (leitura do `.sql`, conexão, execução, primeira linha, leitura,
+  serialização e gravação) de cada consulta. Execuções no mesmo instante recebem um sufixo
+  (`_2`, ...), sem sobrescrever relatórios anteriores. `prometheus_report` grava as mesmas
+  métricas no formato texto do Prometheus em `<cliente>.prom`, sobrescrito a cada execução, para
+  que o `textfile collector` do node exporter não encontre as mesmas séries em vários arquivos.
+- `pool_size`, `pool_min_size`, `pool_idle_timeout` e `pool_pre_ping`: as conexões são
+  reutilizadas entre consultas e clientes com a mesma string de conexão, por meio de um pool de
+  até `pool_size` conexões. As conexões ociosas há mais de `pool_idle_timeout` segundos são
+  fechadas (exceto `pool_min_size`), e cada conexão ociosa é testada com `SELECT 1` antes de ser
+  reutilizada. O tamanho deve comportar `max_workers`; uma consulta com `@partition` devolve a
+  sua conexão ao pool enquanto as faixas são lidas, em até `pool_size` conexões simultâneas. O
+  pool é ativado por padrão; use `0` para abrir uma conexão por uso, como nas versões anteriores.
+  O pool é criado com as opções do primeiro cliente que o utiliza: clientes com a mesma string de
+  conexão e outras opções compartilham esse pool, e as opções diferentes são ignoradas, com um
+  aviso no log.
+- `arraysize`, `packet_size`, `output_converters` e `decimal_as`: ajustes da leitura via ODBC.
+  `arraysize` define o `cursor.arraysize` e `packet_size` o tamanho do pacote de rede, em bytes
+  (até 32767); `0` mantém o padrão do driver. `output_converters` registra conversores de saída
+  por tipo SQL (`datetimeoffset` e `nvarchar_max`) e `decimal_as: float` lê `DECIMAL` e `NUMERIC`
+  como `float` em vez de `Decimal`. Compare os ajustes com `make benchmark.fetch`.
+- `query_timeout` e `run_timeout`: prazos, em segundos, de cada consulta (por consulta, com
+  `-- @timeout: <segundos>`) e da execução do cliente. Ao fim do prazo, a consulta em execução é
+  cancelada no banco (`cursor.cancel()`), a conexão é liberada e as demais consultas continuam;
+  após o prazo da execução, as restantes não são executadas. As consultas interrompidas são
+  marcadas como `timed_out` no relatório. Com um prazo, o resultado é sempre lido em lotes. Use
+  `0` para não limitar.
+"""
+
+DEFAULT_IMPORT_OPTIONS: dict[str, Any] = {
+    "encoding": "auto",
+    "delimiter": ",",
+    "quotechar": '"',
+    "empty_as_null": True,
+    "batch_size": 10_000,
+    "commit_batches": 10,
+    "max_workers": 1,
+    "split_processes": 1,
+    "split_min_mb": 256,
+    "create_table": False,
+    "infer_rows": 0,
+}
+"""Opções padrão de importação, sobrescritas pela chave `import` do `settings.yaml` e do cliente.
+
+- `encoding`, `delimiter` e `quotechar`: formato dos arquivos CSV importados, que devem ter
+  cabeçalho com os nomes das colunas da tabela. Com `encoding: auto`, a codificação de cada
+  arquivo é detectada pela BOM, pelo UTF-8 estrito ou, por fim, pelo `chardet` sobre uma amostra
+  de 1 MB, e gravada em `<arquivo>.encoding.json` para as importações seguintes do mesmo arquivo.
+- `empty_as_null`: grava os campos vazios como `NULL` em vez de texto vazio.
+- `batch_size`: quantidade de linhas lidas do arquivo e inseridas por `executemany` (com
+  `fast_executemany` no ODBC). Apenas um lote permanece em memória por vez.
+- `commit_batches`: quantidade de lotes por transação. Cada transação é confirmada ao atingir
+  essa quantidade e ao final do arquivo; em caso de erro, a transação em andamento é desfeita e
+  as anteriores permanecem gravadas.
+- `max_workers`: quantidade de arquivos importados em paralelo, cada um com a sua própria conexão.
+  Com `pool_size` > 0, a quantidade é limitada ao tamanho do pool.
+- `split_processes`: quantidade de processos que importam um mesmo arquivo com pelo menos
+  `split_min_mb` MB, dividido em trechos de bytes alinhados aos registros (inclusive com quebras
+  de linha entre aspas). Cada trecho tem a sua conexão e as suas transações; se um trecho falhar,
+  os demais permanecem na tabela. Requer uma codificação compatível com ASCII (ex.: UTF-8).
+- `create_table`: cria a tabela de destino inexistente com os tipos do SQL Server inferidos dos
+  valores do arquivo (`INT`, `BIGINT`, `DECIMAL(p,s)`, `FLOAT`, `DATE`, `DATETIME2(n)`,
+  `DATETIMEOFFSET(n)` ou `NVARCHAR(n)`). Apenas datas ISO 8601 são reconhecidas, e números com
+  zeros à esquerda são mantidos como texto.
+- `infer_rows`: quantidade de linhas analisadas na inferência (`0` para o arquivo inteiro). Com
+  uma amostra, a inferência é mais rápida, mas os valores seguintes podem não caber no tipo.
+"""
@@ -0,0 +1,125 @@
+"""Versão `asyncio` do gerenciador de conexões, para uso em serviços com loop de eventos.
+
+As chamadas bloqueantes ao driver (abrir a conexão, executar e ler os lotes) são delegadas a um
+executor de threads limitado, de modo que um único loop conduza muitas consultas simultâneas sem
+ser bloqueado. Se a tarefa for cancelada (ex.: `asyncio.timeout`), a consulta em execução é
+interrompida no banco e a chamada em andamento é concluída antes de propagar o cancelamento, para
+que a conexão não seja utilizada por duas threads ao mesmo tempo.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import suppress
+import threading
+import types
+from typing import Any, Self
+
+from src.infrastructure.database.database_connection_manager import (
+    BatchSize,
+    DatabaseConnectionManager,
+)
+
+DEFAULT_ASYNC_THREADS: int = 32
+"""Quantidade padrão de threads do executor compartilhado pelas conexões assíncronas."""
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_async_executor(max_threads: int = DEFAULT_ASYNC_THREADS) -> ThreadPoolExecutor:
+    """Retorna o executor compartilhado no processo, criado na primeira chamada.
+
+    O executor limita a quantidade de chamadas ao driver executadas simultaneamente; as demais
+    aguardam na fila do executor sem ocupar o loop de eventos.
+    """
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="async-db")
+        return _executor
+
+
+class AsyncDatabaseConnectionManager:
+    """Gerencia uma conexão do `DatabaseConnectionManager` com `async with` e `async for`.
+
+    **Exemplo de uso**:
+
+        async with AsyncDatabaseConnectionManager(db_handler) as db:
+            async with aclosing(db.fetch_batches("SELECT * FROM CLIENTES", 10_000)) as batches:
+                async for batch in batches:
+                    await db.run(writer.write_batch, batch)
+    """
+
+    def __init__(
+        self, db_handler: DatabaseConnectionManager, executor: Executor | None = None
+    ) -> None:
+        """Inicializa o gerenciador com o handler síncrono e o executor das chamadas ao driver."""
+        self.db_handler: DatabaseConnectionManager = db_handler
+        """Handler síncrono cuja conexão é utilizada pelas chamadas delegadas ao executor."""
+
+        self.executor: Executor = executor or get_async_executor()
+        """Executor limitado das chamadas bloqueantes."""
+
+    async def __aenter__(self) -> Self:
+        """Abre a conexão no executor ao entrar no contexto."""
+        try:
+            await self.run(self.db_handler.__enter__)
+        except asyncio.CancelledError:
+            # A conexão pode ter sido aberta enquanto o cancelamento aguardava a chamada
+            if self.db_handler.conn is not None:
+                await self.run(self.db_handler.__exit__, None, None, None)
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Fecha a conexão, ou a devolve ao pool, no executor ao sair do contexto."""
+        await self.run(self.db_handler.__exit__, exc_type, exc_value, traceback)
+
+    async def fetch_batches(
+        self, query: str, batch_size: BatchSize, params: Sequence[Any] = ()
+    ) -> AsyncIterator[list[tuple[Any, ...]]]:
+        """Executa a consulta e retorna o resultado em lotes, lidos no executor.
+
+        Cada lote é lido por uma chamada ao executor, liberando a thread entre os lotes. Para
+        interromper a leitura antes do fim, feche o iterador (ex.: `contextlib.aclosing`).
+        """
+        batches = self.db_handler.fetch_batches(query, batch_size, params)
+        try:
+            while (batch := await self.run(next, batches, None)) is not None:
+                yield batch
+        finally:
+            await self.run(batches.close)
+
+    def column_names(self) -> list[str]:
+        """Retorna os nomes das colunas do último resultado executado no cursor."""
+        return self.db_handler.column_names()
+
+    def column_description(self) -> list[tuple[Any, ...]]:
+        """Retorna a descrição DB-API das colunas do último resultado executado no cursor."""
+        return self.db_handler.column_description()
+
+    def cancel(self) -> None:
+        """Interrompe a consulta em execução no banco."""
+        self.db_handler.cancel()
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Executa a chamada bloqueante no executor, sem bloquear o loop de eventos.
+
+        Se a tarefa for cancelada durante a chamada, a consulta em execução é interrompida e a
+        chamada é aguardada antes de propagar o cancelamento.
+        """
+        future = self.executor.submit(func, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                self.cancel()
+                with suppress(Exception):
+                    await asyncio.wrap_future(future)
+            raise
@@ -0,0 +1,253 @@
+"""Backends de banco de dados utilizados pelo gerenciador de conexões.
+
+O backend ODBC conecta ao SQL Server. Os backends embarcados (SQLite e, com o pacote `duckdb`,
+DuckDB) leem um arquivo local e permitem executar e medir as exportações sem servidor nem
+credenciais. O backend é escolhido pelo `execution_mode` do `settings.yaml`; nos modos embarcados,
+o `database` de cada cliente é o caminho do arquivo:
+
+    execution_mode: sqlite
+    data_sources:
+      sqlite:
+        cliente_a:
+          database: data/cliente_a.sqlite
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from itertools import pairwise
+import re
+import sqlite3
+from typing import Any, ClassVar
+
+import pyodbc
+
+from src.infrastructure.database.connection_string import ConnectionString
+from src.infrastructure.database.fetch_tuning import FetchTuning
+
+SQL_NOISE_PATTERN: str = (
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\[(?:[^\]]|\]\])*\]"
+)
+"""Comentários, literais e identificadores delimitados, ignorados na análise da consulta."""
+
+
+class DatabaseBackend(ABC):
+    """Abertura de conexões e particularidades de um banco de dados compatível com DB-API."""
+
+    name: ClassVar[str]
+    """Nome do backend, igual ao `execution_mode` que o seleciona."""
+
+    supports_pool: ClassVar[bool] = False
+    """Indica se as conexões do backend podem ser reutilizadas pelo pool de conexões."""
+
+    server_name: str
+    """Servidor do banco, ou o nome do backend nos bancos embarcados."""
+
+    database: str | None
+    """Banco de dados, ou o caminho do arquivo nos bancos embarcados."""
+
+    @property
+    @abstractmethod
+    def errors(self) -> tuple[type[Exception], ...]:
+        """Exceções do driver que indicam erro do banco de dados."""
+
+    @abstractmethod
+    def connect(self, timeout: int | None = None) -> Any:
+        """Abre uma nova conexão com o banco de dados."""
+
+    def configure_connection(self, conn: Any) -> None:  # noqa: B027
+        """Ajusta a conexão recém-aberta ou retirada do pool (ex.: conversores de saída)."""
+
+    def configure_cursor(self, cursor: Any) -> None:  # noqa: B027
+        """Ajusta o cursor recém-criado (ex.: inserções em lote)."""
+
+    def execute(self, cursor: Any, query: str, params: Sequence[Any] = ()) -> None:
+        """Executa a consulta parametrizada (`?`) no cursor."""
+        cursor.execute(query, tuple(params))
+
+    def cancel(self, conn: Any, cursor: Any) -> None:
+        """Interrompe, a partir de outra thread, a consulta em execução na conexão."""
+        del cursor
+        conn.interrupt()
+
+    def quote_identifier(self, name: str) -> str:
+        """Delimita o nome de uma coluna ou tabela para uso em SQL."""
+        return f"[{name.replace(']', ']]')}]"
+
+    def can_wrap_query(self, query: str) -> bool:
+        """Indica se a consulta pode ser usada como subconsulta (`SELECT * FROM (...) AS _t`)."""
+        del query
+        return True
+
+    def describe(
+        self, description: Sequence[tuple[Any, ...]], sample: Sequence[tuple[Any, ...]]
+    ) -> list[tuple[Any, ...]]:
+        """Retorna a descrição DB-API das colunas com o tipo Python de cada uma.
+
+        Os drivers que não informam o tipo como uma classe Python (ex.: `sqlite3`, que informa
+        `None`) têm o tipo inferido do primeiro valor não nulo da coluna na amostra de linhas.
+        """
+        columns = []
+        for position, column in enumerate(description):
+            name, type_code, *rest = tuple(column) + (None,) * (7 - len(column))
+            if not isinstance(type_code, type):
+                type_code = next(
+                    (type(row[position]) for row in sample if row[position] is not None), str
+                )
+                rest[-1] = True if rest[-1] is None else rest[-1]
+            columns.append((name, type_code, *rest))
+        return columns
+
+
+class OdbcBackend(DatabaseBackend):
+    """SQL Server via ODBC (`pyodbc`)."""
+
+    name = "odbc"
+    supports_pool = True
+
+    def __init__(
+        self, connection_params: ConnectionString, tuning: FetchTuning | None = None
+    ) -> None:
+        """Inicializa o backend com os parâmetros de conexão e os ajustes da leitura."""
+        self.connection_params: ConnectionString = connection_params
+        """Parâmetros de conexão utilizados para criar a connection string."""
+
+        self.connection_string: str = connection_params.connection_string
+        """String de conexão para o banco de dados SQL Server."""
+
+        self.tuning: FetchTuning = tuning or FetchTuning()
+        """Ajustes da leitura: `arraysize`, conversores de saída e tamanho do pacote."""
+
+        self.server_name = connection_params.server_name
+        self.database = connection_params.database
+
+    @property
+    def errors(self) -> tuple[type[Exception], ...]:
+        """Exceções do `pyodbc`."""
+        return (pyodbc.Error,)
+
+    def connect(self, timeout: int | None = None) -> pyodbc.Connection:
+        """Abre uma conexão ODBC, com o tamanho de pacote dos ajustes."""
+        options: dict[str, Any] = {}
+        if timeout is not None:
+            options["timeout"] = timeout
+        if attrs_before := self.tuning.attrs_before():
+            options["attrs_before"] = attrs_before
+        return pyodbc.connect(self.connection_string, **options)
+
+    def configure_connection(self, conn: pyodbc.Connection) -> None:
+        """Registra os conversores de saída dos ajustes."""
+        self.tuning.configure_connection(conn)
+
+    def configure_cursor(self, cursor: pyodbc.Cursor) -> None:
+        """Ativa o envio dos parâmetros de `executemany` em um único lote e define o `arraysize`."""
+        cursor.fast_executemany = True
+        self.tuning.configure_cursor(cursor)
+
+    def execute(self, cursor: pyodbc.Cursor, query: str, params: Sequence[Any] = ()) -> None:
+        """Executa a consulta parametrizada no cursor."""
+        cursor.execute(query, *params)
+
+    def cancel(self, conn: pyodbc.Connection, cursor: pyodbc.Cursor) -> None:
+        """Envia o cancelamento da consulta do cursor ao servidor (`SQLCancel`)."""
+        del conn
+        cursor.cancel()
+
+    def can_wrap_query(self, query: str) -> bool:
+        """Indica se a consulta pode ser usada como subconsulta no SQL Server.
+
+        O SQL Server rejeita em uma tabela derivada as CTEs (`WITH ...`) e o `ORDER BY` sem
+        `TOP`, `OFFSET` ou `FOR XML`. Apenas o nível externo da consulta é analisado, sem os
+        comentários, os literais e o conteúdo entre parênteses (ex.: `OVER (ORDER BY ...)`).
+        """
+        text = re.sub(SQL_NOISE_PATTERN, " ", query, flags=re.DOTALL)
+        outer, depth = [], 0
+        for char in text:
+            depth += (char == "(") - (char == ")")
+            outer.append(char if depth == 0 and char != ")" else " ")
+        words = re.findall(r"\w+", "".join(outer).upper())
+        if words[:1] == ["WITH"]:
+            return False
+        ordered = ("ORDER", "BY") in pairwise(words)
+        return not ordered or bool({"TOP", "OFFSET", "XML"} & set(words))
+
+    def describe(
+        self, description: Sequence[tuple[Any, ...]], sample: Sequence[tuple[Any, ...]]
+    ) -> list[tuple[Any, ...]]:
+        """Retorna a descrição do `pyodbc`, com o tipo Python produzido pelos conversores."""
+        del sample
+        return self.tuning.describe(description)
+
+
+class SqliteBackend(DatabaseBackend):
+    """Arquivo SQLite (`sqlite3`, da biblioteca padrão)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        """Inicializa o backend com o caminho do arquivo do banco."""
+        self.server_name = self.name
+        self.database = path
+
+    @property
+    def errors(self) -> tuple[type[Exception], ...]:
+        """Exceções do `sqlite3`."""
+        return (sqlite3.Error,)
+
+    def connect(self, timeout: int | None = None) -> sqlite3.Connection:
+        """Abre o arquivo, permitindo que a conexão seja devolvida por outra thread."""
+        if timeout is None:
+            return sqlite3.connect(self.database or "", check_same_thread=False)
+        return sqlite3.connect(self.database or "", timeout=timeout, check_same_thread=False)
+
+
+class DuckDbBackend(DatabaseBackend):
+    """Arquivo DuckDB (pacote opcional `duckdb`)."""
+
+    name = "duckdb"
+
+    def __init__(self, path: str) -> None:
+        """Inicializa o backend com o caminho do arquivo do banco."""
+        self.server_name = self.name
+        self.database = path
+        self._duckdb = self._import_duckdb()
+
+    @staticmethod
+    def _import_duckdb() -> Any:
+        """Importa o pacote `duckdb`, instalado apenas com o extra `duckdb`."""
+        try:
+            import duckdb  # noqa: PLC0415  # type: ignore[import-not-found]
+        except ImportError as e:
+            msg = "O backend DuckDB requer o pacote `duckdb` (pip install .[duckdb])."
+            raise ImportError(msg) from e
+        return duckdb
+
+    @property
+    def errors(self) -> tuple[type[Exception], ...]:
+        """Exceções do `duckdb`."""
+        return (self._duckdb.Error,)
+
+    def connect(self, timeout: int | None = None) -> Any:
+        """Abre o arquivo do banco."""
+        del timeout
+        return self._duckdb.connect(self.database or ":memory:")
+
+    def quote_identifier(self, name: str) -> str:
+        """Delimita o nome com aspas duplas, já que o DuckDB não aceita colchetes."""
+        return '"{}"'.format(name.replace('"', '""'))
+
+
+EMBEDDED_BACKENDS: dict[str, type[DatabaseBackend]] = {
+    SqliteBackend.name: SqliteBackend,
+    DuckDbBackend.name: DuckDbBackend,
+}
+"""Backends embarcados, pelo `execution_mode` que os seleciona."""
+
+
+def create_embedded_backend(execution_mode: str, path: str) -> DatabaseBackend:
+    """Cria o backend embarcado do `execution_mode` para o arquivo do banco."""
+    try:
+        backend_class = EMBEDDED_BACKENDS[execution_mode]
+    except KeyError:
+        msg = f"Backend embarcado desconhecido: {execution_mode}"
+        raise ValueError(msg) from None
+    return backend_class(path)  # type: ignore[call-arg]
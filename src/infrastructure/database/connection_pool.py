@@ -0,0 +1,293 @@
+"""Pool de conexões `pyodbc` reutilizadas entre consultas e clientes com a mesma string de conexão.
+
+Abrir uma conexão com o SQL Server (login e TLS, sobretudo via VPN) pode levar segundos. O pool
+mantém as conexões devolvidas abertas por até `idle_timeout` segundos e as entrega novamente, após
+um teste rápido (`SELECT 1`), em vez de abrir uma nova conexão a cada consulta.
+"""
+
+import atexit
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pyodbc
+
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+PING_QUERY: str = "SELECT 1"
+"""Consulta do teste de saúde executado ao retirar uma conexão do pool."""
+
+POOL_OPTIONS: tuple[str, ...] = ("min_size", "max_size", "idle_timeout", "pre_ping")
+"""Opções do pool comparadas ao reutilizar o pool já criado para a string de conexão."""
+
+
+@dataclass
+class PoolStats:
+    """Estatísticas de uso do pool."""
+
+    hits: int = 0
+    """Retiradas atendidas por uma conexão ociosa do pool."""
+
+    misses: int = 0
+    """Retiradas que precisaram abrir uma nova conexão."""
+
+    waits: int = 0
+    """Retiradas que aguardaram a devolução de uma conexão (pool cheio)."""
+
+    wait_time: float = 0.0
+    """Tempo total de espera por uma conexão, em segundos."""
+
+    stale: int = 0
+    """Conexões descartadas por falharem no teste de saúde."""
+
+    expired: int = 0
+    """Conexões fechadas por ficarem ociosas além de `idle_timeout`."""
+
+    discarded: int = 0
+    """Conexões descartadas na devolução (ex.: após um erro)."""
+
+    def as_dict(self) -> dict[str, Any]:
+        """Retorna as estatísticas em um dicionário, com o tempo arredondado."""
+        return {**asdict(self), "wait_time": round(self.wait_time, 3)}
+
+
+class ConnectionPool:
+    """Pool thread-safe de conexões de uma string de conexão.
+
+    **Exemplo de uso**:
+
+        pool = get_connection_pool(connection_string, max_size=4)
+        conn = pool.acquire()
+        try:
+            conn.cursor().execute("SELECT 1")
+        finally:
+            pool.release(conn)
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        connection_string: str,
+        *,
+        min_size: int = 0,
+        max_size: int = 8,
+        idle_timeout: float = 300.0,
+        pre_ping: bool = True,
+        acquire_timeout: float = 60.0,
+        attrs_before: dict[int, Any] | None = None,
+        connect: Callable[..., pyodbc.Connection] = pyodbc.connect,
+    ) -> None:
+        """Inicializa o pool vazio; as conexões são abertas sob demanda."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            msg = f"Tamanhos de pool inválidos: min_size={min_size}, max_size={max_size}"
+            raise ValueError(msg)
+
+        self.connection_string: str = connection_string
+        """String de conexão das conexões do pool."""
+
+        self.min_size: int = min_size
+        """Quantidade de conexões ociosas que não são fechadas por `idle_timeout`."""
+
+        self.max_size: int = max_size
+        """Quantidade máxima de conexões abertas (em uso e ociosas)."""
+
+        self.idle_timeout: float = idle_timeout
+        """Tempo máximo, em segundos, que uma conexão permanece ociosa antes de ser fechada."""
+
+        self.pre_ping: bool = pre_ping
+        """Testa a conexão ociosa antes de entregá-la."""
+
+        self.acquire_timeout: float = acquire_timeout
+        """Tempo máximo, em segundos, de espera por uma conexão com o pool cheio."""
+
+        self.attrs_before: dict[int, Any] = dict(attrs_before or {})
+        """Atributos ODBC definidos antes de abrir cada conexão (ex.: tamanho do pacote)."""
+
+        self.stats: PoolStats = PoolStats()
+        """Estatísticas de uso do pool."""
+
+        self._connect = connect
+        self._idle: list[tuple[pyodbc.Connection, float]] = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self) -> pyodbc.Connection:
+        """Retira uma conexão do pool, abrindo uma nova se não houver conexão ociosa.
+
+        Com o pool cheio, aguarda a devolução de uma conexão por até `acquire_timeout` segundos,
+        lançando `TimeoutError` ao final.
+        """
+        with self._condition:
+            self._expire_idle()
+            if not self._idle and self._size >= self.max_size:
+                self.stats.waits += 1
+                started_at = time.perf_counter()
+                available = self._condition.wait_for(
+                    lambda: bool(self._idle) or self._size < self.max_size,
+                    timeout=self.acquire_timeout,
+                )
+                self.stats.wait_time += time.perf_counter() - started_at
+                if not available:
+                    msg = f"Nenhuma conexão disponível no pool após {self.acquire_timeout}s."
+                    raise TimeoutError(msg)
+            if self._idle:
+                conn, _ = self._idle.pop()
+            else:
+                conn = None
+                self._size += 1
+        if conn is not None:
+            alive = self._is_alive(conn)
+            with self._condition:
+                if alive:
+                    self.stats.hits += 1
+                else:
+                    self.stats.stale += 1
+            if alive:
+                return conn
+            # A vaga da conexão inválida é reaproveitada pela nova conexão
+            self._close(conn)
+        return self._open()
+
+    def release(self, conn: pyodbc.Connection, *, discard: bool = False) -> None:
+        """Devolve a conexão ao pool, desfazendo a transação pendente.
+
+        Com `discard`, ou se a conexão falhar ao desfazer a transação, ela é fechada, assim como as
+        conexões devolvidas a um pool já fechado (ex.: após `close_connection_pools`).
+        """
+        with self._condition:
+            discard = discard or self._closed
+        if not discard:
+            try:
+                conn.rollback()
+            except pyodbc.Error:
+                discard = True
+        if discard:
+            with self._condition:
+                self.stats.discarded += 1
+                self._size -= 1
+                self._condition.notify()
+            self._close(conn)
+            return
+        with self._condition:
+            if not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._condition.notify()
+                return
+            self._size -= 1
+        # O pool foi fechado durante o `rollback`
+        self._close(conn)
+
+    def close(self) -> None:
+        """Fecha as conexões ociosas do pool. As conexões em uso são fechadas na devolução."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna as estatísticas e a ocupação atual do pool."""
+        with self._condition:
+            return {
+                **self.stats.as_dict(),
+                "size": self._size,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+            }
+
+    def _open(self) -> pyodbc.Connection:
+        """Abre uma nova conexão, liberando a vaga reservada se a abertura falhar."""
+        with self._condition:
+            self.stats.misses += 1
+        try:
+            if self.attrs_before:
+                return self._connect(self.connection_string, attrs_before=self.attrs_before)
+            return self._connect(self.connection_string)
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _is_alive(self, conn: pyodbc.Connection) -> bool:
+        """Executa o teste de saúde na conexão, quando `pre_ping` está ativo."""
+        if not self.pre_ping:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute(PING_QUERY).fetchone()
+            cursor.close()
+        except pyodbc.Error:
+            self.logger.warning("Conexão ociosa do pool inválida. Abrindo uma nova conexão.")
+            return False
+        return True
+
+    def _expire_idle(self) -> None:
+        """Fecha as conexões ociosas há mais de `idle_timeout`, mantendo `min_size` (com lock)."""
+        deadline = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < deadline and self._size > self.min_size:
+            conn, _ = self._idle.pop(0)
+            self._size -= 1
+            self.stats.expired += 1
+            self._close(conn)
+
+    def _close(self, conn: pyodbc.Connection) -> None:
+        """Fecha a conexão, ignorando erros de uma conexão já interrompida."""
+        try:
+            conn.close()
+        except pyodbc.Error:
+            self.logger.debug("Erro ignorado ao fechar uma conexão do pool.")
+
+
+_pools: dict[tuple[str, tuple[tuple[int, Any], ...]], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(connection_string: str, **pool_options: Any) -> ConnectionPool:
+    """Retorna o pool da string de conexão, criando-o com as opções na primeira chamada.
+
+    Os pools são compartilhados no processo, de modo que consultas e clientes com a mesma string
+    de conexão (servidor, banco e credenciais) e os mesmos `attrs_before` reutilizam as mesmas
+    conexões. As opções das chamadas seguintes não alteram o pool já criado; as que diferem dele
+    (ex.: outro `max_size`) são registradas em um aviso.
+    """
+    key = (connection_string, tuple(sorted((pool_options.get("attrs_before") or {}).items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(connection_string, **pool_options)
+            _pools[key] = pool
+            return pool
+    ignored = {
+        name: pool_options[name]
+        for name in POOL_OPTIONS
+        if name in pool_options and pool_options[name] != getattr(pool, name)
+    }
+    if ignored:
+        pool.logger.warning(
+            f"Opções ignoradas: o pool da string de conexão já existe, com max_size="
+            f"{pool.max_size}, min_size={pool.min_size}, idle_timeout={pool.idle_timeout} e "
+            f"pre_ping={pool.pre_ping}, e não é recriado com {ignored}."
+        )
+    return pool
+
+
+def close_connection_pools() -> None:
+    """Fecha as conexões ociosas de todos os pools do processo."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_connection_pools)
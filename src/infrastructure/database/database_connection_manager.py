@@ -1,48 +1,149 @@
-"""Gerencia conexões com um banco de dados SQL Server via ODBC."""
+"""Gerencia conexões com um banco de dados SQL Server via ODBC ou com um banco embarcado."""
 
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 import json
 import re
 import types
-from typing import TYPE_CHECKING
-
-import pyodbc
+from typing import TYPE_CHECKING, Any
 
 from src.common.base.base_class import BaseClass
+from src.common.instrumentation import NO_STAGES, QueryStages
 from src.config.constants import REQUIRED_KEYWORDS
+from src.infrastructure.database.backends import DatabaseBackend, OdbcBackend
+from src.infrastructure.database.connection_pool import ConnectionPool
 from src.infrastructure.database.connection_string import ConnectionString
 from src.infrastructure.logger import LoggerSingleton
 
 if TYPE_CHECKING:
     from logging import Logger
 
+    from src.common.cancellation import CancellationToken
+
+
+type BatchSize = int | Callable[[], int]
+"""Tamanho dos lotes: fixo ou calculado antes de cada leitura (ex.: pelo orçamento de memória)."""
+
+TABLE_EXISTS_QUERY: str = "SELECT * FROM {table} WHERE 1 = 0"
+"""Consulta sem linhas que falha se a tabela (já delimitada) não existir, em qualquer banco."""
+
 
 # DONE: Classe revisada e validada.
 class DatabaseConnectionManager:
-    """Gerencia conexões com um banco de dados SQL Server via ODBC."""
+    """Gerencia conexões com um banco de dados SQL Server via ODBC ou com um banco embarcado."""
 
-    def __init__(self, connection_params: ConnectionString):
-        """Inicializa os parâmetros de conexão com os dados fornecidos."""
+    def __init__(
+        self,
+        connection_params: ConnectionString | DatabaseBackend,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        """Inicializa os parâmetros de conexão com os dados fornecidos.
+
+        Um `ConnectionString` conecta ao SQL Server via ODBC; um `DatabaseBackend` (ex.:
+        `SqliteBackend`) conecta ao banco do backend. Com `pool`, as conexões são retiradas do
+        pool ao entrar no contexto e devolvidas a ele ao sair, em vez de abertas e fechadas a cada
+        uso.
+        """
         self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
 
-        # Verifica se connection_params é uma instância de ConnectionString
-        if not isinstance(connection_params, ConnectionString):
-            self.logger.error("Parâmetro inválido: connection_params deve ser ConnectionString.")
+        # Verifica se connection_params é uma instância de ConnectionString ou de um backend
+        if isinstance(connection_params, ConnectionString):
+            connection_params = OdbcBackend(connection_params)
+        if not isinstance(connection_params, DatabaseBackend):
+            self.logger.error(
+                "Parâmetro inválido: connection_params deve ser ConnectionString ou "
+                "DatabaseBackend."
+            )
             raise TypeError
 
-        self.connection_string: str = connection_params.connection_string
-        """String de conexão para o banco de dados SQL Server."""
+        self.backend: DatabaseBackend = connection_params
+        """Backend que abre as conexões e trata as particularidades do banco."""
 
         # Valida a connection string antes de prosseguir
-        if not self._is_valid_connection_string(self.connection_string):
+        if isinstance(self.backend, OdbcBackend) and not self._is_valid_connection_string(
+            self.backend.connection_string
+        ):
             self.logger.error("A connection string fornecida é inválida.")
             raise ValueError
 
-        self.conn: pyodbc.Connection | None = None
+        if pool is not None and not self.backend.supports_pool:
+            self.logger.error(f"O backend '{self.backend.name}' não utiliza pool de conexões.")
+            raise ValueError
+
+        self.pool: ConnectionPool | None = pool
+        """Pool de conexões da string de conexão, ou `None` para abrir uma conexão por uso."""
+
+        self.conn: Any = None
         """Conexão com o banco de dados, iniciada como None."""
 
-        self.cursor: pyodbc.Cursor | None = None
+        self.cursor: Any = None
         """Cursor para executar comandos SQL, iniciado como None."""
 
+        self.stages: QueryStages = NO_STAGES
+        """Registrador das etapas de conexão, execução e leitura da consulta atual."""
+
+        self._cancel_token: CancellationToken | None = None
+        self._sample: list[tuple[Any, ...]] = []
+
+    @property
+    def cancel_token(self) -> "CancellationToken | None":
+        """Token de cancelamento da exportação, que interrompe a consulta em execução."""
+        return self._cancel_token
+
+    @cancel_token.setter
+    def cancel_token(self, token: "CancellationToken | None") -> None:
+        """Troca o token, transferindo o registro da conexão aberta para o novo token.
+
+        Permite aplicar o prazo de uma consulta (um token filho do token da execução) à conexão
+        já aberta e compartilhada pelas consultas sequenciais.
+        """
+        if self.conn is not None:
+            if self._cancel_token is not None:
+                self._cancel_token.unregister(self)
+            if token is not None:
+                token.register(self)
+        self._cancel_token = token
+
+    def clone(self) -> "DatabaseConnectionManager":
+        """Retorna um novo gerenciador com os mesmos parâmetros e sem conexão aberta.
+
+        Útil para que cada thread utilize a sua própria conexão, já que conexões `pyodbc` não
+        devem ser compartilhadas entre threads com consultas simultâneas. O pool é compartilhado.
+        """
+        clone = DatabaseConnectionManager(self.backend, self.pool)
+        clone.cancel_token = self.cancel_token
+        return clone
+
+    @contextmanager
+    def released(self) -> Iterator[None]:
+        """Devolve a conexão ao pool durante o bloco e retira outra conexão ao final.
+
+        Enquanto os clones (ex.: as faixas de uma consulta) utilizam o pool compartilhado, a
+        conexão atual ficaria ociosa ocupando uma vaga, e com o pool cheio os clones aguardariam
+        até `acquire_timeout`. Sem pool ou sem conexão aberta, o bloco é executado sem alterações.
+
+        **Exemplo de uso**:
+
+            with db_handler, db_handler.released():
+                run_in_clones(db_handler.clone() for _ in range(4))
+        """
+        if self.pool is None or self.conn is None:
+            yield
+            return
+        self.__exit__(None, None, None)
+        try:
+            yield
+        finally:
+            self.__enter__()
+
+    def quote_identifier(self, name: str) -> str:
+        """Delimita o nome de uma coluna ou tabela conforme o banco (ex.: `[coluna]`)."""
+        return self.backend.quote_identifier(name)
+
+    def can_wrap_query(self, query: str) -> bool:
+        """Indica se o banco aceita a consulta como subconsulta (ex.: nas faixas e na watermark)."""
+        return self.backend.can_wrap_query(query)
+
     def check_connection(self, timeout: int = 10) -> bool:
         """Testa a conexão com o banco de dados sem abrir contexto completo.
 
@@ -55,23 +156,30 @@ class DatabaseConnectionManager:
         """
         try:
             self.logger.info("Testando conexão com o banco de dados...")
-            conn = pyodbc.connect(self.connection_string, timeout=timeout)
+            conn = self.backend.connect(timeout)
             conn.close()
             self.logger.info("Teste de conexão bem-sucedido.")
-        except pyodbc.Error as e:
+        except self.backend.errors as e:
             self.logger.warning(f"Falha ao testar a conexão: {e}")
             return False
         else:
             return True
 
-    def __enter__(self) -> pyodbc.Cursor:
+    def __enter__(self) -> Any:
         """Abre a conexão automaticamente ao entrar no contexto."""
         try:
-            self.conn = pyodbc.connect(self.connection_string)
+            with self.stages.stage("connect"):
+                self.conn = self.pool.acquire() if self.pool else self.backend.connect()
+            self.backend.configure_connection(self.conn)
             self.cursor = self.conn.cursor()
-            self.cursor.fast_executemany = True
+            self.backend.configure_cursor(self.cursor)
+            if self.cancel_token is not None:
+                self.cancel_token.register(self)
             self.logger.info("Conexão com o banco de dados estabelecida.")
-        except pyodbc.Error as e:
+        except (*self.backend.errors, TimeoutError) as e:
+            if self.conn and self.pool:
+                self.pool.release(self.conn, discard=True)
+                self.conn = None
             self.logger.exception("Erro ao conectar ao banco de dados.")
             raise ConnectionError from e
         return self.cursor
@@ -82,16 +190,181 @@ class DatabaseConnectionManager:
         exc_value: BaseException | None,
         traceback: types.TracebackType | None,
     ) -> None:
-        """Garante que a conexão será fechada ao sair do contexto."""
+        """Garante que a conexão será fechada, ou devolvida ao pool, ao sair do contexto.
+
+        Uma conexão que saiu do contexto por um erro do banco é descartada em vez de devolvida.
+        """
+        errors = self.backend.errors
+        discard = isinstance(exc_value, (*errors, ConnectionError)) or isinstance(
+            getattr(exc_value, "__cause__", None), errors
+        )
         try:
             if self.cursor:
                 self.cursor.close()
-            if self.conn:
+            if self.conn and not self.pool:
                 self.conn.close()
-            self.logger.info("Conexão com o banco de dados fechada.")
-        except pyodbc.Error as e:
+                self.logger.info("Conexão com o banco de dados fechada.")
+        except errors as e:
+            discard = True
             self.logger.exception("Erro ao fechar a conexão com o banco de dados.")
             raise ConnectionError from e
+        finally:
+            if self.cancel_token is not None:
+                self.cancel_token.unregister(self)
+            if self.conn and self.pool:
+                self.pool.release(self.conn, discard=discard)
+                self.logger.info("Conexão com o banco de dados devolvida ao pool.")
+            self.cursor = None
+            self.conn = None
+            self._sample = []
+
+    def cancel(self) -> None:
+        """Interrompe a consulta em execução, a partir de outra thread.
+
+        A leitura em andamento falha no driver e `fetch_batches` lança `QueryCancelledError`
+        quando o token de cancelamento foi cancelado.
+        """
+        if self.conn is None or self.cursor is None:
+            return
+        try:
+            self.backend.cancel(self.conn, self.cursor)
+        except (*self.backend.errors, AttributeError):
+            self.logger.debug("Erro ignorado ao cancelar a consulta em execução.")
+
+    def fetch_batches(
+        self, query: str, batch_size: BatchSize, params: Sequence[Any] = ()
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Executa a consulta e retorna o resultado em lotes de até `batch_size` linhas.
+
+        As linhas são lidas do cursor via `fetchmany`, de modo que apenas um lote permanece em
+        memória por vez. Deve ser utilizado dentro do contexto do gerenciador. Se `batch_size`
+        for uma função, ela é chamada antes de cada lote para definir o seu tamanho.
+
+        **Exemplo de uso**:
+
+            with db_handler:
+                for batch in db_handler.fetch_batches("SELECT * FROM CLIENTES", 10_000):
+                    print(db_handler.column_names(), len(batch))
+        """
+        if self.cursor is None:
+            self.logger.error("Cursor não inicializado. Utilize o gerenciador dentro do contexto.")
+            raise RuntimeError
+        next_batch_size = batch_size if callable(batch_size) else lambda: batch_size
+        if next_batch_size() <= 0:
+            self.logger.error(f"Tamanho de lote inválido: {next_batch_size()}")
+            raise ValueError
+        try:
+            self._raise_if_cancelled()
+            with self.stages.stage("execute"):
+                self.backend.execute(self.cursor, query, params)
+            self._sample = []
+            stage = "first_row"
+            while True:
+                self._raise_if_cancelled()
+                with self.stages.stage(stage) as metrics:
+                    rows = self.cursor.fetchmany(next_batch_size())
+                    batch = [tuple(row) for row in rows]
+                    metrics.rows = len(batch)
+                if not batch:
+                    break
+                if stage == "first_row":
+                    # Amostra para inferir os tipos das colunas nos drivers que não os informam
+                    self._sample = batch
+                stage = "fetch"
+                yield batch
+        except self.backend.errors as e:
+            self._raise_if_cancelled(e)
+            self.logger.exception("Erro ao executar a consulta no banco de dados.")
+            raise RuntimeError from e
+
+    def execute(self, query: str, params: Sequence[Any] = ()) -> None:
+        """Executa uma instrução sem resultado (ex.: `CREATE TABLE`), sem confirmar a transação."""
+        if self.cursor is None:
+            self.logger.error("Cursor não inicializado. Utilize o gerenciador dentro do contexto.")
+            raise RuntimeError
+        try:
+            with self.stages.stage("execute"):
+                self.backend.execute(self.cursor, query, params)
+        except self.backend.errors as e:
+            self.logger.exception("Erro ao executar a instrução no banco de dados.")
+            raise RuntimeError from e
+
+    def table_exists(self, table: str) -> bool:
+        """Indica se a tabela (já delimitada, ex.: `[dbo].[VENDAS]`) existe no banco.
+
+        A consulta que falha é desfeita, para não invalidar a transação nos bancos que a abortam
+        após um erro (ex.: DuckDB).
+        """
+        if self.cursor is None:
+            self.logger.error("Cursor não inicializado. Utilize o gerenciador dentro do contexto.")
+            raise RuntimeError
+        try:
+            self.backend.execute(self.cursor, TABLE_EXISTS_QUERY.format(table=table))
+            self.cursor.fetchall()
+        except self.backend.errors:
+            self.rollback()
+            return False
+        return True
+
+    def execute_many(self, query: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Executa a instrução parametrizada (`?`) para cada linha em uma única chamada ao driver.
+
+        No ODBC, o cursor utiliza `fast_executemany`, que envia as linhas ao servidor como um
+        array de parâmetros em vez de uma ida e volta por linha. A transação não é confirmada:
+        utilize `commit` e `rollback`.
+        """
+        if self.cursor is None:
+            self.logger.error("Cursor não inicializado. Utilize o gerenciador dentro do contexto.")
+            raise RuntimeError
+        try:
+            self.cursor.executemany(query, rows)
+        except self.backend.errors as e:
+            self.logger.exception("Erro ao executar a instrução em lote no banco de dados.")
+            raise RuntimeError from e
+
+    def commit(self) -> None:
+        """Confirma a transação em andamento na conexão."""
+        if self.conn is None:
+            self.logger.error("Conexão não estabelecida. Utilize o gerenciador dentro do contexto.")
+            raise RuntimeError
+        try:
+            self.conn.commit()
+        except self.backend.errors as e:
+            self.logger.exception("Erro ao confirmar a transação no banco de dados.")
+            raise RuntimeError from e
+
+    def rollback(self) -> None:
+        """Desfaz a transação em andamento na conexão, se houver uma conexão aberta."""
+        if self.conn is None:
+            return
+        try:
+            self.conn.rollback()
+        except self.backend.errors:
+            self.logger.exception("Erro ao desfazer a transação no banco de dados.")
+
+    def _raise_if_cancelled(self, cause: BaseException | None = None) -> None:
+        """Lança `QueryCancelledError` se a exportação foi cancelada.
+
+        O erro do driver causado pela interrupção (`cause`) é encadeado, de modo que a conexão
+        seja descartada, e não devolvida ao pool, ao sair do contexto.
+        """
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            self.logger.warning(f"Consulta interrompida: {self.cancel_token.reason}.")
+            self.cancel_token.raise_if_cancelled(cause)
+
+    def column_names(self) -> list[str]:
+        """Retorna os nomes das colunas do último resultado executado no cursor."""
+        return [column[0] for column in self.column_description()]
+
+    def column_description(self) -> list[tuple[Any, ...]]:
+        """Retorna a descrição DB-API (nome, tipo, tamanho, precisão, escala, nulo) das colunas.
+
+        Nos bancos cujo driver não informa o tipo Python das colunas (ex.: SQLite), o tipo é
+        inferido do primeiro lote lido por `fetch_batches`.
+        """
+        if self.cursor is None or self.cursor.description is None:
+            return []
+        return self.backend.describe(self.cursor.description, self._sample)
 
     @staticmethod
     def _is_valid_connection_string(conn_str: str) -> bool:
@@ -0,0 +1,167 @@
+"""Ajustes da leitura dos resultados via ODBC: `arraysize`, conversores de saída e pacote de rede.
+
+Os conversores de saída (`Connection.add_output_converter`) recebem os bytes brutos de uma coluna
+do tipo SQL registrado e devolvem o valor Python, substituindo a conversão genérica do `pyodbc`:
+
+- `datetimeoffset`: `DATETIMEOFFSET` como `datetime` com fuso (sem o conversor, o `pyodbc` não
+  lê colunas desse tipo).
+- `nvarchar_max`: `NVARCHAR(MAX)` decodificado diretamente de UTF-16.
+- `decimal_as: float` registra o conversor de `DECIMAL` e `NUMERIC` para `float`, evitando a
+  criação de um `Decimal` por célula, ao custo da precisão além de 15 dígitos.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+import datetime as dt
+import decimal
+import struct
+from typing import Any
+
+import pyodbc
+
+SQL_SS_TIMESTAMPOFFSET: int = -155
+"""Código ODBC do tipo `DATETIMEOFFSET` do SQL Server, não exposto pelo `pyodbc`."""
+
+SQL_ATTR_PACKET_SIZE: int = 112
+"""Atributo ODBC do tamanho do pacote de rede, definido antes da conexão (`attrs_before`)."""
+
+DATETIMEOFFSET_STRUCT: struct.Struct = struct.Struct("<6hI2h")
+"""Layout do `SQL_SS_TIMESTAMPOFFSET_STRUCT`: data, hora, fração (ns) e deslocamento do fuso."""
+
+NUMERIC_STRUCT_SIZE: int = 19
+"""Tamanho do `SQL_NUMERIC_STRUCT`: precisão, escala, sinal e mantissa de 16 bytes."""
+
+DECIMAL_MODES: tuple[str, ...] = ("decimal", "float")
+"""Tipos Python possíveis das colunas `DECIMAL` e `NUMERIC`."""
+
+
+def convert_datetimeoffset(value: bytes | None) -> dt.datetime | None:
+    """Converte um `DATETIMEOFFSET` em `datetime` com o fuso da coluna."""
+    if value is None:
+        return None
+    year, month, day, hour, minute, second, fraction, tz_hour, tz_minute = (
+        DATETIMEOFFSET_STRUCT.unpack(value)
+    )
+    offset = dt.timedelta(hours=tz_hour, minutes=tz_minute)
+    return dt.datetime(
+        year, month, day, hour, minute, second, fraction // 1000, dt.timezone(offset)
+    )
+
+
+def convert_decimal_to_float(value: bytes | None) -> float | None:
+    """Converte um `DECIMAL`/`NUMERIC` em `float`, a partir do texto ou do `SQL_NUMERIC_STRUCT`."""
+    if value is None:
+        return None
+    if len(value) != NUMERIC_STRUCT_SIZE or value[:1].isdigit() or value[:1] in b"+-.":
+        return float(value)
+    _, scale, sign = value[0], value[1], value[2]
+    number = int.from_bytes(value[3:], "little") / 10**scale
+    # No SQL_NUMERIC_STRUCT, o sinal 1 indica positivo e 0 negativo
+    return number if sign else -number
+
+
+def convert_nvarchar_max(value: bytes | None) -> str | None:
+    """Decodifica um `NVARCHAR(MAX)` lido como UTF-16."""
+    if value is None:
+        return None
+    return value.decode("utf-16-le")
+
+
+OUTPUT_CONVERTERS: dict[str, tuple[tuple[int, ...], Callable[[bytes | None], Any]]] = {
+    "datetimeoffset": ((SQL_SS_TIMESTAMPOFFSET,), convert_datetimeoffset),
+    "nvarchar_max": ((pyodbc.SQL_WLONGVARCHAR,), convert_nvarchar_max),
+}
+"""Conversores de saída disponíveis em `output_converters`: tipos SQL e função de conversão."""
+
+
+@dataclass(frozen=True)
+class FetchTuning:
+    """Ajustes da leitura aplicados às conexões e cursores ODBC.
+
+    **Exemplo de uso**:
+
+        tuning = FetchTuning.from_options(export_config)
+        conn = pyodbc.connect(connection_string, attrs_before=tuning.attrs_before())
+        tuning.configure_connection(conn)
+    """
+
+    arraysize: int = 0
+    """Valor de `cursor.arraysize`, ou `0` para manter o padrão do driver."""
+
+    packet_size: int = 0
+    """Tamanho do pacote de rede, em bytes (512 a 32767). `0` mantém o padrão do driver."""
+
+    output_converters: tuple[str, ...] = ()
+    """Nomes dos conversores de saída registrados em cada conexão (`OUTPUT_CONVERTERS`)."""
+
+    decimal_as: str = "decimal"
+    """Tipo Python das colunas `DECIMAL` e `NUMERIC` (`decimal` ou `float`)."""
+
+    def __post_init__(self) -> None:
+        """Valida os conversores e o tipo dos decimais."""
+        unknown = [name for name in self.output_converters if name not in OUTPUT_CONVERTERS]
+        if unknown:
+            msg = f"Conversores de saída desconhecidos: {unknown}. Use {list(OUTPUT_CONVERTERS)}."
+            raise ValueError(msg)
+        if self.decimal_as not in DECIMAL_MODES:
+            msg = f"Tipo de decimal inválido: '{self.decimal_as}'. Use {list(DECIMAL_MODES)}."
+            raise ValueError(msg)
+
+    @classmethod
+    def from_options(cls, export_config: dict[str, Any]) -> "FetchTuning":
+        """Monta os ajustes a partir das opções de exportação."""
+        return cls(
+            arraysize=int(export_config.get("arraysize") or 0),
+            packet_size=int(export_config.get("packet_size") or 0),
+            output_converters=tuple(export_config.get("output_converters") or ()),
+            decimal_as=str(export_config.get("decimal_as") or "decimal"),
+        )
+
+    def value_fingerprint(self) -> str:
+        """Identifica os ajustes que alteram os valores lidos: os conversores e o tipo dos decimais.
+
+        Compõe a chave do cache de resultados. `arraysize` e `packet_size` alteram apenas o
+        desempenho da leitura e não fazem parte da identificação.
+        """
+        converters = ",".join(sorted(self.output_converters))
+        return f"output_converters={converters};decimal_as={self.decimal_as}"
+
+    def attrs_before(self) -> dict[int, Any]:
+        """Retorna os atributos ODBC definidos antes da conexão."""
+        return {SQL_ATTR_PACKET_SIZE: self.packet_size} if self.packet_size else {}
+
+    def converters(self) -> dict[int, Callable[[bytes | None], Any]]:
+        """Retorna a função de conversão de cada tipo SQL com conversor registrado."""
+        converters: dict[int, Callable[[bytes | None], Any]] = {}
+        for name in self.output_converters:
+            sql_types, converter = OUTPUT_CONVERTERS[name]
+            converters.update(dict.fromkeys(sql_types, converter))
+        if self.decimal_as == "float":
+            converters.update(
+                dict.fromkeys((pyodbc.SQL_DECIMAL, pyodbc.SQL_NUMERIC), convert_decimal_to_float)
+            )
+        return converters
+
+    def configure_connection(self, conn: pyodbc.Connection) -> None:
+        """Registra os conversores de saída na conexão, substituindo os anteriores."""
+        conn.clear_output_converters()
+        for sql_type, converter in self.converters().items():
+            conn.add_output_converter(sql_type, converter)
+
+    def configure_cursor(self, cursor: pyodbc.Cursor) -> None:
+        """Define o `arraysize` do cursor, quando configurado."""
+        if self.arraysize > 0:
+            cursor.arraysize = self.arraysize
+
+    def describe(self, description: Sequence[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+        """Retorna a descrição das colunas com o tipo Python produzido pelos conversores.
+
+        Com `decimal_as: float`, as colunas `Decimal` são descritas como `float`, de modo que os
+        escritores (ex.: schema Arrow) e o plano de tipos tratem os valores convertidos.
+        """
+        if self.decimal_as != "float":
+            return [tuple(column) for column in description]
+        return [
+            (column[0], float, *column[2:]) if column[1] is decimal.Decimal else tuple(column)
+            for column in description
+        ]
@@ -0,0 +1,112 @@
+"""Módulo do diário (journal) de checkpoints das exportações, utilizado para retomá-las."""
+
+import datetime as dt
+import json
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Any
+
+from src.config.constants import BRT
+from src.infrastructure.logger import LoggerSingleton
+from src.repositories.export_writers import temp_file_for
+from src.repositories.watermark_store import deserialize_value, serialize_value
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+CHECKPOINT_FILE_NAME: str = ".checkpoint.json"
+"""Nome do arquivo do journal, gravado na pasta de exportação do cliente."""
+
+
+class CheckpointJournal:
+    """Registra o progresso de cada consulta de uma execução da exportação de um cliente.
+
+    Uma consulta fica `in_progress` enquanto os lotes são gravados, com o arquivo temporário, as
+    linhas, o seu tamanho e a última chave de ordenação confirmados, e passa a `completed` após o
+    arquivo ser publicado. Cada alteração é gravada de forma atômica, de modo que o journal
+    permanece válido mesmo se a execução for interrompida.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        """Inicializa o journal na pasta de exportação do cliente, carregando o estado gravado."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.journal_file: Path = folder / CHECKPOINT_FILE_NAME
+        """Caminho do arquivo do journal."""
+
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = self._read_state()
+
+    def _read_state(self) -> dict[str, Any]:
+        """Lê o journal, retornando um estado vazio se ele não existir ou estiver inválido."""
+        if not self.journal_file.exists():
+            return {"queries": {}}
+        try:
+            return json.loads(self.journal_file.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            self.logger.warning(f"Journal inválido, ignorado: '{self.journal_file}'")
+            return {"queries": {}}
+
+    def _write_state(self) -> None:
+        """Grava o estado atual do journal de forma atômica."""
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = temp_file_for(self.journal_file)
+        temp_file.write_text(json.dumps(self._state, indent=4), encoding="utf-8")
+        temp_file.replace(self.journal_file)
+
+    def reset(self) -> None:
+        """Inicia uma nova execução, descartando o progresso registrado anteriormente."""
+        with self._lock:
+            self._state = {"started_at": dt.datetime.now(BRT).isoformat(), "queries": {}}
+            self._write_state()
+
+    def get(self, query_name: str) -> dict[str, Any] | None:
+        """Retorna o progresso registrado da consulta, ou `None` se ela ainda não foi iniciada."""
+        with self._lock:
+            entry = self._state["queries"].get(query_name)
+        if not entry:
+            return None
+        if entry.get("last_key") is not None:
+            return {**entry, "last_key": deserialize_value(entry["last_key"], entry["key_type"])}
+        return dict(entry)
+
+    def record_chunk(  # noqa: PLR0913
+        self,
+        query_name: str,
+        *,
+        file: Path,
+        temp_file: Path,
+        rows: int,
+        size: int,
+        last_key: Any,
+    ) -> None:
+        """Registra o último lote confirmado da consulta em andamento e o seu arquivo temporário."""
+        key_text, key_type = serialize_value(last_key)
+        self._update(
+            query_name,
+            {
+                "status": "in_progress",
+                "file": str(file),
+                "temp_file": str(temp_file),
+                "rows": rows,
+                "bytes": size,
+                "last_key": key_text,
+                "key_type": key_type,
+            },
+        )
+
+    def complete(self, query_name: str, *, file: Path, rows: int, size: int) -> None:
+        """Registra a conclusão da consulta, com o arquivo publicado, as linhas e os bytes."""
+        self._update(
+            query_name, {"status": "completed", "file": str(file), "rows": rows, "bytes": size}
+        )
+
+    def _update(self, query_name: str, entry: dict[str, Any]) -> None:
+        """Substitui o registro da consulta e grava o journal."""
+        with self._lock:
+            self._state["queries"][query_name] = {
+                **entry,
+                "updated_at": dt.datetime.now(BRT).isoformat(),
+            }
+            self._write_state()
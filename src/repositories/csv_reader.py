@@ -0,0 +1,160 @@
+"""Módulo da leitura de arquivos CSV em lotes, para a importação com consumo de memória constante.
+
+O arquivo é lido linha a linha pelo módulo `csv` e entregue em lotes de tuplas, prontos para o
+`executemany`, de modo que apenas um lote permanece em memória por vez, independentemente do
+tamanho do arquivo. Com `byte_range`, apenas os registros de um trecho do arquivo (ver
+`csv_splitter`) são lidos, para a importação paralela de um mesmo arquivo.
+"""
+
+from collections.abc import Iterator
+import csv
+from pathlib import Path
+import types
+from typing import IO, Any, Self
+
+from src.repositories.csv_splitter import ByteRange, open_byte_range
+
+type CsvRow = tuple[str | None, ...]
+"""Linha do CSV com os valores como texto (ou `None` para os campos vazios)."""
+
+
+class CsvBatchReader:
+    """Lê um arquivo CSV com cabeçalho em lotes de linhas.
+
+    **Exemplo de uso**:
+
+        with CsvBatchReader(Path("vendas.csv"), delimiter=";") as reader:
+            for batch in reader.batches(10_000):
+                cursor.executemany(insert_query, batch)
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        csv_file: Path,
+        encoding: str = "utf-8",
+        delimiter: str = ",",
+        quotechar: str = '"',
+        *,
+        empty_as_null: bool = True,
+        byte_range: ByteRange | None = None,
+    ) -> None:
+        """Inicializa o leitor com o arquivo e o seu formato."""
+        self.csv_file: Path = csv_file
+        """Arquivo CSV lido."""
+
+        self.encoding: str = encoding
+        """Codificação do arquivo."""
+
+        self.delimiter: str = delimiter
+        """Delimitador dos campos."""
+
+        self.quotechar: str = quotechar
+        """Caractere de aspas dos campos."""
+
+        self.empty_as_null: bool = empty_as_null
+        """Lê os campos vazios como `None` (`NULL` no banco) em vez de texto vazio."""
+
+        self.byte_range: ByteRange | None = byte_range
+        """Trecho do arquivo lido, alinhado aos registros, ou `None` para ler o arquivo inteiro."""
+
+        self.columns: list[str] = []
+        """Nomes das colunas, lidos do cabeçalho ao abrir o arquivo."""
+
+        self.rows_read: int = 0
+        """Quantidade de linhas de dados lidas até o momento."""
+
+        self._file: IO[str] | None = None
+        self._reader: Any = None
+
+    @classmethod
+    def from_options(
+        cls,
+        csv_file: Path,
+        import_config: dict[str, Any],
+        byte_range: ByteRange | None = None,
+    ) -> "CsvBatchReader":
+        """Cria o leitor com o formato das opções de importação."""
+        return cls(
+            csv_file,
+            encoding=import_config["encoding"],
+            delimiter=import_config["delimiter"],
+            quotechar=import_config["quotechar"],
+            empty_as_null=bool(import_config["empty_as_null"]),
+            byte_range=byte_range,
+        )
+
+    def __enter__(self) -> Self:
+        """Abre o arquivo e lê o cabeçalho ao entrar no contexto."""
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Fecha o arquivo ao sair do contexto."""
+        self.close()
+
+    def open(self) -> None:
+        """Abre o arquivo e lê o cabeçalho com os nomes das colunas.
+
+        Com `byte_range`, os registros são lidos a partir do trecho, após a leitura do cabeçalho.
+        """
+        self._file = self.csv_file.open("r", encoding=self.encoding, newline="")
+        self._reader = csv.reader(self._file, delimiter=self.delimiter, quotechar=self.quotechar)
+        header = next(self._reader, None)
+        if not header:
+            self.close()
+            msg = f"O arquivo CSV '{self.csv_file}' não possui cabeçalho."
+            raise ValueError(msg)
+        self.columns = [column.strip() for column in header]
+        if self.byte_range is not None:
+            self._file.close()
+            self._file = open_byte_range(self.csv_file, self.byte_range, self.encoding)
+            self._reader = csv.reader(
+                self._file, delimiter=self.delimiter, quotechar=self.quotechar
+            )
+
+    def close(self) -> None:
+        """Fecha o arquivo."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._reader = None
+
+    def batches(self, batch_size: int) -> Iterator[list[CsvRow]]:
+        """Retorna as linhas do arquivo em lotes de até `batch_size` linhas.
+
+        As linhas em branco (ex.: ao final do arquivo) são ignoradas. Lança `ValueError`, com o
+        número da linha, se uma linha tiver uma quantidade de campos diferente da do cabeçalho.
+        """
+        if self._reader is None:
+            msg = "O arquivo CSV não foi aberto. Utilize o leitor dentro do contexto."
+            raise RuntimeError(msg)
+        reader = self._reader
+        width = len(self.columns)
+        empty_as_null = self.empty_as_null
+        while True:
+            batch: list[list[str]] = []
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != width:
+                    location = f"do trecho {list(self.byte_range)} " if self.byte_range else ""
+                    msg = (
+                        f"Linha {reader.line_num} {location}do arquivo '{self.csv_file}' "
+                        f"com {len(row)} campos em vez de {width}."
+                    )
+                    raise ValueError(msg)
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    break
+            if not batch:
+                return
+            self.rows_read += len(batch)
+            if empty_as_null:
+                yield [tuple(value or None for value in row) for row in batch]
+            else:
+                yield [tuple(row) for row in batch]
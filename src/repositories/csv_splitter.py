@@ -0,0 +1,122 @@
+"""Módulo da divisão de arquivos CSV em trechos de bytes, para a importação paralela de um arquivo.
+
+Os trechos terminam sempre ao final de um registro: a quebra de linha escolhida é a primeira após
+o ponto de divisão que esteja fora de aspas, o que é determinado pela paridade da quantidade de
+aspas desde o início do trecho anterior (aspas escapadas, `""`, não alteram a paridade). O arquivo
+é lido por `mmap`, de modo que a varredura e os processos que leem os trechos compartilham o cache
+de páginas do sistema operacional.
+"""
+
+from collections.abc import Buffer
+import io
+from itertools import pairwise
+import mmap
+from pathlib import Path
+from typing import IO
+
+type ByteRange = tuple[int, int]
+"""Trecho do arquivo, do byte inicial (inclusivo) ao final (exclusivo)."""
+
+SCAN_BLOCK_BYTES: int = 64 * 1024**2
+"""Bytes contados por vez na varredura das aspas, para limitar a memória das cópias do `mmap`."""
+
+
+def split_csv_ranges(
+    csv_file: Path, parts: int, encoding: str = "utf-8", quotechar: str | None = '"'
+) -> list[ByteRange]:
+    """Divide os registros (após o cabeçalho) em até `parts` trechos de tamanhos próximos.
+
+    Cada trecho começa no início de um registro e termina ao final de outro, mesmo com quebras de
+    linha dentro de campos entre aspas. Arquivos pequenos ou com registros longos podem resultar
+    em menos trechos. A codificação deve representar a quebra de linha e as aspas com um único
+    byte ASCII (ex.: UTF-8 e cp1252); caso contrário, lança `ValueError`.
+    """
+    quote = _encode_char(quotechar, encoding) if quotechar else b""
+    if _encode_char("\n", encoding) != b"\n" or len(quote) > 1:
+        msg = f"A codificação '{encoding}' não permite dividir o arquivo em trechos de bytes."
+        raise ValueError(msg)
+    size = csv_file.stat().st_size
+    if size == 0:
+        return []
+    with csv_file.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        boundaries = [_next_record_start(mm, 0, 0, quote)]
+        for part in range(1, max(parts, 1)):
+            target = boundaries[0] + (size - boundaries[0]) * part // parts
+            if target <= boundaries[-1]:
+                continue
+            boundary = _next_record_start(mm, boundaries[-1], target, quote)
+            if boundary >= size:
+                break
+            boundaries.append(boundary)
+    boundaries.append(size)
+    return [(start, end) for start, end in pairwise(boundaries) if end > start]
+
+
+def open_byte_range(csv_file: Path, byte_range: ByteRange, encoding: str = "utf-8") -> IO[str]:
+    """Abre um trecho do arquivo como texto, lido do `mmap` sem copiar o trecho inteiro.
+
+    O texto é lido com `newline=""`, como exige o módulo `csv`.
+    """
+    return io.TextIOWrapper(
+        io.BufferedReader(_MmapRangeReader(csv_file, byte_range)), encoding=encoding, newline=""
+    )
+
+
+def _encode_char(char: str, encoding: str) -> bytes:
+    """Retorna os bytes do caractere na codificação, sem a BOM das codificações que a gravam."""
+    return f"a{char}".encode(encoding)[len("a".encode(encoding)) :]
+
+
+def _next_record_start(mm: mmap.mmap, record_start: int, target: int, quote: bytes) -> int:
+    """Retorna o início do primeiro registro a partir de `target`.
+
+    `record_start` deve ser o início de um registro anterior a `target`, a partir do qual a
+    paridade das aspas indica se `target` está dentro de um campo entre aspas.
+    """
+    inside_quotes = bool(_count(mm, quote, record_start, target) % 2)
+    position = target
+    while (newline := mm.find(b"\n", position)) != -1:
+        inside_quotes ^= bool(_count(mm, quote, position, newline) % 2)
+        position = newline + 1
+        if not inside_quotes:
+            return position
+    return len(mm)
+
+
+def _count(mm: mmap.mmap, quote: bytes, start: int, end: int) -> int:
+    """Conta as aspas entre `start` e `end`, em blocos de `SCAN_BLOCK_BYTES`."""
+    if not quote:
+        return 0
+    return sum(
+        mm[position : min(position + SCAN_BLOCK_BYTES, end)].count(quote)
+        for position in range(start, end, SCAN_BLOCK_BYTES)
+    )
+
+
+class _MmapRangeReader(io.RawIOBase):
+    """Leitor binário de um trecho do arquivo, a partir do `mmap`."""
+
+    def __init__(self, csv_file: Path, byte_range: ByteRange) -> None:
+        """Mapeia o arquivo e posiciona a leitura no início do trecho."""
+        self._file = csv_file.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._position, self._end = byte_range
+
+    def readable(self) -> bool:
+        """Indica que o leitor permite a leitura."""
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        """Copia os próximos bytes do trecho para `buffer` e retorna a quantidade copiada."""
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self._end - self._position)
+        view[:size] = self._mm[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        """Desfaz o mapeamento e fecha o arquivo."""
+        if not self.closed:
+            self._mm.close()
+            self._file.close()
+        super().close()
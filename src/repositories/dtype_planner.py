@@ -0,0 +1,146 @@
+"""Módulo do plano de tipos (dtypes) dos DataFrames montados a partir do resultado das consultas.
+
+O `pd.read_sql_query` infere os tipos a partir dos valores: textos viram colunas `object`, com um
+objeto Python por célula, e inteiros com `NULL` viram `float64`. O plano utiliza a descrição do
+cursor (tipo, precisão e nulidade) para escolher tipos compactos: inteiros anuláveis, textos
+armazenados no Arrow e categorias para textos de baixa cardinalidade.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import datetime as dt
+from importlib.util import find_spec
+from typing import Any
+
+import pandas as pd
+
+STRING_DTYPE: str = "string[pyarrow]" if find_spec("pyarrow") else "string"
+"""Dtype das colunas de texto: armazenado no Arrow quando o `pyarrow` está instalado."""
+
+INTEGER_DTYPES: tuple[tuple[int, str], ...] = (
+    (3, "UInt8"),
+    (5, "Int16"),
+    (10, "Int32"),
+)
+"""Menor dtype inteiro que comporta a precisão da coluna (`TINYINT`, `SMALLINT` e `INT`)."""
+
+DEFAULT_CATEGORICAL_THRESHOLD: float = 0.5
+"""Proporção máxima de valores distintos para que uma coluna de texto vire categoria."""
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """Retorna a memória ocupada pelo DataFrame, em bytes, incluindo o conteúdo dos objetos."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+@dataclass(frozen=True)
+class DtypePlan:
+    """Dtypes das colunas de um resultado, na ordem de `cursor.description`.
+
+    Colunas sem dtype planejado (`None`), como decimais e datas sem hora, mantêm a conversão do
+    pandas.
+
+    **Exemplo de uso**:
+
+        plan = DtypePlan.from_description(db_handler.column_description(), downcast=True)
+        df = plan.apply(pd.DataFrame.from_records(batch, columns=plan.columns))
+    """
+
+    columns: tuple[str, ...]
+    """Nomes das colunas do resultado."""
+
+    dtypes: tuple[str | None, ...]
+    """Dtype planejado de cada coluna, ou `None` para manter o tipo inferido pelo pandas."""
+
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD
+    """Proporção máxima de valores distintos para converter uma coluna de texto em categoria."""
+
+    @classmethod
+    def from_description(
+        cls,
+        description: Sequence[tuple[Any, ...]],
+        *,
+        downcast: bool = False,
+        categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    ) -> "DtypePlan":
+        """Monta o plano a partir de `cursor.description`.
+
+        Com `downcast`, os inteiros utilizam o menor tipo que comporta a precisão da coluna
+        (ex.: `Int16` para `SMALLINT`) em vez de `Int64`.
+        """
+        return cls(
+            columns=tuple(column[0] for column in description),
+            dtypes=tuple(cls._plan_column(column, downcast=downcast) for column in description),
+            categorical_threshold=categorical_threshold,
+        )
+
+    @staticmethod
+    def _plan_column(column: tuple[Any, ...], *, downcast: bool) -> str | None:
+        """Retorna o dtype da coluna a partir do tipo, da precisão e da nulidade."""
+        _, type_code, _, _, precision, _, null_ok = column[:7]
+        if type_code is bool:
+            return "boolean" if null_ok else "bool"
+        if type_code is int:
+            dtype = "Int64"
+            if downcast and precision:
+                dtype = next(
+                    (name for digits, name in INTEGER_DTYPES if precision <= digits), dtype
+                )
+            return dtype if null_ok else dtype.lower()
+        if type_code is str:
+            return STRING_DTYPE
+        if type_code is float:
+            return "float64"
+        if type_code is dt.datetime:
+            return "datetime64[ns]"
+        return None
+
+    @property
+    def text_columns(self) -> list[int]:
+        """Posições das colunas de texto, candidatas à conversão em categoria."""
+        return [position for position, dtype in enumerate(self.dtypes) if dtype == STRING_DTYPE]
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Converte as colunas do DataFrame para os dtypes planejados.
+
+        As colunas são convertidas por posição, de modo que nomes repetidos são suportados. Uma
+        coluna cujos valores não comportam o dtype planejado mantém o tipo original.
+        """
+        for position, dtype in enumerate(self.dtypes):
+            if dtype is None or position >= df.shape[1]:
+                continue
+            try:
+                df.isetitem(position, df.iloc[:, position].astype(dtype))
+            except (TypeError, ValueError, OverflowError):
+                continue
+        return df
+
+    def categorize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Converte em categoria as colunas de texto com poucos valores distintos.
+
+        Deve ser aplicado ao DataFrame completo, já que as categorias de lotes distintos não são
+        preservadas na concatenação.
+        """
+        if df.empty:
+            return df
+        max_unique = self.categorical_threshold * len(df)
+        for position in self.text_columns:
+            series = df.iloc[:, position]
+            if series.nunique(dropna=True) <= max_unique:
+                df.isetitem(position, series.astype("category"))
+        return df
+
+
+def dtype_plan_for(
+    description: Sequence[tuple[Any, ...]], export_config: dict[str, Any]
+) -> DtypePlan | None:
+    """Retorna o plano de tipos da configuração, ou `None` se `compact_dtypes` estiver desligado."""
+    if not export_config.get("compact_dtypes"):
+        return None
+    return DtypePlan.from_description(
+        description,
+        downcast=bool(export_config.get("downcast_numerics")),
+        categorical_threshold=float(
+            export_config.get("categorical_threshold", DEFAULT_CATEGORICAL_THRESHOLD)
+        ),
+    )
@@ -0,0 +1,174 @@
+"""Módulo da detecção da codificação dos arquivos CSV importados.
+
+A detecção verifica, em ordem, a marca de ordem de bytes (BOM) e a decodificação estrita em UTF-8
+de uma amostra limitada do arquivo (início, meio e fim); apenas se ambas falharem, o `chardet` é
+executado sobre a amostra, e não sobre o arquivo inteiro. O resultado é gravado em um arquivo ao
+lado do CSV (`<arquivo>.encoding.json`), validado pelo tamanho, pela data de modificação e pelo
+hash do início do arquivo, de modo que as importações seguintes do mesmo arquivo não repetem a
+detecção.
+"""
+
+import codecs
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+AUTO_ENCODING: str = "auto"
+"""Valor da opção `encoding` que ativa a detecção da codificação de cada arquivo."""
+
+ENCODING_SAMPLE_BYTES: int = 1024**2
+"""Bytes da amostra analisada, divididos entre o início, o meio e o fim do arquivo."""
+
+HASH_PREFIX_BYTES: int = 64 * 1024
+"""Bytes do início do arquivo cujo hash valida o cache da detecção."""
+
+ENCODING_SIDECAR_SUFFIX: str = ".encoding.json"
+"""Sufixo do arquivo, ao lado do CSV, com a codificação detectada."""
+
+UTF8_CONTINUATION_MASK: int = 0b1100_0000
+"""Máscara dos dois bits iniciais de um byte UTF-8."""
+
+UTF8_CONTINUATION_BITS: int = 0b1000_0000
+"""Bits iniciais dos bytes de continuação de um caractere UTF-8."""
+
+CHARDET_ENCODING_ALIASES: dict[str, str] = {
+    "ascii": "cp1252",
+    "iso-8859-1": "cp1252",
+    "latin-1": "cp1252",
+}
+"""Codificações informadas pelo `chardet` substituídas por outra que as contém.
+
+O `chardet` informa ISO-8859-1 para arquivos do Windows, mas essa codificação decodifica as aspas
+curvas, o travessão e o `€` (bytes `0x80` a `0x9F` do cp1252) como caracteres de controle.
+"""
+
+BYTE_ORDER_MARKS: tuple[tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+"""Marcas de ordem de bytes e as codificações correspondentes, com as do UTF-32 antes das do UTF-16,
+que são o seu prefixo."""
+
+
+@dataclass(frozen=True)
+class DetectedEncoding:
+    """Codificação detectada de um arquivo e a forma como foi obtida."""
+
+    encoding: str
+    """Codificação, no nome aceito por `open` (ex.: `utf-8-sig` ou `windows-1252`)."""
+
+    method: str
+    """Etapa que definiu a codificação: `bom`, `utf-8`, `chardet` ou `cache`."""
+
+    confidence: float = 1.0
+    """Confiança informada pelo `chardet` (`1.0` nas demais etapas)."""
+
+
+def detect_encoding(
+    csv_file: Path,
+    default: str = "utf-8",
+    sample_bytes: int = ENCODING_SAMPLE_BYTES,
+    *,
+    use_cache: bool = True,
+) -> DetectedEncoding:
+    """Detecta a codificação do arquivo, a partir do cache ou de uma amostra limitada.
+
+    Uma amostra apenas com caracteres ASCII é considerada UTF-8, e o ISO-8859-1 informado pelo
+    `chardet` é substituído pelo cp1252. Se o `chardet` não reconhecer a amostra, retorna
+    `default`. O cache é ignorado (e regravado) se o arquivo mudou; a falha ao gravá-lo (ex.: pasta
+    sem permissão de escrita) não interrompe a detecção.
+    """
+    stat = csv_file.stat()
+    with csv_file.open("rb") as file:
+        head = file.read(HASH_PREFIX_BYTES)
+        fingerprint = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash_prefix": hashlib.sha256(head).hexdigest(),
+        }
+        sidecar = csv_file.with_name(csv_file.name + ENCODING_SIDECAR_SUFFIX)
+        cached = _read_sidecar(sidecar, fingerprint) if use_cache else None
+        if cached is not None:
+            return cached
+        detected = _detect_from_sample(file, head, stat.st_size, sample_bytes, default)
+    if use_cache:
+        with suppress(OSError):
+            sidecar.write_text(
+                json.dumps({**fingerprint, **asdict(detected)}, indent=4), encoding="utf-8"
+            )
+    return detected
+
+
+def _read_sidecar(sidecar: Path, fingerprint: dict[str, Any]) -> DetectedEncoding | None:
+    """Retorna a codificação do cache, se ele existir e corresponder ao arquivo atual."""
+    try:
+        cached = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if any(cached.get(key) != value for key, value in fingerprint.items()):
+        return None
+    return DetectedEncoding(cached["encoding"], "cache", float(cached.get("confidence", 1.0)))
+
+
+def _detect_from_sample(
+    file: Any, head: bytes, size: int, sample_bytes: int, default: str
+) -> DetectedEncoding:
+    """Detecta a codificação pela BOM, pelo UTF-8 estrito ou pelo `chardet`, nessa ordem."""
+    for byte_order_mark, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(byte_order_mark):
+            return DetectedEncoding(encoding, "bom")
+    windows = _read_windows(file, size, sample_bytes)
+    if all(_is_utf8(window) for window in windows):
+        return DetectedEncoding("utf-8", "utf-8")
+    import chardet  # noqa: PLC0415
+
+    result = chardet.detect(b"".join(windows))
+    if not result["encoding"]:
+        return DetectedEncoding(default, "chardet", float(result["confidence"] or 0.0))
+    encoding = result["encoding"].lower()
+    return DetectedEncoding(
+        CHARDET_ENCODING_ALIASES.get(encoding, encoding), "chardet", float(result["confidence"])
+    )
+
+
+def _read_windows(file: Any, size: int, sample_bytes: int) -> list[bytes]:
+    """Lê a amostra em até três janelas (início, meio e fim) de `sample_bytes / 3` bytes.
+
+    As janelas do meio e do fim são ajustadas ao início de um caractere UTF-8, descartando os
+    bytes de continuação iniciais.
+    """
+    window_size = max(sample_bytes // 3, 1)
+    if size <= sample_bytes:
+        file.seek(0)
+        return [file.read()]
+    windows = []
+    for offset in (0, (size - window_size) // 2, size - window_size):
+        file.seek(offset)
+        window = file.read(window_size)
+        if offset:
+            skipped = next(
+                (
+                    index
+                    for index, byte in enumerate(window[:4])
+                    if byte & UTF8_CONTINUATION_MASK != UTF8_CONTINUATION_BITS
+                ),
+                0,
+            )
+            window = window[skipped:]
+        windows.append(window)
+    return windows
+
+
+def _is_utf8(window: bytes) -> bool:
+    """Indica se a janela é UTF-8 válido, admitindo um caractere incompleto ao final."""
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(window, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
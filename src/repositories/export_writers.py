@@ -0,0 +1,842 @@
+"""Módulo de escritores incrementais dos arquivos de exportação (CSV, Parquet e Feather).
+
+Cada escritor recebe o resultado da consulta em lotes de linhas (tuplas) e os grava assim que
+chegam, de modo que o arquivo completo nunca precisa estar em memória. Os arquivos são gravados em
+um temporário (`<arquivo>.<pid>.<thread>.tmp`) e renomeados ao final, para que uma exportação
+interrompida não deixe arquivos truncados.
+"""
+
+from abc import ABC, abstractmethod
+import bz2
+import csv
+from dataclasses import dataclass, replace
+import datetime as dt
+import decimal
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+import threading
+import types
+from typing import IO, TYPE_CHECKING, Any, ClassVar, Self, cast
+
+import pandas as pd
+
+from src.common.instrumentation import NO_STAGES, QueryStages
+from src.infrastructure.logger import LoggerSingleton
+from src.repositories.dtype_planner import DtypePlan, dtype_plan_for
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from logging import Logger
+
+    import pyarrow as pa
+
+type ColumnDescription = tuple[Any, ...]
+"""Descrição de uma coluna no formato DB-API (`cursor.description`)."""
+
+# Limites de precisão dos tipos inteiros do SQL Server (TINYINT, SMALLINT e INT)
+SMALLINT_PRECISION: int = 5
+INT_PRECISION: int = 10
+MAX_DECIMAL_PRECISION: int = 38
+
+DATETIME_TIMESPECS: tuple[tuple[int, str], ...] = (
+    (0, "seconds"),
+    (3, "milliseconds"),
+    (6, "microseconds"),
+)
+"""Menor `timespec` que comporta a escala (casas decimais dos segundos) das datas e horas."""
+
+SPLIT_PROBE_ROWS: int = 100
+"""Linhas gravadas na primeira parte para estimar os bytes por linha do limite `split_bytes`."""
+
+CSV_COMPRESSION_EXTENSIONS: dict[str, str] = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "zstd": ".zst",
+}
+"""Extensões adicionadas aos arquivos CSV para cada codec de compressão suportado."""
+
+DEFAULT_COMPRESSION_LEVELS: dict[str, int] = {
+    "gzip": 6,
+    "bz2": 9,
+    "zstd": 3,
+}
+"""Níveis de compressão utilizados quando `compression_level` não é informado."""
+
+
+def get_csv_quote_params(export_config: dict[str, Any]) -> dict[str, Any]:
+    """Retorna os parâmetros de aspas utilizados na gravação dos arquivos CSV."""
+    quote_params: dict[str, Any] = {}
+    if export_config["quotechar"]:
+        quote_params["quotechar"] = export_config["quotechar"]
+        quote_params["quoting"] = csv.QUOTE_ALL
+    return quote_params
+
+
+def temp_file_for(output_file: Path) -> Path:
+    """Retorna o arquivo temporário gravado antes da publicação do arquivo.
+
+    O nome (`<arquivo>.<pid>.<thread>.tmp`) é único por processo e thread, de modo que exportações
+    simultâneas do mesmo arquivo não gravam no mesmo temporário.
+    """
+    return output_file.with_name(f"{output_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def open_compressed_binary(path: Path, compression: str, level: int | None = None) -> IO[bytes]:
+    """Abre um arquivo binário para escrita que comprime os dados à medida que são gravados.
+
+    O `zstd` utiliza o módulo `compression.zstd` (Python 3.14+) ou o pacote `zstandard`, quando
+    disponíveis.
+    """
+    level = level if level is not None else DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=level)
+    if compression == "bz2":
+        return bz2.open(path, "wb", compresslevel=level)
+    try:
+        from compression import zstd  # noqa: PLC0415  # type: ignore[import-not-found]
+    except ImportError:
+        try:
+            import zstandard  # noqa: PLC0415
+        except ImportError:
+            msg = "A compressão `zstd` requer Python 3.14+ ou o pacote `zstandard`."
+            raise RuntimeError(msg) from None
+        return zstandard.ZstdCompressor(level=level).stream_writer(path.open("wb"))
+    return zstd.open(path, "wb", level=level)
+
+
+@dataclass(frozen=True)
+class CsvFormatPlan:
+    """Formatação das colunas do CSV, definida uma única vez a partir de `cursor.description`.
+
+    O formato de cada coluna depende apenas do seu tipo, e não dos valores de cada lote, de modo
+    que cada linha é gravada da mesma forma para qualquer `chunksize`, divisão em partes ou shards
+    (no arquivo único das faixas, as linhas ficam intercaladas na ordem em que são lidas).
+    Em relação à exportação legada (`pd.read_sql_query` e `to_csv`), `NULL` (vazio), textos,
+    inteiros sem `NULL`, `float` e decimais (convertidos em `float`, como o `coerce_float` do
+    pandas) são idênticos. O pandas escolhe o formato de duas colunas pelos valores do resultado
+    completo, que não são conhecidos durante a gravação dos lotes, e elas diferem:
+
+    - inteiros com `NULL`: gravados sem a casa decimal (`1`), e não como `float` (`1.0`);
+    - datas e horas: gravadas com as casas da escala da coluna (`DATETIME` com milissegundos e
+      `DATETIME2(7)` com microssegundos), e não com as menores casas que comportam todos os
+      valores (nem apenas com a data, quando todos são meia-noite).
+
+    **Exemplo de uso**:
+
+        plan = CsvFormatPlan.from_description(db_handler.column_description())
+        csv_writer.writerows(plan.format_rows(batch))
+    """
+
+    timespecs: tuple[str | None, ...]
+    """`timespec` de cada coluna de data e hora, ou `None` para gravar os valores com `str`."""
+
+    float_columns: tuple[int, ...] = ()
+    """Posições das colunas `DECIMAL` e `NUMERIC`, gravadas como `float`."""
+
+    @classmethod
+    def from_description(cls, description: list[ColumnDescription]) -> "CsvFormatPlan":
+        """Monta o plano a partir do tipo e da escala de cada coluna."""
+        return cls(
+            timespecs=tuple(
+                _datetime_timespec(column[5] if len(column) > 5 else None)  # noqa: PLR2004
+                if column[1] is dt.datetime
+                else None
+                for column in description
+            ),
+            float_columns=tuple(
+                position
+                for position, column in enumerate(description)
+                if column[1] is decimal.Decimal
+            ),
+        )
+
+    def format_rows(self, rows: list[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+        """Retorna as linhas do lote com as datas, horas e decimais formatados."""
+        positions = [position for position, spec in enumerate(self.timespecs) if spec]
+        if not (positions or self.float_columns) or not rows:
+            return rows
+        columns: list[Any] = list(zip(*rows, strict=True))
+        for position in positions:
+            timespec = cast("str", self.timespecs[position])
+            columns[position] = [
+                value.isoformat(" ", timespec) if isinstance(value, dt.datetime) else value
+                for value in columns[position]
+            ]
+        for position in self.float_columns:
+            columns[position] = [
+                float(value) if isinstance(value, decimal.Decimal) else value
+                for value in columns[position]
+            ]
+        return list(zip(*columns, strict=True))
+
+
+def _datetime_timespec(scale: Any) -> str:
+    """Retorna o `timespec` da escala da coluna, ou `auto` se o driver não a informar."""
+    if not isinstance(scale, int):
+        return "auto"
+    return next(
+        (timespec for digits, timespec in DATETIME_TIMESPECS if scale <= digits), "microseconds"
+    )
+
+
+class ExportWriter(ABC):
+    """Classe base dos escritores incrementais de arquivos de exportação."""
+
+    extension: ClassVar[str] = ""
+    """Extensão dos arquivos gerados pelo escritor."""
+
+    @classmethod
+    def file_extension(cls, export_config: dict[str, Any]) -> str:  # noqa: ARG003
+        """Retorna a extensão dos arquivos gerados com a configuração informada."""
+        return cls.extension
+
+    def __init__(
+        self,
+        output_file: Path,
+        description: list[ColumnDescription],
+        export_config: dict[str, Any],
+    ) -> None:
+        """Inicializa o escritor com o arquivo de saída e a descrição das colunas."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.output_file: Path = output_file
+        """Caminho do arquivo gerado."""
+
+        self.description: list[ColumnDescription] = description
+        """Descrição das colunas do resultado (`cursor.description`)."""
+
+        self.columns: list[str] = [column[0] for column in description]
+        """Nomes das colunas do resultado."""
+
+        self.export_config: dict[str, Any] = export_config
+        """Configuração de exportação do cliente."""
+
+        self.rows_written: int = 0
+        """Quantidade de linhas gravadas até o momento."""
+
+        self.temp_file: Path = temp_file_for(output_file)
+        """Arquivo gravado durante a exportação e renomeado para `output_file` em `commit`."""
+
+        self.stages: QueryStages = NO_STAGES
+        """Registrador da etapa de gravação (`write`), medida ao sair do contexto."""
+
+    def __enter__(self) -> Self:
+        """Abre o arquivo de saída ao entrar no contexto."""
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Fecha o arquivo e o publica, ou o descarta se a gravação foi interrompida por erro."""
+        with self.stages.stage("write") as metrics:
+            self.close()
+            if exc_type is None:
+                self.commit()
+                metrics.rows = self.rows_written
+                metrics.bytes = self.output_bytes()
+            else:
+                self.discard()
+
+    @abstractmethod
+    def open(self) -> None:
+        """Abre o arquivo de saída."""
+
+    @abstractmethod
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Grava um lote de linhas no arquivo de saída."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finaliza e fecha o arquivo de saída."""
+
+    def flush(self) -> None:  # noqa: B027
+        """Descarrega os dados em buffer para o disco, quando suportado pelo formato."""
+
+    def commit(self) -> None:
+        """Publica o arquivo gravado, renomeando o temporário de forma atômica.
+
+        As partes e o manifesto de uma exportação dividida anterior do mesmo arquivo são removidos.
+        """
+        self.temp_file.replace(self.output_file)
+        remove_split_parts(self.output_file)
+
+    def discard(self) -> None:
+        """Remove o arquivo temporário de uma gravação interrompida."""
+        self.temp_file.unlink(missing_ok=True)
+
+    def output_bytes(self) -> int:
+        """Retorna o tamanho do arquivo publicado, em bytes."""
+        return self.output_file.stat().st_size if self.output_file.exists() else 0
+
+    def bytes_written(self) -> int:
+        """Retorna os bytes já gravados no arquivo temporário, sem forçar a descarga dos buffers."""
+        return self.temp_file.stat().st_size if self.temp_file.exists() else 0
+
+
+class CsvExportWriter(ExportWriter):
+    """Grava os lotes em CSV via `DataFrame.to_csv`, no formato da exportação legada.
+
+    Os valores são formatados pelo `CsvFormatPlan` da descrição das colunas, e não pelos tipos que
+    o pandas infere de cada lote, para que o formato de uma coluna não varie entre os lotes (ex.:
+    inteiros gravados como `1.0` apenas nos lotes com `NULL`). Com a opção `compression` (`gzip`,
+    `bz2` ou `zstd`), o texto é comprimido em fluxo durante a gravação, sem que o arquivo completo
+    seja mantido em memória. Com `compact_dtypes`, cada lote é convertido pelo plano de tipos
+    antes da gravação.
+    """
+
+    extension: ClassVar[str] = ".csv"
+
+    def __init__(
+        self,
+        output_file: Path,
+        description: list[ColumnDescription],
+        export_config: dict[str, Any],
+    ) -> None:
+        """Inicializa o escritor, o plano de formatação e o plano de tipos, quando configurado."""
+        super().__init__(output_file, description, export_config)
+        self.format_plan: CsvFormatPlan = CsvFormatPlan.from_description(description)
+        """Formatação das colunas, comum a todos os lotes."""
+
+        dtype_plan = dtype_plan_for(description, export_config)
+        self.dtype_plan: DtypePlan | None = dtype_plan and replace(
+            # As datas e horas já são formatadas pelo `format_plan`
+            dtype_plan,
+            dtypes=tuple(
+                None if spec else dtype
+                for dtype, spec in zip(dtype_plan.dtypes, self.format_plan.timespecs, strict=True)
+            ),
+        )
+        """Plano de tipos aplicado a cada lote (`compact_dtypes`), ou `None`."""
+
+    @classmethod
+    def file_extension(cls, export_config: dict[str, Any]) -> str:
+        """Retorna `.csv` acrescido da extensão do codec de compressão configurado."""
+        compression = export_config.get("compression")
+        if not compression:
+            return cls.extension
+        if compression not in CSV_COMPRESSION_EXTENSIONS:
+            msg = (
+                f"Compressão inválida para CSV: '{compression}'. "
+                f"Opções: {list(CSV_COMPRESSION_EXTENSIONS)}"
+            )
+            raise ValueError(msg)
+        return cls.extension + CSV_COMPRESSION_EXTENSIONS[compression]
+
+    def open(self) -> None:
+        """Abre o arquivo CSV em modo texto com a codificação e a compressão configuradas."""
+        self._file = self._open_text_stream()
+        self._quote_params = get_csv_quote_params(self.export_config)
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Grava o lote no CSV, incluindo o cabeçalho apenas no primeiro lote."""
+        self.write_formatted(self.format_batch(rows), len(rows))
+
+    def format_batch(self, rows: list[tuple[Any, ...]]) -> str:
+        """Retorna o texto CSV do lote, com o cabeçalho se nenhuma linha foi gravada.
+
+        O DataFrame é montado com colunas `object`, sem a inferência de tipos do pandas.
+        """
+        df = pd.DataFrame(self.format_plan.format_rows(rows), columns=self.columns, dtype=object)
+        if self.dtype_plan:
+            df = self.dtype_plan.apply(df)
+        return cast(
+            "str",
+            df.to_csv(
+                index=False,
+                header=self.rows_written == 0,
+                sep=self.export_config["delimiter"],
+                **self._quote_params,
+            ),
+        )
+
+    def write_formatted(self, text: str, row_count: int) -> None:
+        """Grava o texto de `row_count` linhas obtido de `format_batch`."""
+        self._file.write(text)
+        self.rows_written += row_count
+
+    def bytes_written(self) -> int:
+        """Retorna os bytes gravados, incluindo o buffer de texto quando não há compressão.
+
+        Com compressão, os dados retidos pelo compressor ainda não são contados.
+        """
+        if self.export_config.get("compression"):
+            return super().bytes_written()
+        return self._file.tell()
+
+    def _open_text_stream(self) -> IO[str]:
+        """Abre o fluxo de texto do CSV, comprimido ou não, conforme a configuração."""
+        encoding = self.export_config["encoding"]
+        compression = self.export_config.get("compression")
+        if not compression:
+            return self.temp_file.open("w", encoding=encoding, newline="")
+        binary_stream = open_compressed_binary(
+            self.temp_file, compression, self.export_config.get("compression_level")
+        )
+        return io.TextIOWrapper(binary_stream, encoding=encoding, newline="")
+
+    def resume(self, temp_file: Path, rows_written: int, size: int) -> None:
+        """Reabre o arquivo temporário de uma exportação interrompida para continuar a gravação.
+
+        O temporário, registrado no journal pela exportação interrompida, é truncado no tamanho do
+        último lote confirmado e as linhas seguintes são acrescentadas sem cabeçalho. Disponível
+        apenas para CSV sem compressão.
+        """
+        if self.export_config.get("compression"):
+            msg = "A retomada da gravação só é suportada em arquivos CSV sem compressão."
+            raise ValueError(msg)
+        self.temp_file = temp_file
+        with self.temp_file.open("r+b") as file:
+            file.truncate(size)
+        self._file = self.temp_file.open("a", encoding=self.export_config["encoding"], newline="")
+        self._quote_params = get_csv_quote_params(self.export_config)
+        self.rows_written = rows_written
+
+    def flush(self) -> None:
+        """Descarrega o buffer de texto (e do compressor) para o disco."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Fecha o arquivo CSV, finalizando o fluxo de compressão quando houver."""
+        self._file.close()
+
+
+class NativeCsvExportWriter(CsvExportWriter):
+    """Grava os lotes em CSV diretamente com o módulo `csv`, sem convertê-los em DataFrame.
+
+    A formatação é a do `CsvExportWriter`, definida pelo `CsvFormatPlan` da descrição das
+    colunas: `NULL` vazio, decimais como `float`, datas e horas (inclusive com fuso horário) com
+    as casas da escala da coluna e os demais valores com `str`, como o pandas faz com objetos. As
+    diferenças em relação à exportação legada estão descritas no `CsvFormatPlan`.
+    """
+
+    def format_batch(self, rows: list[tuple[Any, ...]]) -> str:
+        """Formata as datas e horas do lote pelo plano e retorna o texto CSV das linhas."""
+        buffer = io.StringIO()
+        csv_writer = csv.writer(
+            buffer,
+            delimiter=self.export_config["delimiter"],
+            lineterminator=os.linesep,
+            **self._quote_params,
+        )
+        if self.rows_written == 0:
+            csv_writer.writerow(self.columns)
+        csv_writer.writerows(self.format_plan.format_rows(rows))
+        return buffer.getvalue()
+
+
+class ArrowExportWriter(ExportWriter):
+    """Classe base dos escritores colunares, que convertem os lotes em tabelas Arrow."""
+
+    def open(self) -> None:
+        """Importa o `pyarrow` e monta o schema a partir da descrição das colunas."""
+        try:
+            import pyarrow as pa  # noqa: PLC0415
+        except ImportError:
+            self.logger.exception(
+                "O formato colunar requer o pacote `pyarrow` (pip install .[arrow])."
+            )
+            raise
+        self._pa = pa
+        self.schema: pa.Schema = pa.schema(
+            [
+                pa.field(column[0], self._arrow_type(column), nullable=bool(column[6]))
+                for column in self.description
+            ]
+        )
+        self.logger.debug(f"Schema Arrow de '{self.output_file.name}': {self.schema}")
+
+    def _arrow_type(self, column: ColumnDescription) -> "pa.DataType":
+        """Converte o tipo Python informado pelo cursor no tipo Arrow correspondente."""
+        pa = self._pa
+        type_code, precision, scale = column[1], column[4], column[5]
+        if type_code is int:
+            if precision and precision <= SMALLINT_PRECISION:
+                return pa.int16()
+            if precision and precision <= INT_PRECISION:
+                return pa.int32()
+            return pa.int64()
+        if type_code is decimal.Decimal and precision and precision <= MAX_DECIMAL_PRECISION:
+            return pa.decimal128(precision, scale or 0)
+        simple_types: dict[type, pa.DataType] = {
+            bool: pa.bool_(),
+            float: pa.float64(),
+            dt.datetime: pa.timestamp("us"),
+            dt.date: pa.date32(),
+            dt.time: pa.time64("us"),
+            bytes: pa.binary(),
+            bytearray: pa.binary(),
+        }
+        return simple_types.get(type_code, pa.string())
+
+    def _to_table(self, rows: list[tuple[Any, ...]]) -> "pa.Table":
+        """Transpõe o lote de linhas em colunas e o converte em uma tabela Arrow."""
+        columns = list(zip(*rows, strict=True))
+        return self._pa.Table.from_arrays(
+            [
+                self._pa.array(values, type=field.type)
+                for values, field in zip(columns, self.schema, strict=True)
+            ],
+            schema=self.schema,
+        )
+
+
+class ParquetExportWriter(ArrowExportWriter):
+    """Grava os lotes em Parquet, um row group por vez, com compressão configurável."""
+
+    extension: ClassVar[str] = ".parquet"
+
+    def open(self) -> None:
+        """Abre o `ParquetWriter` com a compressão e o tamanho de row group configurados."""
+        super().open()
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        self._writer = pq.ParquetWriter(
+            self.temp_file,
+            self.schema,
+            compression=self.export_config.get("compression") or "snappy",
+            compression_level=self.export_config.get("compression_level"),
+        )
+        self._row_group_size: int = int(self.export_config.get("row_group_size") or 0)
+        self._pending: list[pa.Table] = []
+        self._pending_rows: int = 0
+        self._written_rows: int = 0
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Acumula os lotes até completar um row group e então o grava no arquivo."""
+        table = self._to_table(rows)
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        self.rows_written += table.num_rows
+        if self._pending_rows >= self._row_group_size:
+            self._write_row_groups(final=False)
+
+    def _write_row_groups(self, *, final: bool) -> None:
+        """Grava as linhas acumuladas como row groups de `row_group_size` linhas.
+
+        Sem `final`, as linhas que não completam um row group permanecem pendentes e são gravadas
+        com os lotes seguintes, de modo que apenas o último row group do arquivo é incompleto.
+        """
+        if not self._pending:
+            return
+        table = self._pa.concat_tables(self._pending)
+        size = self._row_group_size
+        complete = table.num_rows if final or not size else table.num_rows - table.num_rows % size
+        if complete:
+            self._writer.write_table(table.slice(0, complete), row_group_size=size or None)
+            self._written_rows += complete
+        remainder = table.slice(complete)
+        self._pending = [remainder] if remainder.num_rows else []
+        self._pending_rows = remainder.num_rows
+
+    def bytes_written(self) -> int:
+        """Retorna os bytes gravados, acrescidos da estimativa das linhas pendentes.
+
+        As linhas pendentes são estimadas pela média dos row groups já gravados ou, antes do
+        primeiro, pelo tamanho sem compressão das tabelas Arrow.
+        """
+        written = super().bytes_written()
+        if not self._pending_rows:
+            return written
+        if self._written_rows:
+            return written + int(self._pending_rows * written / self._written_rows)
+        return written + sum(table.nbytes for table in self._pending)
+
+    def close(self) -> None:
+        """Grava o último row group, ainda que incompleto, e finaliza o rodapé do arquivo."""
+        self._write_row_groups(final=True)
+        self._writer.close()
+
+
+class FeatherExportWriter(ArrowExportWriter):
+    """Grava os lotes em Arrow IPC (Feather v2), um record batch por lote."""
+
+    extension: ClassVar[str] = ".feather"
+
+    def open(self) -> None:
+        """Abre o arquivo Arrow IPC com a compressão configurada (`lz4` ou `zstd`)."""
+        super().open()
+        options = self._pa.ipc.IpcWriteOptions(
+            compression=self.export_config.get("compression") or None
+        )
+        self._sink = self._pa.OSFile(str(self.temp_file), "wb")
+        self._writer = self._pa.ipc.new_file(self._sink, self.schema, options=options)
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Grava o lote como um record batch no arquivo."""
+        self._writer.write_table(self._to_table(rows))
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Finaliza o arquivo Arrow IPC."""
+        self._writer.close()
+        self._sink.close()
+
+
+class SplitExportWriter(ExportWriter):
+    """Divide a exportação em partes (`<nome>_part0001.csv`, ...) limitadas por linhas ou bytes.
+
+    Cada parte é gravada pelo escritor do formato configurado, com o seu próprio cabeçalho. Ao
+    final, um manifesto (`<nome>.manifest.json`) lista as partes com as suas linhas e bytes. No
+    CSV sem compressão, o texto de cada lote é formatado antes da gravação e a parte é fechada
+    antes de exceder `split_bytes` (exceto por uma única linha maior que o limite). Nos demais
+    formatos, parte dos dados fica em buffer (no compressor ou em row groups pendentes) e o
+    tamanho da parte é estimado pela média de bytes por linha; o compressor é descarregado
+    apenas para calibrar a média e para confirmar a estimativa antes de fechar a parte, e as
+    linhas pendentes do Parquet são estimadas pelo próprio escritor (`bytes_written`).
+    """
+
+    def __init__(
+        self,
+        output_file: Path,
+        description: list[ColumnDescription],
+        export_config: dict[str, Any],
+    ) -> None:
+        """Inicializa o escritor com os limites `split_rows` e `split_bytes` da configuração."""
+        super().__init__(output_file, description, export_config)
+        self.writer_class: type[ExportWriter] = resolve_export_writer(export_config)
+        """Escritor do formato utilizado em cada parte."""
+
+        self.split_rows: int = int(export_config.get("split_rows") or 0)
+        """Quantidade máxima de linhas por parte (`0` para não limitar)."""
+
+        self.split_bytes: int = int(export_config.get("split_bytes") or 0)
+        """Tamanho máximo aproximado, em bytes, de cada parte (`0` para não limitar)."""
+
+        self.parts: list[dict[str, Any]] = []
+        """Partes concluídas, com o nome do arquivo, linhas e bytes."""
+
+        self.exact_bytes: bool = issubclass(self.writer_class, CsvExportWriter) and not (
+            export_config.get("compression")
+        )
+        """Indica se o tamanho de cada lote é conhecido antes da gravação (CSV sem compressão)."""
+
+        self._current: ExportWriter | None = None
+        self._part_rows: int = 0
+        self._part_bytes: int = 0
+        self._avg_row_bytes: float = 0.0
+
+    def open(self) -> None:
+        """As partes são abertas sob demanda, à medida que os lotes são gravados."""
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Grava o lote, dividindo-o entre as partes conforme os limites configurados."""
+        offset = 0
+        while offset < len(rows):
+            capacity = self._part_capacity(len(rows) - offset)
+            if capacity > 0 and self._current is None:
+                self._open_part()
+            written = self._write_chunk(rows[offset : offset + capacity]) if capacity > 0 else 0
+            if not written:
+                self._close_part()
+                continue
+            offset += written
+            self.rows_written += written
+            self._part_rows += written
+            if self.split_bytes:
+                self._measure_part()
+            if (self.split_rows and self._part_rows >= self.split_rows) or (
+                self.split_bytes and self._part_bytes >= self.split_bytes
+            ):
+                self._close_part()
+
+    def _write_chunk(self, chunk: list[tuple[Any, ...]]) -> int:
+        """Grava na parte atual as linhas iniciais do trecho que cabem nela e retorna quantas.
+
+        No CSV sem compressão, o trecho é reduzido até que o seu texto caiba nos bytes restantes
+        da parte; os demais formatos gravam o trecho inteiro, dimensionado pela estimativa.
+        """
+        current = cast("ExportWriter", self._current)
+        if not (self.exact_bytes and self.split_bytes):
+            current.write_batch(chunk)
+            return len(chunk)
+        csv_writer = cast("CsvExportWriter", current)
+        encoding = self.export_config["encoding"]
+        while chunk:
+            text = csv_writer.format_batch(chunk)
+            size = len(text.encode(encoding))
+            remaining = self.split_bytes - self._part_bytes
+            if size <= remaining or (self._part_rows == 0 and len(chunk) == 1):
+                csv_writer.write_formatted(text, len(chunk))
+                return len(chunk)
+            # Reduz o trecho na proporção dos bytes que ainda cabem na parte
+            fitting = min(len(chunk) - 1, len(chunk) * max(remaining, 0) // size)
+            chunk = chunk[: max(fitting, 1 if self._part_rows == 0 else 0)]
+        return 0
+
+    def _measure_part(self) -> None:
+        """Atualiza os bytes da parte atual e, quando medidos no arquivo, a média por linha.
+
+        Fora do CSV sem compressão, os bytes em buffer não aparecem no arquivo: a parte é medida
+        pela estimativa da média e os buffers são descarregados apenas sem média calibrada ou
+        quando a estimativa atinge o limite.
+        """
+        current = cast("ExportWriter", self._current)
+        if not self.exact_bytes:
+            estimate = max(current.bytes_written(), int(self._part_rows * self._avg_row_bytes))
+            if self._avg_row_bytes and estimate < self.split_bytes:
+                self._part_bytes = estimate
+                return
+            current.flush()
+        self._part_bytes = current.bytes_written()
+        self._avg_row_bytes = self._part_bytes / self._part_rows
+
+    def _part_capacity(self, pending_rows: int) -> int:
+        """Calcula quantas linhas ainda cabem na parte atual."""
+        capacity = pending_rows
+        if self.split_rows:
+            capacity = min(capacity, self.split_rows - self._part_rows)
+        if self.split_bytes:
+            if not self._avg_row_bytes:
+                # Sem estimativa de bytes por linha, grava uma amostra para calibrá-la
+                return min(capacity, SPLIT_PROBE_ROWS)
+            remaining_bytes = self.split_bytes - self._part_bytes
+            capacity = min(capacity, int(remaining_bytes // self._avg_row_bytes))
+            if capacity <= 0 and self._part_rows == 0:
+                # Uma linha maior que o limite ainda precisa ser gravada em alguma parte
+                capacity = 1
+        return capacity
+
+    def _open_part(self) -> None:
+        """Abre o arquivo da próxima parte."""
+        part_file = split_part_file(self.output_file, len(self.parts) + 1)
+        self._current = self.writer_class(part_file, self.description, self.export_config)
+        self._current.open()
+        self._part_rows, self._part_bytes = 0, 0
+
+    def _close_part(self) -> None:
+        """Fecha e publica a parte atual e a registra no manifesto."""
+        if self._current is None:
+            return
+        self._current.close()
+        self._current.commit()
+        part_file = self._current.output_file
+        self.parts.append(
+            {"file": part_file.name, "rows": self._part_rows, "bytes": part_file.stat().st_size}
+        )
+        self.logger.debug(f"Parte '{part_file.name}' concluída ({self._part_rows} linhas).")
+        self._current = None
+        self._part_rows, self._part_bytes = 0, 0
+
+    def close(self) -> None:
+        """Fecha e publica a última parte."""
+        self._close_part()
+
+    def output_bytes(self) -> int:
+        """Retorna a soma dos tamanhos das partes publicadas, em bytes."""
+        return sum(part["bytes"] for part in self.parts)
+
+    def commit(self) -> None:
+        """Grava o manifesto e remove os arquivos de exportações anteriores.
+
+        São removidos o arquivo sem divisão e as partes excedentes ou de outros formatos.
+        """
+        remove_split_parts(self.output_file, keep=len(self.parts))
+        self.output_file.unlink(missing_ok=True)
+        if self.parts:
+            write_split_manifest(self.output_file, self.parts)
+
+    def discard(self) -> None:
+        """Descarta a parte em gravação e as partes já publicadas da exportação interrompida."""
+        if self._current is not None:
+            self._current.discard()
+            self._current = None
+        remove_split_parts(self.output_file)
+
+
+EXPORT_WRITERS: dict[str, type[ExportWriter]] = {
+    "csv": CsvExportWriter,
+    "parquet": ParquetExportWriter,
+    "feather": FeatherExportWriter,
+}
+"""Escritores disponíveis, indexados pelo valor da opção `output_format`."""
+
+
+def get_export_writer(output_format: str) -> type[ExportWriter]:
+    """Retorna a classe de escritor correspondente ao formato de saída informado."""
+    try:
+        return EXPORT_WRITERS[output_format.lower()]
+    except KeyError:
+        msg = f"Formato de saída inválido: '{output_format}'. Opções: {list(EXPORT_WRITERS)}"
+        raise ValueError(msg) from None
+
+
+CSV_ENGINES: dict[str, type[CsvExportWriter]] = {
+    "pandas": CsvExportWriter,
+    "native": NativeCsvExportWriter,
+}
+"""Escritores de CSV disponíveis, indexados pelo valor da opção `csv_engine`."""
+
+
+def resolve_export_writer(export_config: dict[str, Any]) -> type[ExportWriter]:
+    """Retorna o escritor do formato configurado, considerando o `csv_engine` no formato CSV."""
+    writer_class = get_export_writer(export_config["output_format"])
+    if writer_class is not CsvExportWriter:
+        return writer_class
+    csv_engine = export_config.get("csv_engine") or "pandas"
+    try:
+        return CSV_ENGINES[csv_engine]
+    except KeyError:
+        msg = f"Engine de CSV inválida: '{csv_engine}'. Opções: {list(CSV_ENGINES)}"
+        raise ValueError(msg) from None
+
+
+def split_part_file(output_file: Path, part_number: int) -> Path:
+    """Retorna o caminho da parte informada (`<nome>_part0001<sufixos>`) do arquivo."""
+    suffix = "".join(output_file.suffixes)
+    stem = output_file.name.removesuffix(suffix)
+    return output_file.with_name(f"{stem}_part{part_number:04d}{suffix}")
+
+
+def split_manifest_file(output_file: Path) -> Path:
+    """Retorna o caminho do manifesto das partes de um arquivo de exportação dividido."""
+    suffix = "".join(output_file.suffixes)
+    return output_file.with_name(f"{output_file.name.removesuffix(suffix)}.manifest.json")
+
+
+def remove_split_parts(output_file: Path, *, keep: int = 0) -> None:
+    """Remove as partes e o manifesto de uma exportação anterior do arquivo.
+
+    São removidas as partes de qualquer formato (ex.: `.parquet` após uma exportação em CSV). As
+    primeiras `keep` partes no formato do arquivo, já regravadas pela exportação atual, são
+    preservadas junto com o manifesto.
+    """
+    suffix = "".join(output_file.suffixes)
+    stem = output_file.name.removesuffix(suffix)
+    for old_part in output_file.parent.glob(f"{stem}_part[0-9][0-9][0-9][0-9].*"):
+        number_and_suffix = old_part.name.removeprefix(f"{stem}_part")
+        if number_and_suffix[4:] != suffix or int(number_and_suffix[:4]) > keep:
+            old_part.unlink()
+    if not keep:
+        split_manifest_file(output_file).unlink(missing_ok=True)
+
+
+def write_split_manifest(output_file: Path, parts: list[dict[str, Any]]) -> None:
+    """Grava o manifesto com as partes (arquivo, linhas e bytes) do arquivo de exportação."""
+    manifest = {
+        "file": output_file.name,
+        "total_rows": sum(part["rows"] for part in parts),
+        "total_bytes": sum(part["bytes"] for part in parts),
+        "parts": parts,
+    }
+    manifest_file = split_manifest_file(output_file)
+    temp_file = temp_file_for(manifest_file)
+    temp_file.write_text(json.dumps(manifest, indent=4), encoding="utf-8")
+    temp_file.replace(manifest_file)
+
+
+def create_export_writer(
+    output_file: Path, description: list[ColumnDescription], export_config: dict[str, Any]
+) -> ExportWriter:
+    """Cria o escritor do formato configurado, dividindo a saída se houver limites de partes."""
+    if export_config.get("split_rows") or export_config.get("split_bytes"):
+        return SplitExportWriter(output_file, description, export_config)
+    writer_class = resolve_export_writer(export_config)
+    return writer_class(output_file, description, export_config)
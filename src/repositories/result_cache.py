@@ -0,0 +1,189 @@
+"""Módulo de cache em disco dos resultados das consultas exportadas.
+
+Cada entrada é composta por um arquivo `<chave>.pkl`, com a descrição das colunas seguida dos
+lotes de linhas serializados em sequência, e um arquivo `<chave>.json` com os metadados. A data
+de modificação do `.pkl` é atualizada a cada leitura e utilizada como critério de LRU, o que
+permite compartilhar o cache entre os processos da exportação em lote.
+"""
+
+from collections.abc import Iterator
+import hashlib
+import json
+import os
+from pathlib import Path
+import pickle
+import threading
+import time
+import types
+from typing import IO, TYPE_CHECKING, Any, Self
+
+from src.config.constants import CACHE_DIR
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+type CachedResult = tuple[list[tuple[Any, ...]], Iterator[list[tuple[Any, ...]]]]
+"""Descrição das colunas e iterador dos lotes de linhas de um resultado em cache."""
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza o texto da consulta, removendo espaços redundantes e o `;` final."""
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+class CacheEntryWriter:
+    """Grava uma nova entrada do cache à medida que os lotes são exportados.
+
+    A entrada só se torna visível após `commit`. Caso a exportação falhe, o arquivo temporário
+    é descartado ao sair do contexto.
+    """
+
+    def __init__(
+        self,
+        cache: "QueryResultCache",
+        cache_key: str,
+        description: list[tuple[Any, ...]],
+        ttl: int,
+    ) -> None:
+        """Inicializa a entrada e grava a descrição das colunas no arquivo temporário."""
+        self.cache = cache
+        self.cache_key = cache_key
+        self.ttl = ttl
+        self._temp_file = cache.cache_dir / f"{cache_key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._temp_file.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[bytes] = self._temp_file.open("wb")
+        pickle.dump(description, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._committed = False
+
+    def __enter__(self) -> Self:
+        """Retorna a própria entrada ao entrar no contexto."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Descarta a entrada se ela não tiver sido confirmada."""
+        if not self._committed:
+            self.discard()
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Serializa um lote de linhas na entrada."""
+        pickle.dump(rows, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def commit(self) -> None:
+        """Publica a entrada no cache e aplica o limite de tamanho (LRU)."""
+        self._file.close()
+        self._temp_file.replace(self.cache.data_file(self.cache_key))
+        self.cache.meta_file(self.cache_key).write_text(
+            json.dumps({"created_at": time.time(), "ttl": self.ttl}), encoding="utf-8"
+        )
+        self._committed = True
+        self.cache.evict()
+
+    def discard(self) -> None:
+        """Remove o arquivo temporário da entrada."""
+        self._file.close()
+        self._temp_file.unlink(missing_ok=True)
+
+
+class QueryResultCache:
+    """Cache em disco dos resultados das consultas, com TTL por entrada e limite de tamanho."""
+
+    def __init__(
+        self, cache_dir: Path | None = None, default_ttl: int = 3600, max_bytes: int = 0
+    ) -> None:
+        """Inicializa o cache no diretório, TTL padrão (segundos) e tamanho máximo informados."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.cache_dir: Path = Path(cache_dir or CACHE_DIR)
+        """Diretório dos arquivos de cache."""
+
+        self.default_ttl: int = default_ttl
+        """Tempo de vida padrão das entradas, em segundos."""
+
+        self.max_bytes: int = max_bytes
+        """Tamanho máximo do cache em bytes. Use `0` para não limitar."""
+
+    def build_key(
+        self, server_name: str, database: str | None, query: str, fetch_options: str = ""
+    ) -> str:
+        """Gera a chave da entrada a partir do servidor, banco e texto normalizado da consulta.
+
+        `fetch_options` identifica os ajustes da leitura que alteram os valores (ex.: decimais
+        lidos como `float`), para que um resultado não seja reutilizado com outros tipos.
+        """
+        raw_key = f"{server_name}|{database or ''}|{fetch_options}|{normalize_query(query)}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def data_file(self, cache_key: str) -> Path:
+        """Retorna o caminho do arquivo de dados da entrada."""
+        return self.cache_dir / f"{cache_key}.pkl"
+
+    def meta_file(self, cache_key: str) -> Path:
+        """Retorna o caminho do arquivo de metadados da entrada."""
+        return self.cache_dir / f"{cache_key}.json"
+
+    def contains(self, cache_key: str) -> bool:
+        """Indica se existe uma entrada válida (não expirada) para a chave."""
+        meta_file = self.meta_file(cache_key)
+        if not (self.data_file(cache_key).exists() and meta_file.exists()):
+            return False
+        metadata = json.loads(meta_file.read_text(encoding="utf-8"))
+        return time.time() - metadata["created_at"] <= metadata["ttl"]
+
+    def get(self, cache_key: str) -> CachedResult | None:
+        """Retorna a descrição e os lotes da entrada, ou `None` se ausente ou expirada."""
+        if not self.contains(cache_key):
+            self.remove(cache_key)
+            return None
+        data_file = self.data_file(cache_key)
+        # Registra o acesso para a política de LRU
+        os.utime(data_file)
+        file = data_file.open("rb")
+        description = pickle.load(file)  # noqa: S301
+        return description, self._iter_batches(file)
+
+    def _iter_batches(self, file: IO[bytes]) -> Iterator[list[tuple[Any, ...]]]:
+        """Lê sequencialmente os lotes serializados na entrada."""
+        with file:
+            while True:
+                try:
+                    yield pickle.load(file)  # noqa: S301
+                except EOFError:
+                    return
+
+    def create_entry(
+        self, cache_key: str, description: list[tuple[Any, ...]], ttl: int | None = None
+    ) -> CacheEntryWriter:
+        """Cria uma nova entrada a ser preenchida com os lotes do resultado."""
+        return CacheEntryWriter(self, cache_key, description, ttl or self.default_ttl)
+
+    def remove(self, cache_key: str) -> None:
+        """Remove a entrada do cache."""
+        self.data_file(cache_key).unlink(missing_ok=True)
+        self.meta_file(cache_key).unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove as entradas menos recentemente utilizadas até respeitar `max_bytes`."""
+        if self.max_bytes <= 0:
+            return
+        entries: list[tuple[float, int, str]] = []
+        for data_file in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = data_file.stat()
+            except FileNotFoundError:
+                # A entrada pode ter sido removida por outro processo
+                continue
+            entries.append((stat.st_mtime, stat.st_size, data_file.stem))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, cache_key in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= size
+            self.remove(cache_key)
+            self.logger.debug(f"Entrada de cache removida (LRU): {cache_key}")
@@ -0,0 +1,162 @@
+"""Módulo do relatório de desempenho de uma execução, gravado junto aos arquivos exportados.
+
+O relatório JSON (`run_<data>_<hora>_<microssegundos>.report.json`) traz o resultado e as
+métricas das etapas de cada consulta, destacando as que falharam (`failed`) e as que excederam o
+prazo (`timed_out`). Opcionalmente, as mesmas métricas são gravadas no formato texto do
+Prometheus (`<cliente>.prom`), para coleta pelo `textfile collector` do node exporter. Ao
+contrário do relatório JSON, único por execução, o arquivo `.prom` é sobrescrito, já que o
+coletor rejeita as mesmas séries repetidas em vários arquivos.
+"""
+
+from collections.abc import Iterable
+import datetime as dt
+import json
+from pathlib import Path
+from typing import Any
+
+from src.common.instrumentation import RUN_SCOPE, RunInstrumentation
+from src.config.constants import BRT
+from src.repositories.export_writers import temp_file_for
+
+RUN_REPORT_SUFFIX: str = ".report.json"
+"""Sufixo do arquivo do relatório JSON."""
+
+PROMETHEUS_SUFFIX: str = ".prom"
+"""Sufixo do arquivo de métricas no formato texto do Prometheus."""
+
+PROMETHEUS_STAGE_METRICS: tuple[tuple[str, str, str], ...] = (
+    ("calls", "exporter_stage_calls", "Execuções da etapa."),
+    ("wall_time", "exporter_stage_wall_seconds", "Tempo de parede da etapa, em segundos."),
+    ("cpu_time", "exporter_stage_cpu_seconds", "Tempo de CPU da etapa, em segundos."),
+    ("rows", "exporter_stage_rows", "Linhas processadas na etapa."),
+    ("bytes", "exporter_stage_bytes", "Bytes processados na etapa."),
+)
+"""Métricas das etapas: campo do relatório, nome da métrica e descrição."""
+
+PROMETHEUS_QUERY_METRICS: tuple[tuple[str, str, str], ...] = (
+    ("rows", "exporter_query_rows", "Linhas exportadas pela consulta."),
+    ("bytes", "exporter_query_bytes", "Bytes gravados pela consulta."),
+    ("failed", "exporter_query_failed", "1 se a consulta falhou."),
+    ("timed_out", "exporter_query_timed_out", "1 se a consulta excedeu o prazo."),
+)
+"""Métricas das consultas: campo do relatório, nome da métrica e descrição."""
+
+
+def run_report_file(folder: Path, started_at: dt.datetime) -> Path:
+    """Reserva e retorna o caminho do relatório da execução iniciada em `started_at`.
+
+    O nome tem a precisão de microssegundos. Se já houver um relatório com o mesmo nome, como em
+    execuções simultâneas, é acrescido um sufixo (`_2`, `_3`, ...). O arquivo é criado vazio, de
+    forma exclusiva, para que nenhuma outra execução reserve o mesmo nome.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = f"run_{started_at:%Y%m%d_%H%M%S_%f}"
+    name, attempt = stem, 1
+    while True:
+        report_file = folder / f"{name}{RUN_REPORT_SUFFIX}"
+        try:
+            report_file.touch(exist_ok=False)
+        except FileExistsError:
+            attempt += 1
+            name = f"{stem}_{attempt}"
+        else:
+            return report_file
+
+
+def prometheus_report_file(folder: Path, client_name: str) -> Path:
+    """Retorna o caminho das métricas do Prometheus do cliente, sobrescrito a cada execução."""
+    return folder / f"{client_name}{PROMETHEUS_SUFFIX}"
+
+
+def build_run_report(
+    client_name: str,
+    instrumentation: RunInstrumentation,
+    query_results: Iterable[dict[str, Any]],
+    **extra: Any,
+) -> dict[str, Any]:
+    """Monta o relatório com o resultado e as etapas de cada consulta e os totais da execução.
+
+    As etapas das faixas de uma consulta particionada (`<consulta>[n]`) são listadas em
+    `shards`. Os argumentos nomeados adicionais são incluídos na raiz do relatório.
+    """
+    finished_at = dt.datetime.now(BRT)
+    query_names = instrumentation.query_names()
+    queries = []
+    for result in query_results:
+        name = result["query"]
+        shard_prefix = f"{name}["
+        queries.append(
+            {
+                **result,
+                "failed": result.get("error") is not None,
+                "timed_out": bool(result.get("timed_out")),
+                "stages": instrumentation.query_stages(name),
+                "shards": {
+                    shard: instrumentation.query_stages(shard)
+                    for shard in query_names
+                    if shard.startswith(shard_prefix)
+                },
+            }
+        )
+    return {
+        "client_name": client_name,
+        "started_at": instrumentation.started_at.isoformat(),
+        "finished_at": finished_at.isoformat(),
+        "elapsed": round((finished_at - instrumentation.started_at).total_seconds(), 3),
+        "rows": sum(query["rows"] for query in queries),
+        "bytes": sum(query["bytes"] for query in queries),
+        "failed": [query["query"] for query in queries if query["failed"]],
+        "timed_out": [query["query"] for query in queries if query["timed_out"]],
+        "run_stages": instrumentation.query_stages(RUN_SCOPE),
+        "stages": instrumentation.totals(),
+        "queries": queries,
+        **extra,
+    }
+
+
+def write_run_report(report_file: Path, report: dict[str, Any]) -> None:
+    """Grava o relatório JSON de forma atômica."""
+    _write_atomic(report_file, json.dumps(report, indent=4, default=str))
+
+
+def write_prometheus_report(prometheus_file: Path, report: dict[str, Any]) -> None:
+    """Grava as métricas do relatório no formato texto do Prometheus, de forma atômica."""
+    client = report["client_name"]
+    lines: list[str] = []
+    for field, metric, description in PROMETHEUS_STAGE_METRICS:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} gauge"]
+        for query in report["queries"]:
+            for stage, metrics in query["stages"].items():
+                labels = _labels(client=client, query=query["query"], stage=stage)
+                lines.append(f"{metric}{{{labels}}} {metrics[field]}")
+        for stage, metrics in report["run_stages"].items():
+            labels = _labels(client=client, query=RUN_SCOPE, stage=stage)
+            lines.append(f"{metric}{{{labels}}} {metrics[field]}")
+    for field, metric, description in PROMETHEUS_QUERY_METRICS:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} gauge"]
+        for query in report["queries"]:
+            labels = _labels(client=client, query=query["query"])
+            lines.append(f"{metric}{{{labels}}} {int(query[field])}")
+    lines += [
+        "# HELP exporter_run_seconds Tempo total da execução, em segundos.",
+        "# TYPE exporter_run_seconds gauge",
+        f"exporter_run_seconds{{{_labels(client=client)}}} {report['elapsed']}",
+    ]
+    _write_atomic(prometheus_file, "\n".join(lines) + "\n")
+
+
+def _labels(**labels: str) -> str:
+    """Formata os rótulos de uma métrica do Prometheus, escapando os valores."""
+    escaped = {
+        name: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for name, value in labels.items()
+    }
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+def _write_atomic(output_file: Path, content: str) -> None:
+    """Grava o conteúdo em um arquivo temporário e o renomeia para o destino."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = temp_file_for(output_file)
+    temp_file.write_text(content, encoding="utf-8")
+    temp_file.replace(output_file)
@@ -0,0 +1,352 @@
+"""Módulo da inferência do esquema (tipos e tamanhos das colunas) dos arquivos CSV importados.
+
+O arquivo é lido em blocos pelo `pd.read_csv`, com os valores como texto, e cada coluna de cada
+bloco é analisada de forma vetorizada (`pd.to_numeric` e `pd.to_datetime`), em vez de uma
+verificação por célula em Python. Os blocos são acumulados em um perfil por coluna, que define o
+menor tipo do SQL Server que comporta todos os valores: `INT`, `BIGINT`, `DECIMAL(p,s)`, `FLOAT`,
+`DATE`, `DATETIME2(n)`, `DATETIMEOFFSET(n)` ou `NVARCHAR(n)`.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+INT_RANGE: tuple[int, int] = (-(2**31), 2**31 - 1)
+"""Menor e maior valor do `INT`."""
+
+BIGINT_RANGE: tuple[int, int] = (-(2**63), 2**63 - 1)
+"""Menor e maior valor do `BIGINT`."""
+
+POWERS_OF_TEN: np.ndarray = np.array([10**power for power in range(1, 20)], dtype=np.uint64)
+"""Potências de 10 utilizadas para contar os dígitos dos inteiros de até 64 bits."""
+
+MAX_DECIMAL_PRECISION: int = 38
+"""Maior precisão do `DECIMAL`. Acima dela, os números são inferidos como `FLOAT`."""
+
+MAX_NVARCHAR_LENGTH: int = 4000
+"""Maior tamanho do `NVARCHAR(n)`. Acima dele, os textos são inferidos como `NVARCHAR(MAX)`."""
+
+MAX_DATETIME_SCALE: int = 7
+"""Maior quantidade de casas das frações de segundo do `DATETIME2` e do `DATETIMEOFFSET`."""
+
+MIN_DATE_LENGTH: int = len("AAAA-MM-DD")
+"""Menor tamanho de uma data ISO 8601 aceita como `DATE`."""
+
+DEFAULT_INFER_CHUNK_ROWS: int = 100_000
+"""Linhas de cada bloco lido na inferência."""
+
+TIME_OFFSET_PATTERN: str = r"(?:Z|[+-]\d{2}:\d{2})$"
+"""Fuso horário ao final de uma data e hora ISO 8601 aceito pelo `DATETIMEOFFSET` (ex.: `-03:00`).
+
+Outras formas do fuso (ex.: `-0300` e `-03`) são rejeitadas na conversão do SQL Server, e os
+valores com elas não são inferidos como datas.
+"""
+
+ANY_TIME_OFFSET_PATTERN: str = r":\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}(?::?\d{2})?)$"
+"""Fuso horário em qualquer forma (ex.: `-03:00`, `-0300` ou `-03`) ao final de uma hora."""
+
+FRACTION_PATTERN: str = r"\d{2}:\d{2}:\d{2}\.(\d+)"
+"""Frações de segundo de uma data e hora ISO 8601."""
+
+CREATE_TABLE_TEMPLATE: str = "CREATE TABLE {table} (\n{columns}\n)"
+"""Instrução que cria a tabela com as colunas inferidas."""
+
+
+@dataclass
+class ColumnProfile:
+    """Perfil dos valores de uma coluna, acumulado bloco a bloco.
+
+    Cada família de tipos (numérica e data) é descartada no primeiro bloco com um valor que não a
+    comporta, e não é mais verificada nos blocos seguintes. Os números com zeros à esquerda
+    (ex.: códigos e CEPs) são tratados como texto, para que os zeros sejam preservados.
+    """
+
+    name: str
+    """Nome da coluna no cabeçalho do arquivo."""
+
+    rows: int = 0
+    """Linhas analisadas."""
+
+    nulls: int = 0
+    """Campos vazios, gravados como `NULL`."""
+
+    max_length: int = 0
+    """Maior tamanho de um valor, em unidades UTF-16 (as do `n` do `NVARCHAR(n)`)."""
+
+    numeric: bool = True
+    """Indica se todos os valores são números."""
+
+    integer: bool = True
+    """Indica se todos os números são inteiros, sem casas decimais nem expoente."""
+
+    exponent: bool = False
+    """Indica se algum número utiliza notação científica (ex.: `1.5e10`)."""
+
+    min_value: int | None = None
+    """Menor inteiro, enquanto todos os números forem inteiros de até 64 bits."""
+
+    max_value: int | None = None
+    """Maior inteiro, enquanto todos os números forem inteiros de até 64 bits."""
+
+    integer_digits: int = 0
+    """Maior quantidade de dígitos da parte inteira."""
+
+    scale: int = 0
+    """Maior quantidade de casas decimais."""
+
+    temporal: bool = True
+    """Indica se todos os valores são datas ou datas e horas ISO 8601."""
+
+    has_time: bool = False
+    """Indica se algum valor temporal inclui a hora."""
+
+    has_offset: bool = False
+    """Indica se os valores temporais incluem o fuso horário."""
+
+    fraction_digits: int = 0
+    """Maior quantidade de casas das frações de segundo."""
+
+    def update(self, values: pd.Series, *, empty_as_null: bool = True) -> None:
+        """Acumula o perfil dos valores (texto) de um bloco."""
+        seen_values = self.rows > self.nulls
+        self.rows += len(values)
+        if empty_as_null:
+            non_empty = values[values != ""]
+            self.nulls += len(values) - len(non_empty)
+            values = non_empty
+        if values.empty:
+            return
+        lengths = values.str.len()
+        self._update_max_length(values, lengths)
+        if self.numeric:
+            self._update_numeric(values, lengths)
+            # Os valores numéricos dos blocos anteriores não são datas
+            if not self.numeric and seen_values:
+                self.temporal = False
+        if not self.numeric and self.temporal:
+            self._update_temporal(values, lengths, seen_values=seen_values)
+
+    def sql_type(self) -> str:
+        """Retorna o menor tipo do SQL Server que comporta todos os valores analisados."""
+        if self.rows == self.nulls:
+            return "NVARCHAR(1)"
+        if self.numeric:
+            return self._numeric_type()
+        if self.temporal:
+            if self.has_offset:
+                return f"DATETIMEOFFSET({self.fraction_digits})"
+            return f"DATETIME2({self.fraction_digits})" if self.has_time else "DATE"
+        if self.max_length > MAX_NVARCHAR_LENGTH:
+            return "NVARCHAR(MAX)"
+        return f"NVARCHAR({max(self.max_length, 1)})"
+
+    def _update_max_length(self, values: pd.Series, lengths: pd.Series) -> None:
+        """Acumula o maior tamanho dos valores em unidades UTF-16.
+
+        Os caracteres fora do BMP (ex.: emojis) ocupam duas unidades no `NVARCHAR`. Como um valor
+        ocupa no máximo o dobro da sua quantidade de caracteres, apenas os valores que podem
+        superar o maior tamanho já conhecido são codificados.
+        """
+        longest = max(self.max_length, int(lengths.max()))
+        candidates = values[lengths * 2 > longest]
+        if not candidates.empty:
+            units = candidates.str.encode("utf-16-le").str.len() // 2
+            longest = max(longest, int(units.max()))
+        self.max_length = longest
+
+    def _numeric_type(self) -> str:
+        """Retorna o tipo numérico (inteiro, decimal ou ponto flutuante) da coluna."""
+        if self.exponent:
+            return "FLOAT"
+        if self.integer and self.min_value is not None and self.max_value is not None:
+            if INT_RANGE[0] <= self.min_value and self.max_value <= INT_RANGE[1]:
+                return "INT"
+            if BIGINT_RANGE[0] <= self.min_value and self.max_value <= BIGINT_RANGE[1]:
+                return "BIGINT"
+        precision = max(self.integer_digits + self.scale, 1)
+        if precision > MAX_DECIMAL_PRECISION:
+            return "FLOAT"
+        return f"DECIMAL({precision},{self.scale})"
+
+    def _update_numeric(self, values: pd.Series, lengths: pd.Series) -> None:
+        """Verifica se os valores são números e acumula os dígitos, as casas e os limites.
+
+        Os dígitos são calculados a partir dos números convertidos, com operações do NumPy; um
+        valor com mais caracteres que a sua forma canônica (zeros à esquerda, sinal `+` ou
+        espaços) não é tratado como número. Apenas os decimais percorrem os textos, para localizar
+        o ponto e o expoente.
+        """
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.isna().any():
+            self.numeric = False
+            return
+        negative = (numbers < 0).to_numpy()
+        if numbers.dtype.kind in "iu":
+            magnitudes = np.abs(numbers.to_numpy()).astype(np.uint64)
+            digits = np.searchsorted(POWERS_OF_TEN, magnitudes, side="right") + 1
+            if (digits + negative != lengths.to_numpy()).any():
+                self.numeric = False
+                return
+            self.integer_digits = max(self.integer_digits, int(digits.max()))
+            chunk_min, chunk_max = int(numbers.min()), int(numbers.max())
+            if self.min_value is not None and self.max_value is not None:
+                chunk_min, chunk_max = (
+                    min(self.min_value, chunk_min),
+                    max(self.max_value, chunk_max),
+                )
+            self.min_value, self.max_value = chunk_min, chunk_max
+            return
+        if not np.isfinite(numbers.to_numpy()).all():
+            self.numeric = False
+            return
+        self.integer = False
+        if values.str.contains("e", case=False, regex=False).any():
+            self.exponent = True
+            return
+        point = values.str.find(".").to_numpy()
+        text_lengths = lengths.to_numpy()
+        integer_lengths = np.where(point >= 0, point, text_lengths) - negative
+        whole_parts = np.floor(np.abs(numbers.to_numpy()))
+        with np.errstate(divide="ignore"):
+            digits = np.where(whole_parts >= 1, np.floor(np.log10(whole_parts)) + 1, 1)
+        if (integer_lengths > digits).any():
+            self.numeric = False
+            return
+        scales = np.where(point >= 0, text_lengths - point - 1, 0)
+        self.integer_digits = max(self.integer_digits, int(integer_lengths.max()))
+        self.scale = max(self.scale, int(scales.max()))
+
+    def _update_temporal(self, values: pd.Series, lengths: pd.Series, *, seen_values: bool) -> None:
+        """Verifica se os valores são datas ISO 8601 e acumula a hora, o fuso e as frações.
+
+        Valores com e sem fuso horário na mesma coluna, com um fuso em outra forma que `±hh:mm`
+        ou `Z`, ou com mais de `MAX_DATETIME_SCALE` casas nas frações de segundo, que o SQL Server
+        não converte, não são aceitos como datas. O fuso e as frações só são procurados nos blocos
+        com algum valor maior que uma data sem hora.
+        """
+        if int(lengths.min()) < MIN_DATE_LENGTH:
+            self.temporal = False
+            return
+        with_time = int(lengths.max()) > MIN_DATE_LENGTH
+        offsets = values.str.contains(TIME_OFFSET_PATTERN, regex=True) if with_time else None
+        with_offset = offsets is not None and bool(offsets.any())
+        if (
+            (offsets is not None and with_offset and not offsets.all())
+            or (seen_values and with_offset != self.has_offset)
+            or (
+                offsets is not None
+                and (values.str.contains(ANY_TIME_OFFSET_PATTERN, regex=True) != offsets).any()
+            )
+        ):
+            self.temporal = False
+            return
+        try:
+            parsed = pd.to_datetime(values, format="ISO8601", errors="coerce", utc=with_offset)
+        except (ValueError, TypeError):
+            self.temporal = False
+            return
+        if parsed.isna().any():
+            self.temporal = False
+            return
+        self.has_offset = with_offset
+        if not with_time:
+            return
+        self.has_time = True
+        fractions = values.str.extract(FRACTION_PATTERN, expand=False).dropna()
+        if not fractions.empty:
+            digits = int(fractions.str.len().max())
+            if digits > MAX_DATETIME_SCALE:
+                self.temporal = False
+                return
+            self.fraction_digits = max(self.fraction_digits, digits)
+
+
+@dataclass(frozen=True)
+class InferredColumn:
+    """Coluna inferida, com o tipo do SQL Server e a nulidade."""
+
+    name: str
+    """Nome da coluna."""
+
+    sql_type: str
+    """Tipo do SQL Server (ex.: `DECIMAL(12,2)`)."""
+
+    nullable: bool
+    """Indica se a coluna possui campos vazios."""
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Esquema inferido de um arquivo CSV.
+
+    **Exemplo de uso**:
+
+        schema = infer_csv_schema(Path("vendas.csv"), import_config)
+        cursor.execute(schema.create_table_ddl("[dbo].[VENDAS]", backend.quote_identifier))
+    """
+
+    columns: tuple[InferredColumn, ...]
+    """Colunas na ordem do cabeçalho."""
+
+    rows: int
+    """Linhas analisadas (todas, ou a amostra de `infer_rows`)."""
+
+    elapsed: float
+    """Tempo da inferência, em segundos."""
+
+    def create_table_ddl(self, table: str, quote_identifier: Callable[[str], str]) -> str:
+        """Retorna o `CREATE TABLE` da tabela (já delimitada) com as colunas inferidas."""
+        columns = ",\n".join(
+            f"    {quote_identifier(column.name)} {column.sql_type} "
+            f"{'NULL' if column.nullable else 'NOT NULL'}"
+            for column in self.columns
+        )
+        return CREATE_TABLE_TEMPLATE.format(table=table, columns=columns)
+
+
+def infer_csv_schema(
+    csv_file: Path,
+    import_config: dict[str, Any],
+    *,
+    max_rows: int = 0,
+    chunk_rows: int = DEFAULT_INFER_CHUNK_ROWS,
+) -> TableSchema:
+    """Infere o tipo de cada coluna do arquivo CSV, lido em blocos de `chunk_rows` linhas.
+
+    Com `max_rows`, analisa apenas as primeiras linhas do arquivo (amostra); os valores fora da
+    amostra podem não caber no tipo inferido. O formato do arquivo (`encoding`, `delimiter`,
+    `quotechar` e `empty_as_null`) é o das opções de importação.
+    """
+    started_at = time.perf_counter()
+    empty_as_null = bool(import_config["empty_as_null"])
+    read_options: dict[str, Any] = {
+        "sep": import_config["delimiter"],
+        "quotechar": import_config["quotechar"],
+        "encoding": import_config["encoding"],
+        "dtype": str,
+        "keep_default_na": False,
+        "na_filter": False,
+    }
+    profiles = [
+        ColumnProfile(str(name).strip())
+        for name in pd.read_csv(csv_file, nrows=0, **read_options).columns
+    ]
+    with pd.read_csv(
+        csv_file, chunksize=chunk_rows, nrows=max_rows or None, **read_options
+    ) as chunks:
+        for chunk in chunks:
+            for profile, (_, values) in zip(profiles, chunk.items(), strict=True):
+                profile.update(values, empty_as_null=empty_as_null)
+    return TableSchema(
+        columns=tuple(
+            InferredColumn(profile.name, profile.sql_type(), nullable=profile.nulls > 0)
+            for profile in profiles
+        ),
+        rows=profiles[0].rows if profiles else 0,
+        elapsed=time.perf_counter() - started_at,
+    )
@@ -0,0 +1,161 @@
+"""Módulo de divisão (sharding) de uma consulta em faixas da coluna de partição.
+
+Cada faixa é uma cópia da consulta restrita por um predicado na coluna de partição, de modo que
+as faixas possam ser lidas em paralelo por conexões distintas. As faixas cobrem todo o domínio
+da coluna, inclusive os valores `NULL`, que são lidos por uma faixa adicional. A união das faixas
+tem, portanto, as mesmas linhas do resultado da consulta original, mas não a mesma ordem.
+"""
+
+from dataclasses import dataclass
+import datetime as dt
+import decimal
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from src.infrastructure.database.database_connection_manager import (
+        DatabaseConnectionManager,
+    )
+
+SHARD_QUERY_TEMPLATE: str = "SELECT * FROM ({query}) AS _shard WHERE {predicate}"
+"""Consulta que restringe o resultado a uma faixa da coluna de partição."""
+
+MINMAX_QUERY_TEMPLATE: str = "SELECT MIN({column}), MAX({column}) FROM ({query}) AS _bounds"
+"""Consulta que obtém os limites da coluna de partição (estratégia `minmax`)."""
+
+NTILE_QUERY_TEMPLATE: str = (
+    "SELECT MAX({column}) FROM ("
+    "SELECT {column}, NTILE({shards}) OVER (ORDER BY {column}) AS _tile "
+    "FROM ({query}) AS _source WHERE {column} IS NOT NULL"
+    ") AS _tiles GROUP BY _tile ORDER BY 1"
+)
+"""Consulta que obtém o maior valor de cada quantil da coluna de partição (estratégia `ntile`)."""
+
+SHARD_STRATEGIES: tuple[str, ...] = ("minmax", "ntile")
+"""Estratégias disponíveis para o cálculo das faixas."""
+
+
+@dataclass(frozen=True)
+class QueryShard:
+    """Faixa da consulta original, com o seu predicado e parâmetros."""
+
+    index: int
+    """Posição da faixa, a partir de `1`."""
+
+    query: str
+    """Consulta restrita à faixa."""
+
+    params: tuple[Any, ...] = ()
+    """Parâmetros dos limites da faixa."""
+
+
+class ShardPlanner:
+    """Calcula as faixas de uma consulta a partir da coluna de partição.
+
+    - `minmax`: divide o intervalo entre o menor e o maior valor em faixas de mesma amplitude.
+      Requer uma coluna numérica ou de data e é adequada a chaves distribuídas uniformemente.
+    - `ntile`: utiliza os quantis (`NTILE`) da coluna, equilibrando a quantidade de linhas por
+      faixa mesmo em distribuições irregulares, ao custo de ordenar a coluna no servidor.
+    """
+
+    def __init__(self, column: str, shards: int, strategy: str = "minmax") -> None:
+        """Inicializa o planejador com a coluna de partição, o número de faixas e a estratégia."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        if shards < 1:
+            msg = f"Quantidade de shards inválida: {shards}"
+            raise ValueError(msg)
+        if strategy not in SHARD_STRATEGIES:
+            msg = f"Estratégia de sharding inválida: '{strategy}'. Opções: {SHARD_STRATEGIES}"
+            raise ValueError(msg)
+
+        self.column: str = column
+        """Nome da coluna de partição."""
+
+        self.shards: int = shards
+        """Quantidade de faixas com valores não nulos."""
+
+        self.strategy: str = strategy
+        """Estratégia de cálculo dos limites das faixas."""
+
+    def plan(self, db_handler: "DatabaseConnectionManager", query: str) -> list[QueryShard]:
+        """Calcula os limites na conexão informada e retorna as faixas da consulta.
+
+        As faixas são `coluna <= b1`, `b1 < coluna <= b2`, ..., `coluna > bn`, seguidas da faixa
+        `coluna IS NULL`.
+        """
+        query = query.rstrip("; ")
+        boundaries = self.boundaries(db_handler, query)
+        column = db_handler.quote_identifier(self.column)
+        ranges: list[tuple[str, tuple[Any, ...]]] = []
+        if not boundaries:
+            ranges.append((f"{column} IS NOT NULL", ()))
+        else:
+            ranges.append((f"{column} <= ?", (boundaries[0],)))
+            ranges.extend(
+                (f"{column} > ? AND {column} <= ?", (lower, upper))
+                for lower, upper in pairwise(boundaries)
+            )
+            ranges.append((f"{column} > ?", (boundaries[-1],)))
+        ranges.append((f"{column} IS NULL", ()))
+        return [
+            QueryShard(
+                index=index,
+                query=SHARD_QUERY_TEMPLATE.format(query=query, predicate=predicate),
+                params=params,
+            )
+            for index, (predicate, params) in enumerate(ranges, start=1)
+        ]
+
+    def boundaries(self, db_handler: "DatabaseConnectionManager", query: str) -> list[Any]:
+        """Retorna os limites superiores, ordenados e distintos, entre as faixas."""
+        if self.shards == 1:
+            return []
+        if self.strategy == "minmax":
+            low, high = self._fetch_first_row(
+                db_handler,
+                MINMAX_QUERY_TEMPLATE.format(
+                    column=db_handler.quote_identifier(self.column), query=query
+                ),
+            )
+            if low is None:
+                return []
+            try:
+                values = [self._interpolate(low, high, step) for step in range(1, self.shards)]
+            except TypeError:
+                self.logger.warning(
+                    f"A coluna '{self.column}' ({type(low).__name__}) não permite a estratégia "
+                    "`minmax`. Utilizando `ntile`."
+                )
+            else:
+                return sorted(set(values))
+        batches = db_handler.fetch_batches(
+            NTILE_QUERY_TEMPLATE.format(
+                column=db_handler.quote_identifier(self.column), shards=self.shards, query=query
+            ),
+            self.shards,
+        )
+        upper_bounds = [row[0] for batch in batches for row in batch]
+        # O último quantil não precisa de limite superior
+        return sorted(set(upper_bounds[:-1]))
+
+    @staticmethod
+    def _fetch_first_row(db_handler: "DatabaseConnectionManager", query: str) -> tuple[Any, ...]:
+        """Executa a consulta e retorna a sua primeira linha."""
+        batch = next(db_handler.fetch_batches(query, 1), [])
+        return batch[0] if batch else (None, None)
+
+    def _interpolate(self, low: Any, high: Any, step: int) -> Any:
+        """Retorna o limite da faixa `step` entre `low` e `high`, em partes de mesma amplitude."""
+        if isinstance(low, bool):
+            raise TypeError
+        if isinstance(low, int):
+            return low + (high - low) * step // self.shards
+        if isinstance(low, float | decimal.Decimal | dt.date):
+            return low + (high - low) * step / self.shards
+        raise TypeError
@@ -7,6 +7,9 @@ from src.config.constypes import PathLike
 
 logger = logging.getLogger(__name__)
 
+ANNOTATION_MARKER: str = "@"
+"""Marcador que, após o classificador, identifica uma anotação da consulta (`-- @chave: valor`)."""
+
 
 # TODO: Remanejar classe.
 class SqlHandler:
@@ -17,27 +20,58 @@ class SqlHandler:
 
     def sql_to_dict(self, sql_file: PathLike, classifier: str = "--") -> dict[str, str]:
         """Lê um arquivo SQL e o converte em um dicionário."""
+        query_list, _ = self._parse_sql_file(sql_file, classifier)
+        return query_list
+
+    def sql_annotations(
+        self, sql_file: PathLike, classifier: str = "--"
+    ) -> dict[str, dict[str, str]]:
+        """Retorna as anotações (`-- @chave: valor`) de cada consulta de um arquivo SQL.
+
+        As anotações devem estar entre o nome da consulta e o seu corpo, por exemplo:
+
+            -- vendas
+            -- @watermark: updated_at
+            SELECT * FROM VENDAS
+        """
+        _, annotations = self._parse_sql_file(sql_file, classifier)
+        return annotations
+
+    def _parse_sql_file(
+        self, sql_file: PathLike, classifier: str
+    ) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+        """Lê um arquivo SQL e retorna as consultas e as anotações de cada uma."""
         sql_file = Path(sql_file)
         if not sql_file.is_file():
             logger.exception(f"Arquivo SQL não encontrado: {sql_file}")
             raise FileNotFoundError
 
-        query_list = {}
+        query_list: dict[str, str] = {}
+        annotations: dict[str, dict[str, str]] = {}
         file_name, query = None, ""
+        annotation_prefix = f"{classifier}{ANNOTATION_MARKER}" if classifier else None
 
         try:
             # Lê o arquivo SQL linha por linha
             with sql_file.open("r", encoding="utf-8") as file:
                 for line in file:
                     stripped_line = line.strip()
+                    compact_line = stripped_line.replace(" ", "")
 
+                    # Verifica se a linha é uma anotação da consulta atual
+                    if annotation_prefix and compact_line.startswith(annotation_prefix):
+                        if file_name:
+                            annotation = stripped_line.lstrip(classifier).strip()[1:]
+                            name, _, value = annotation.partition(":")
+                            annotations[file_name][name.strip()] = value.strip()
                     # Verifica se a linha começa com o classificador
-                    if classifier and stripped_line.startswith(classifier):
+                    elif classifier and stripped_line.startswith(classifier):
                         # Salva a consulta anterior no dicionário
                         if file_name:
                             query_list[file_name] = query.rstrip()
                         # Inicia uma nova consulta
                         file_name, query = stripped_line.lstrip(classifier).strip(), ""
+                        annotations[file_name] = {}
                     else:
                         # Concatena a linha na consulta atual
                         query += stripped_line + " "
@@ -54,4 +88,4 @@ class SqlHandler:
             logger.error(f"O arquivo SQL '{sql_file}' não contém consultas válidas.")
             raise ValueError
 
-        return query_list
+        return query_list, annotations
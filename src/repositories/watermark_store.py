@@ -0,0 +1,131 @@
+"""Módulo de persistência das marcas d'água (watermarks) das exportações incrementais."""
+
+import datetime as dt
+import decimal
+import json
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Any
+
+from src.config.constants import BRT, STATE_DIR
+from src.infrastructure.logger import LoggerSingleton
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+VALUE_PARSERS: dict[str, Any] = {
+    "int": int,
+    "float": float,
+    "decimal": decimal.Decimal,
+    "datetime": dt.datetime.fromisoformat,
+    "date": dt.date.fromisoformat,
+    "str": str,
+}
+"""Funções de conversão do valor serializado, indexadas pelo tipo registrado."""
+
+
+def serialize_value(value: Any) -> tuple[str, str]:
+    """Serializa o valor em texto e retorna também o nome do tipo utilizado para reconstruí-lo."""
+    text = value.isoformat() if isinstance(value, dt.date) else str(value)
+    # A ordem importa: `bool` é subclasse de `int` e `datetime` é subclasse de `date`
+    type_names: list[tuple[type, str]] = [
+        (bool, "str"),
+        (dt.datetime, "datetime"),
+        (dt.date, "date"),
+        (decimal.Decimal, "decimal"),
+        (int, "int"),
+        (float, "float"),
+    ]
+    for value_type, type_name in type_names:
+        if isinstance(value, value_type):
+            return text, type_name
+    return text, "str"
+
+
+def deserialize_value(text: str, type_name: str) -> Any:
+    """Reconstrói o valor serializado por `serialize_value`."""
+    return VALUE_PARSERS.get(type_name, str)(text)
+
+
+class WatermarkStore:
+    """Armazena, por cliente e consulta, o último valor exportado da coluna de watermark.
+
+    O estado de cada cliente é mantido em um arquivo JSON (`STATE_DIR/<cliente>.json`). As
+    gravações são protegidas por lock, permitindo o uso pelos workers paralelos do exportador.
+    """
+
+    def __init__(self, state_dir: Path | None = None) -> None:
+        """Inicializa o armazenamento no diretório de estado informado."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.state_dir: Path = Path(state_dir or STATE_DIR)
+        """Diretório onde os arquivos de estado são gravados."""
+
+        self._lock = threading.Lock()
+
+    def _state_file(self, client_name: str) -> Path:
+        """Retorna o caminho do arquivo de estado do cliente."""
+        return self.state_dir / f"{client_name}.json"
+
+    def _read_state(self, client_name: str) -> dict[str, Any]:
+        """Lê o estado do cliente, retornando um dicionário vazio se ainda não existir."""
+        state_file = self._state_file(client_name)
+        if not state_file.exists():
+            return {}
+        try:
+            return json.loads(state_file.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            self.logger.exception(f"Arquivo de estado inválido: '{state_file}'")
+            raise
+
+    def get(self, client_name: str, query_name: str) -> dict[str, Any] | None:
+        """Retorna a coluna e o último valor exportado da consulta, ou `None` se não houver."""
+        with self._lock:
+            entry = self._read_state(client_name).get(query_name)
+        if not entry:
+            return None
+        return {**entry, "value": deserialize_value(entry["value"], entry["type"])}
+
+    def save(self, client_name: str, query_name: str, column: str, value: Any) -> None:
+        """Registra o último valor exportado da coluna de watermark da consulta."""
+        with self._lock:
+            state = self._read_state(client_name)
+            text, type_name = serialize_value(value)
+            state[query_name] = {
+                "column": column,
+                "value": text,
+                "type": type_name,
+                "updated_at": dt.datetime.now(BRT).isoformat(),
+            }
+            state_file = self._state_file(client_name)
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = state_file.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(state, indent=4), encoding="utf-8")
+            temp_file.replace(state_file)
+        self.logger.debug(f"Watermark de '{client_name}.{query_name}' atualizada: {value}")
+
+
+class WatermarkTracker:
+    """Acompanha o maior valor da coluna de watermark nos lotes exportados."""
+
+    def __init__(self, column: str) -> None:
+        """Inicializa o acompanhamento da coluna informada."""
+        self.column: str = column
+        """Nome da coluna de watermark."""
+
+        self.value: Any = None
+        """Maior valor encontrado até o momento."""
+
+    def update(self, batch: list[tuple[Any, ...]], columns: list[str]) -> None:
+        """Atualiza o maior valor com base em um lote de linhas."""
+        try:
+            index = [column.lower() for column in columns].index(self.column.lower())
+        except ValueError:
+            msg = f"A coluna de watermark '{self.column}' não existe no resultado: {columns}"
+            raise KeyError(msg) from None
+        values = [row[index] for row in batch if row[index] is not None]
+        if values:
+            batch_max = max(values)
+            self.value = batch_max if self.value is None else max(self.value, batch_max)
@@ -0,0 +1,134 @@
+"""Módulo da exportação assíncrona, para serviços de orquestração baseados em `asyncio`.
+
+Cada exportação é executada pelo `ExporterService` em um executor de threads limitado, sem
+bloquear o loop de eventos: a leitura do banco e a gravação dos arquivos ocorrem nas threads do
+executor. O cancelamento da tarefa (ex.: pelo fim de um `asyncio.timeout`) cancela a exportação
+no banco por meio de um `CancellationToken` e aguarda a liberação das conexões e dos arquivos
+temporários antes de propagar o cancelamento.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import time
+import types
+from typing import TYPE_CHECKING, Any, Self
+
+from src.common.cancellation import CancellationToken
+from src.infrastructure.database.async_connection_manager import DEFAULT_ASYNC_THREADS
+from src.infrastructure.logger import LoggerSingleton
+from src.services.exporter import ExporterService
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+class AsyncExporterService:
+    """Exporta clientes de forma assíncrona, com concorrência limitada, cancelamento e timeout.
+
+    **Exemplo de uso**:
+
+        async with AsyncExporterService(max_threads=16) as exporter:
+            async with asyncio.timeout(600):
+                summary = await exporter.export_client("cliente_a")
+            summaries = await exporter.export_clients(["cliente_b", "cliente_c"], timeout=600)
+    """
+
+    def __init__(
+        self, max_threads: int = DEFAULT_ASYNC_THREADS, exporter: ExporterService | None = None
+    ) -> None:
+        """Inicializa o serviço com a quantidade máxima de exportações simultâneas."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.exporter: ExporterService = exporter or ExporterService()
+        """Serviço síncrono que executa as exportações nas threads do executor."""
+
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="async-export"
+        )
+        """Executor limitado das exportações; as excedentes aguardam na fila do executor."""
+
+    async def __aenter__(self) -> Self:
+        """Retorna o serviço ao entrar no contexto."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Encerra o executor ao sair do contexto."""
+        self.close()
+
+    def close(self) -> None:
+        """Encerra o executor, descartando as exportações que ainda não começaram."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def export_client(
+        self, client_name: str, options: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Exporta as consultas de um cliente e retorna o resumo de `ExporterService.export_client`.
+
+        O cancelamento da tarefa, inclusive pelo fim de um `asyncio.timeout`, interrompe as
+        consultas em execução no banco. O prazo inclui a espera por uma thread livre do executor.
+        """
+        cancel_token = CancellationToken()
+        future = self.executor.submit(
+            self.exporter.export_client, client_name, options, cancel_token=cancel_token
+        )
+        export_future = asyncio.wrap_future(future)
+        try:
+            # O `shield` mantém a exportação em andamento até que o token a interrompa
+            return await asyncio.shield(export_future)
+        except asyncio.CancelledError:
+            self.logger.warning(f"Cancelando a exportação do cliente '{client_name}'.")
+            cancel_token.cancel("tarefa cancelada")
+            if not future.cancel():
+                # Aguarda o mesmo future protegido, cuja exceção seria registrada como não lida
+                with suppress(Exception):
+                    await export_future
+            raise
+
+    async def export_clients(
+        self,
+        clients: list[str],
+        options: dict[str, Any] | None = None,
+        *,
+        timeout: float | None = None,  # noqa: ASYNC109
+    ) -> list[dict[str, Any]]:
+        """Exporta os clientes simultaneamente e retorna o resumo de cada um na ordem informada.
+
+        O `timeout`, em segundos, vale para cada cliente. A falha ou o fim do prazo de um
+        cliente é registrado no seu resumo (`error`) e não interrompe os demais.
+        """
+        return list(
+            await asyncio.gather(
+                *(self._export_client_summary(client, options, timeout) for client in clients)
+            )
+        )
+
+    async def _export_client_summary(
+        self,
+        client_name: str,
+        options: dict[str, Any] | None,
+        timeout: float | None,  # noqa: ASYNC109
+    ) -> dict[str, Any]:
+        """Exporta o cliente no prazo, devolvendo o erro no resumo em vez de lançá-lo."""
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                return await self.export_client(client_name, options)
+        except Exception as e:
+            self.logger.exception(f"Cliente '{client_name}' concluído com falhas.")
+            return {
+                "client_name": client_name,
+                "queries": 0,
+                "failed": [],
+                "timed_out": [],
+                "rows": 0,
+                "bytes": 0,
+                "elapsed": round(time.perf_counter() - started_at, 3),
+                "error": repr(e),
+            }
@@ -0,0 +1,242 @@
+"""Módulo de exportação em lote, sem interação, de vários clientes em processos paralelos.
+
+Pode ser executado diretamente por agendadores, sem terminal interativo:
+
+    python -m src.services.batch_exporter --clients all --processes 4
+    python -m src.services.batch_exporter --clients cliente_a cliente_b --chunksize 100000
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+from pathlib import Path
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.config.constants import SETTINGS_FILE
+from src.infrastructure.database.fetch_tuning import DECIMAL_MODES
+from src.infrastructure.logger import LoggerSingleton
+from src.repositories.export_writers import CSV_ENGINES, EXPORT_WRITERS
+from src.repositories.file_handler import YamlHandler
+from src.services.exporter import ExporterService
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+ALL_CLIENTS: str = "all"
+"""Valor especial de `--clients` que seleciona todos os clientes de `data_sources`."""
+
+
+def export_client_worker(client_name: str, options: dict[str, Any]) -> dict[str, Any]:
+    """Exporta um cliente em um processo worker e retorna o seu resumo.
+
+    Erros são capturados e devolvidos no resumo, para que a falha de um cliente não interrompa
+    os demais nem dependa da serialização da exceção entre processos.
+    """
+    started_at = time.perf_counter()
+    try:
+        return ExporterService().export_client(client_name, options)
+    except Exception as e:  # noqa: BLE001
+        return {
+            "client_name": client_name,
+            "queries": 0,
+            "failed": [],
+            "timed_out": [],
+            "rows": 0,
+            "bytes": 0,
+            "elapsed": round(time.perf_counter() - started_at, 3),
+            "error": repr(e),
+        }
+
+
+class BatchExporterService(BaseClass):
+    """Exporta vários clientes em paralelo, um processo por cliente, sem interação."""
+
+    def __init__(self, max_processes: int | None = None) -> None:
+        """Inicializa o serviço com o número máximo de processos simultâneos."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.global_config: dict[str, Any] = YamlHandler().read_file(SETTINGS_FILE)
+        self.data_sources_config: dict[str, Any] = self.global_config["data_sources"][
+            self.global_config["execution_mode"]
+        ]
+        self.max_processes: int = max_processes or os.cpu_count() or 1
+        """Quantidade máxima de clientes exportados simultaneamente."""
+
+    def resolve_clients(self, clients: list[str]) -> list[str]:
+        """Valida a lista de clientes, expandindo `all` para todos os clientes configurados."""
+        if not clients or ALL_CLIENTS in clients:
+            return list(self.data_sources_config)
+        unknown_clients = [client for client in clients if client not in self.data_sources_config]
+        if unknown_clients:
+            self.logger.error(f"Clientes não encontrados em `data_sources`: {unknown_clients}")
+            raise KeyError(", ".join(unknown_clients))
+        return clients
+
+    def run(
+        self, clients: list[str], options: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Exporta os clientes em paralelo e retorna o resumo de cada um na ordem solicitada."""
+        selected_clients = self.resolve_clients(clients)
+        processes = min(self.max_processes, len(selected_clients))
+        self.logger.info(
+            f"Exportando {len(selected_clients)} clientes em {processes} processos paralelos."
+        )
+        summaries: dict[str, dict[str, Any]] = {}
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = {
+                executor.submit(export_client_worker, client, options or {}): client
+                for client in selected_clients
+            }
+            for future in as_completed(futures):
+                summary = future.result()
+                summaries[futures[future]] = summary
+                if summary.get("error") or summary["failed"]:
+                    self.logger.error(f"Cliente '{summary['client_name']}' concluído com falhas.")
+                else:
+                    self.logger.info(f"Cliente '{summary['client_name']}' exportado.")
+        return [summaries[client] for client in selected_clients]
+
+    def print_summary(self, summaries: list[dict[str, Any]]) -> None:
+        """Imprime o resumo de linhas, bytes e tempo decorrido por cliente."""
+        super()._separator_line()
+        print(f"{'Cliente':<30} {'Status':<8} {'Linhas':>14} {'Bytes':>16} {'Tempo (s)':>10}")
+        for summary in summaries:
+            status = "ERRO" if summary.get("error") or summary["failed"] else "OK"
+            if summary.get("timed_out"):
+                status = "PRAZO"
+            print(
+                f"{summary['client_name']:<30} {status:<8} {summary['rows']:>14} "
+                f"{summary['bytes']:>16} {summary['elapsed']:>10}"
+            )
+        super()._separator_line()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Interpreta os argumentos de linha de comando da exportação em lote."""
+    parser = argparse.ArgumentParser(description="Exporta clientes em lote, sem interação.")
+    parser.add_argument(
+        "--clients", nargs="+", default=[ALL_CLIENTS], help="Clientes a exportar ou 'all'."
+    )
+    parser.add_argument("--processes", type=int, help="Quantidade de processos paralelos.")
+    parser.add_argument("--chunksize", type=int, help="Linhas lidas do cursor por lote.")
+    parser.add_argument("--max-workers", type=int, help="Consultas paralelas por cliente.")
+    parser.add_argument(
+        "--pipeline-depth", type=int, help="Lotes em espera entre leitura e gravação (0 desliga)."
+    )
+    parser.add_argument("--encoding", help="Codificação dos arquivos gerados.")
+    parser.add_argument("--delimiter", help="Delimitador dos arquivos gerados.")
+    parser.add_argument("--quotechar", help="Caractere de aspas dos arquivos gerados.")
+    parser.add_argument(
+        "--output-format", choices=list(EXPORT_WRITERS), help="Formato dos arquivos gerados."
+    )
+    parser.add_argument(
+        "--csv-engine", choices=list(CSV_ENGINES), help="Engine de gravação dos arquivos CSV."
+    )
+    parser.add_argument("--compression", help="Codec de compressão dos arquivos gerados.")
+    parser.add_argument(
+        "--add-date", action="store_true", help="Adiciona a data no nome dos arquivos."
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Ignora as watermarks e exporta tudo novamente."
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Reutiliza resultados em cache das consultas."
+    )
+    parser.add_argument(
+        "--refresh-cache", action="store_true", help="Ignora o cache e relê o banco de dados."
+    )
+    parser.add_argument("--split-rows", type=int, help="Linhas máximas por parte do arquivo.")
+    parser.add_argument("--split-bytes", type=int, help="Bytes máximos por parte do arquivo.")
+    parser.add_argument("--shards", type=int, help="Faixas paralelas das consultas particionadas.")
+    parser.add_argument(
+        "--shard-output", choices=["merge", "parts"], help="Grava as faixas juntas ou em partes."
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Retoma a exportação interrompida do dia."
+    )
+    parser.add_argument(
+        "--compact-dtypes", action="store_true", help="Utiliza tipos compactos nos DataFrames."
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true", help="Registra a memória dos DataFrames."
+    )
+    parser.add_argument(
+        "--memory-budget-mb", type=float, help="Orçamento de memória de cada processo, em MB."
+    )
+    parser.add_argument(
+        "--run-report", action="store_true", help="Grava o relatório de desempenho em JSON."
+    )
+    parser.add_argument(
+        "--prometheus", action="store_true", help="Grava as métricas no formato do Prometheus."
+    )
+    parser.add_argument("--arraysize", type=int, help="Valor de `cursor.arraysize` (0 desliga).")
+    parser.add_argument(
+        "--packet-size", type=int, help="Tamanho do pacote de rede ODBC, em bytes (0 desliga)."
+    )
+    parser.add_argument(
+        "--decimal-as", choices=list(DECIMAL_MODES), help="Tipo Python das colunas decimais."
+    )
+    parser.add_argument(
+        "--query-timeout", type=float, help="Prazo de cada consulta, em segundos (0 desliga)."
+    )
+    parser.add_argument(
+        "--run-timeout", type=float, help="Prazo da execução de cada cliente, em segundos."
+    )
+    parser.add_argument("--summary-file", type=Path, help="Grava o resumo em um arquivo JSON.")
+    return parser.parse_args(argv)
+
+
+def _build_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Converte os argumentos informados em opções de exportação."""
+    options: dict[str, Any] = {
+        "chunksize": args.chunksize,
+        "max_workers": args.max_workers,
+        "pipeline_depth": args.pipeline_depth,
+        "encoding": args.encoding,
+        "delimiter": args.delimiter,
+        "quotechar": args.quotechar,
+        "output_format": args.output_format,
+        "csv_engine": args.csv_engine,
+        "compression": args.compression,
+        "add_date_to_filename": args.add_date,
+        "incremental": False if args.full else None,
+        "cache": args.cache or args.refresh_cache or None,
+        "refresh_cache": args.refresh_cache or None,
+        "split_rows": args.split_rows,
+        "split_bytes": args.split_bytes,
+        "shards": args.shards,
+        "shard_output": args.shard_output,
+        "resume": args.resume or None,
+        "compact_dtypes": args.compact_dtypes or None,
+        "memory_report": args.memory_report or None,
+        "memory_budget_mb": args.memory_budget_mb,
+        "run_report": args.run_report or None,
+        "prometheus_report": args.prometheus or None,
+        "arraysize": args.arraysize,
+        "packet_size": args.packet_size,
+        "decimal_as": args.decimal_as,
+        "query_timeout": args.query_timeout,
+        "run_timeout": args.run_timeout,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Executa a exportação em lote e retorna `1` caso algum cliente tenha falhado."""
+    args = _parse_args(argv)
+    batch_exporter = BatchExporterService(max_processes=args.processes)
+    summaries = batch_exporter.run(args.clients, _build_options(args))
+    batch_exporter.print_summary(summaries)
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        args.summary_file.write_text(json.dumps(summaries, indent=4), encoding="utf-8")
+    return int(any(summary.get("error") or summary["failed"] for summary in summaries))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
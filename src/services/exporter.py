@@ -1,32 +1,102 @@
 """Módulo exporter."""
 
-import csv
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
+from itertools import chain
 import json
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 import pandas as pd
 
 from src.common.base.base_class import BaseClass
+from src.common.batch_pipeline import BatchPipeline
+from src.common.cancellation import (
+    CancellationToken,
+    QueryTimeoutError,
+    cancel_on_interrupt,
+    deadline,
+)
+from src.common.instrumentation import NO_STAGES, RUN_SCOPE, QueryStages, RunInstrumentation
+from src.common.memory_governor import MemoryGovernor
 from src.config.constants import (
     BRT,
+    DEFAULT_EXPORT_OPTIONS,
     EXPORT_DIR,
     SETTINGS_FILE,
     SQL_DIR,
+    STREAM_CHUNKSIZE,
 )
 from src.enum.operation_types import OperationType, SpecialChars
+from src.infrastructure.database.backends import (
+    EMBEDDED_BACKENDS,
+    OdbcBackend,
+    create_embedded_backend,
+)
+from src.infrastructure.database.connection_pool import get_connection_pool
 from src.infrastructure.database.database_connection_manager import (
+    BatchSize,
     ConnectionString,
     DatabaseConnectionManager,
 )
+from src.infrastructure.database.fetch_tuning import FetchTuning
 from src.infrastructure.logger import LoggerSingleton
+from src.repositories.checkpoint_journal import CheckpointJournal
+from src.repositories.dtype_planner import DtypePlan, dtype_plan_for, memory_footprint
+from src.repositories.export_writers import (
+    CsvExportWriter,
+    ExportWriter,
+    create_export_writer,
+    get_csv_quote_params,
+    get_export_writer,
+    remove_split_parts,
+    resolve_export_writer,
+    split_manifest_file,
+    split_part_file,
+    temp_file_for,
+    write_split_manifest,
+)
 from src.repositories.file_handler import YamlHandler
+from src.repositories.result_cache import CachedResult, CacheEntryWriter, QueryResultCache
+from src.repositories.run_report import (
+    build_run_report,
+    prometheus_report_file,
+    run_report_file,
+    write_prometheus_report,
+    write_run_report,
+)
+from src.repositories.shard_planner import QueryShard, ShardPlanner
 from src.repositories.sql_handler import SqlHandler
+from src.repositories.watermark_store import WatermarkStore, WatermarkTracker
 
 if TYPE_CHECKING:
     from logging import Logger
 
+INCREMENTAL_QUERY_TEMPLATE: str = "SELECT * FROM ({query}) AS _incremental WHERE {column} > ?"
+"""Consulta que restringe o resultado às linhas com watermark maior que a última exportada.
+
+A coluna é informada já delimitada pelo banco (`DatabaseConnectionManager.quote_identifier`).
+"""
+
+ORDERED_QUERY_TEMPLATE: str = "SELECT * FROM ({query}) AS _ordered ORDER BY {column}"
+"""Consulta ordenada pela chave das exportações retomáveis (`-- @order_by: col`)."""
+
+RESUME_QUERY_TEMPLATE: str = (
+    "SELECT * FROM ({query}) AS _ordered WHERE {column} > ? ORDER BY {column}"
+)
+"""Consulta que retoma uma exportação interrompida a partir da última chave confirmada."""
+
+WRAPPING_ANNOTATIONS: tuple[str, ...] = ("watermark", "partition", "order_by")
+"""Anotações cujos fluxos utilizam a consulta do `.sql` como subconsulta."""
+
+COMPACT_READ_BATCH_ROWS: int = 50_000
+"""Linhas por lote na leitura legada com `compact_dtypes`, convertidas antes de serem acumuladas."""
+
 
 class ExporterService(BaseClass):
     """Gerencia operações de exportação de dados."""
@@ -38,17 +108,25 @@ class ExporterService(BaseClass):
 
         self.yaml_handler = YamlHandler()
         self.global_config: dict[str, Any] = self.yaml_handler.read_file(SETTINGS_FILE)
-        self.execution_mode: dict[str, Any] = self.global_config["execution_mode"]
+        self.execution_mode: str = self.global_config["execution_mode"]
         self.logger_config: dict[str, Any] = self.global_config["logger"]
         self.data_sources_config: dict[str, Any] = self.global_config["data_sources"][
             self.execution_mode
         ]
-        self.credentials_config = self.global_config["credentials"][self.execution_mode]
+        self.credentials_config = self.global_config.get("credentials", {}).get(
+            self.execution_mode, {}
+        )
         self.mapping_config: dict[str, Any] = self.global_config["mapping"]
         self.general_rules_config: dict[str, Any] = self.global_config["general_rules"]
 
         self.rule_contains_date: list[str] = self.general_rules_config["contains_date"]["clients"]
         self.file_handler = SqlHandler()
+        self.watermark_store = WatermarkStore()
+        export_defaults = self._resolve_export_options({})
+        self.result_cache = QueryResultCache(
+            default_ttl=int(export_defaults["cache_ttl"]),
+            max_bytes=int(export_defaults["cache_max_bytes"]),
+        )
         self.choice_0_1 = OperationType.CHOICE_1_0.value
         self.arrow = SpecialChars.ARROW.value
         self.export = OperationType.EXPORT.value
@@ -62,11 +140,71 @@ class ExporterService(BaseClass):
                 break
         super()._separator_line()
 
+    def export_client(
+        self,
+        client_name: str,
+        options: dict[str, Any] | None = None,
+        *,
+        cancel_token: CancellationToken | None = None,
+    ) -> dict[str, Any]:
+        """Exporta todas as consultas de um cliente sem interação com o usuário.
+
+        As opções fornecidas sobrescrevem as do `settings.yaml`. Caso `add_date_to_filename` não
+        seja informado, os arquivos são gerados sem a data no nome. Com `cancel_token`, a
+        exportação pode ser interrompida por outra thread: as consultas em execução são
+        canceladas no banco e as restantes falham com `QueryCancelledError`. Retorna um resumo
+        com as linhas, bytes e tempo decorrido da exportação e as consultas que falharam ou
+        excederam o prazo (`timed_out`).
+        """
+        if client_name not in self.data_sources_config:
+            self.logger.error(f"O cliente '{client_name}' não existe em `data_sources`.")
+            raise KeyError(client_name)
+        started_at = time.perf_counter()
+        client_config = self._build_client_config(client_name)
+        client_config.update(options or {})
+        if client_config.get("add_date_to_filename") is None:
+            client_config["add_date_to_filename"] = False
+        query_results = self._process_export(client_config, cancel_token)
+        return {
+            "client_name": client_name,
+            "queries": len(query_results),
+            "failed": [result["query"] for result in query_results if result["error"]],
+            "timed_out": [result["query"] for result in query_results if result["timed_out"]],
+            "rows": sum(result["rows"] for result in query_results),
+            "bytes": sum(result["bytes"] for result in query_results),
+            "elapsed": round(time.perf_counter() - started_at, 3),
+        }
+
+    def client_database_handler(self, client_name: str) -> DatabaseConnectionManager:
+        """Retorna o handler de banco de dados do cliente, com a conexão do `settings.yaml`.
+
+        Utilizado por outros serviços (ex.: a importação) que acessam o banco dos clientes.
+        """
+        if client_name not in self.data_sources_config:
+            self.logger.error(f"O cliente '{client_name}' não existe em `data_sources`.")
+            raise KeyError(client_name)
+        return self._initialize_database_handler(self._build_client_config(client_name))
+
     def _define_config(self) -> dict[str, Any]:
         """Define a configuração de exportação com base no modo de execução."""
         available_clients_list = self.yaml_handler.get_available_keys(self.data_sources_config)
         selected_client_key = self.yaml_handler.get_selected_key(available_clients_list)
+        return self._build_client_config(selected_client_key)
+
+    def _build_client_config(self, selected_client_key: str) -> dict[str, Any]:
+        """Monta a configuração de conexão e exportação de um cliente de `data_sources`.
+
+        Nos modos embarcados (ex.: `sqlite`), o `database` do cliente é o caminho do arquivo do
+        banco e não há servidor nem credenciais.
+        """
         selected_client = self.data_sources_config[selected_client_key]
+        if self.execution_mode in EMBEDDED_BACKENDS:
+            return {
+                "client_name": selected_client_key,
+                "server_name": self.execution_mode,
+                "database": selected_client["database"],
+                **self._resolve_export_options(selected_client),
+            }
         server_selected_client = selected_client["server_name"]["local"]
         database_selected_client = selected_client["database"]["local"]
         credential_selected_key = self.mapping_config[server_selected_client]
@@ -78,25 +216,101 @@ class ExporterService(BaseClass):
             "username": credential_connection_dict["username"],
             "password": credential_connection_dict["password"],
             "database": database_selected_client,
+            **self._resolve_export_options(selected_client, server_selected_client),
         }
 
-    def _process_export(self, client_config: dict[str, Any]) -> None:
-        """Processa a exportação de dados para arquivos CSV com base em uma configuração."""
+    def _resolve_export_options(
+        self, selected_client: dict[str, Any], server_name: str | None = None
+    ) -> dict[str, Any]:
+        """Mescla as opções de exportação padrão, globais (`export`), do servidor e do cliente.
+
+        As opções do servidor ficam em `servers.<servidor>.export` e valem para todos os clientes
+        do servidor (ex.: `packet_size` e `arraysize` ajustados à rede até ele).
+        """
+        export_options = DEFAULT_EXPORT_OPTIONS.copy()
+        export_options.update(self.global_config.get("export") or {})
+        if server_name is not None:
+            server_config = (self.global_config.get("servers") or {}).get(server_name) or {}
+            export_options.update(server_config.get("export") or {})
+        export_options.update(selected_client.get("export") or {})
+        return export_options
+
+    def _process_export(
+        self, client_config: dict[str, Any], cancel_token: CancellationToken | None = None
+    ) -> list[dict[str, Any]]:
+        """Processa a exportação de dados para arquivos CSV com base em uma configuração.
+
+        Com `run_timeout`, as consultas em execução são canceladas no banco ao fim do prazo da
+        execução e as restantes não são executadas; todas são marcadas como `timed_out` no
+        relatório. O `Ctrl+C` também cancela as consultas em execução no banco.
+        """
+        if cancel_token is None:
+            cancel_token = CancellationToken()
         try:
             client_name = client_config["client_name"]
             sql_file_path = self._define_sql_file_path(client_name)
             export_config = self._create_export_config(client_config)
             self.logger.debug(f"export_config: {self.dump_export_config(client_config)}")
-            query_dict = self.file_handler.sql_to_dict(sql_file=sql_file_path)
+            export_config["instrumentation"] = RunInstrumentation()
+            with self._query_stages(export_config, RUN_SCOPE).stage("parse"):
+                query_dict = self.file_handler.sql_to_dict(sql_file=sql_file_path)
+                export_config["annotations"] = self.file_handler.sql_annotations(sql_file_path)
             db_handler = self._initialize_database_handler(client_config)
-            self._export_dict_to_csv(
-                db_handler=db_handler,
-                query_dict=query_dict,
-                export_config=export_config,
-            )
+            db_handler.cancel_token = cancel_token
+            run_timeout = float(export_config.get("run_timeout") or 0)
+            with (
+                deadline(cancel_token, run_timeout, f"prazo da execução ({run_timeout:g} s)"),
+                cancel_on_interrupt(cancel_token),
+            ):
+                query_results = self._export_dict_to_csv(
+                    db_handler=db_handler,
+                    query_dict=query_dict,
+                    export_config=export_config,
+                )
+            self._write_run_report(export_config, query_results, db_handler)
         except RuntimeError:
             self.logger.exception("Erro durante o processamento da exportação.")
             raise
+        return query_results
+
+    def _query_stages(self, export_config: dict[str, Any], query_name: str) -> QueryStages:
+        """Retorna o registrador das etapas da consulta na instrumentação da execução."""
+        instrumentation: RunInstrumentation | None = export_config.get("instrumentation")
+        return instrumentation.for_query(query_name) if instrumentation else NO_STAGES
+
+    def _write_run_report(
+        self,
+        export_config: dict[str, Any],
+        query_results: list[dict[str, Any]],
+        db_handler: DatabaseConnectionManager,
+    ) -> None:
+        """Grava o relatório de desempenho da execução na pasta de exportação do cliente.
+
+        Com `run_report`, grava o relatório JSON, único por execução; com `prometheus_report`, as
+        métricas no formato texto do Prometheus, no arquivo do cliente sobrescrito a cada execução.
+        """
+        instrumentation: RunInstrumentation | None = export_config.get("instrumentation")
+        if instrumentation is None or not (
+            export_config.get("run_report") or export_config.get("prometheus_report")
+        ):
+            return
+        governor: MemoryGovernor | None = export_config.get("memory_governor")
+        report = build_run_report(
+            export_config["client_name"],
+            instrumentation,
+            query_results,
+            memory=governor.stats() if governor else None,
+            connection_pool=db_handler.pool.snapshot() if db_handler.pool else None,
+        )
+        client_folder = Path(export_config["output_path"]) / export_config["client_name"]
+        if export_config.get("run_report"):
+            report_file = run_report_file(client_folder, instrumentation.started_at)
+            write_run_report(report_file, report)
+            self.logger.info(f"Relatório da execução gravado em '{report_file}'.")
+        if export_config.get("prometheus_report"):
+            prometheus_file = prometheus_report_file(client_folder, export_config["client_name"])
+            write_prometheus_report(prometheus_file, report)
+            self.logger.info(f"Métricas do Prometheus gravadas em '{prometheus_file}'.")
 
     def _define_sql_file_path(self, selected_client: str) -> Path:
         """Define o caminho do arquivo SQL com base no cliente selecionado."""
@@ -109,26 +323,26 @@ class ExporterService(BaseClass):
     def _save_dataframe_to_csv(
         self, df: pd.DataFrame, output_file: Path, export_config: dict[str, Any]
     ) -> None:
-        """Salva o DataFrame em um arquivo CSV."""
-        if output_file.exists():
-            output_file.unlink()
-        quote_params: dict[str, Any] = {}
-        if export_config["quotechar"]:
-            quote_params["quotechar"] = export_config["quotechar"]
-            quote_params["quoting"] = csv.QUOTE_ALL
+        """Salva o DataFrame em um arquivo CSV, gravado em um temporário e renomeado ao final."""
+        quote_params = get_csv_quote_params(export_config)
         if df.empty:
+            output_file.unlink(missing_ok=True)
             self.logger.warning("O DataFrame está vazio. Nenhum arquivo será salvo.")
             return
+        temp_file = temp_file_for(output_file)
         try:
             df.to_csv(
-                output_file,
+                temp_file,
                 encoding=export_config["encoding"],
                 index=False,
                 sep=export_config["delimiter"],
                 **quote_params,
             )
+            temp_file.replace(output_file)
+            remove_split_parts(output_file)
             self.logger.info(f'O arquivo "{output_file.stem}" foi criado com sucesso.')
         except Exception as e:
+            temp_file.unlink(missing_ok=True)
             self.logger.exception("Erro ao salvar o DataFrame em CSV.")
             raise RuntimeError from e
 
@@ -137,49 +351,1086 @@ class ExporterService(BaseClass):
         db_handler: DatabaseConnectionManager,
         query_dict: dict[str, str],
         export_config: dict[str, Any],
-    ) -> None:
-        """Exporta consultas SQL (dicionário) para arquivos CSV."""
+    ) -> list[dict[str, Any]]:
+        """Exporta consultas SQL (dicionário) para CSV e retorna o resultado de cada uma."""
         client_folder = Path(export_config["output_path"] / export_config["client_name"])
         client_folder.mkdir(parents=True, exist_ok=True)
-        with db_handler:
-            if db_handler.conn is None:
+        # Os nomes são definidos antes da execução, pois podem depender de interação do usuário
+        writer_class = get_export_writer(export_config["output_format"])
+        extension = writer_class.file_extension(export_config)
+        output_files = {
+            key: (
+                client_folder
+                / self._generate_file_name(
+                    key, add_date_to_filename=export_config.get("add_date_to_filename")
+                )
+            ).with_suffix(extension)
+            for key in query_dict
+        }
+        export_config["checkpoint_journal"] = CheckpointJournal(client_folder)
+        export_config["memory_governor"] = self._create_memory_governor(export_config)
+        query_results = self._skip_completed_queries(query_dict, export_config)
+        completed_queries = {result["query"] for result in query_results}
+        query_dict = {
+            key: value for key, value in query_dict.items() if key not in completed_queries
+        }
+        if not query_dict:
+            return query_results
+        max_workers = int(export_config.get("max_workers") or 1)
+        if max_workers > 1 and len(query_dict) > 1:
+            return query_results + self._export_dict_concurrently(
+                db_handler=db_handler,
+                query_dict=query_dict,
+                output_files=output_files,
+                export_config=export_config,
+                max_workers=max_workers,
+            )
+        all_cached = all(
+            self._is_result_cached(key, value, db_handler, export_config)
+            for key, value in query_dict.items()
+        )
+        if all_cached:
+            self.logger.info("Todos os resultados estão em cache. O banco não será acessado.")
+        db_handler.stages = self._query_stages(export_config, RUN_SCOPE)
+        with nullcontext() if all_cached else db_handler:
+            if not all_cached and db_handler.conn is None:
                 self.logger.error("Conexão com o banco de dados não estabelecida.")
                 raise RuntimeError
             for key, value in query_dict.items():
-                self._process_single_query(
+                try:
+                    query_result = self._process_single_query(
+                        key=key,
+                        value=value,
+                        db_handler=db_handler,
+                        output_file=output_files[key],
+                        export_config=export_config,
+                    )
+                except QueryTimeoutError as e:
+                    self.logger.warning(
+                        f"Query '{key}' interrompida ({e}). Seguindo com as demais."
+                    )
+                    query_result = self._build_query_result(key, output_files[key], 0, e)
+                    if not all_cached:
+                        self._reopen_connection(db_handler, e)
+                self._record_completed_query(query_result, export_config)
+                query_results.append(query_result)
+        return query_results
+
+    def _reopen_connection(
+        self, db_handler: DatabaseConnectionManager, error: QueryTimeoutError
+    ) -> None:
+        """Libera a conexão da consulta que excedeu o prazo e abre outra para as seguintes.
+
+        Após o prazo da execução, as consultas restantes não são executadas e a conexão não é
+        reaberta.
+        """
+        db_handler.__exit__(type(error), error, error.__traceback__)
+        run_token = db_handler.cancel_token
+        if run_token is None or not run_token.cancelled:
+            db_handler.__enter__()
+
+    def _skip_completed_queries(
+        self, query_dict: dict[str, str], export_config: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Retorna os resultados das consultas já concluídas, a serem ignoradas na retomada.
+
+        Sem a opção `resume`, inicia um novo journal e nenhuma consulta é ignorada. Com ela, uma
+        consulta só é ignorada se o arquivo registrado ainda existir com o mesmo tamanho.
+        """
+        journal: CheckpointJournal = export_config["checkpoint_journal"]
+        if not export_config.get("resume"):
+            journal.reset()
+            return []
+        query_results: list[dict[str, Any]] = []
+        for key in query_dict:
+            checkpoint = journal.get(key)
+            if not checkpoint or checkpoint["status"] != "completed":
+                continue
+            query_result = self._build_query_result(
+                key, Path(checkpoint["file"]), checkpoint["rows"]
+            )
+            if query_result["bytes"] != checkpoint["bytes"]:
+                self.logger.warning(
+                    f"Query '{key}': o arquivo difere do checkpoint e será exportado novamente."
+                )
+                continue
+            query_results.append(query_result)
+        self.logger.info(
+            f"Retomada: {len(query_results)} de {len(query_dict)} consultas já concluídas."
+        )
+        return query_results
+
+    def _record_completed_query(
+        self, query_result: dict[str, Any], export_config: dict[str, Any]
+    ) -> None:
+        """Registra no journal a consulta exportada com sucesso."""
+        journal: CheckpointJournal | None = export_config.get("checkpoint_journal")
+        if journal is None or query_result["error"]:
+            return
+        journal.complete(
+            query_result["query"],
+            file=Path(query_result["file"]),
+            rows=query_result["rows"],
+            size=query_result["bytes"],
+        )
+
+    def _build_query_result(
+        self, key: str, output_file: Path, rows: int, error: BaseException | None = None
+    ) -> dict[str, Any]:
+        """Monta o resultado da exportação de uma consulta.
+
+        Quando a saída foi dividida em partes, o tamanho é a soma das partes do manifesto. Uma
+        consulta com erro (inclusive a não executada após o prazo) tem `0` bytes, já que o arquivo
+        existente é de uma execução anterior.
+        """
+        manifest_file = split_manifest_file(output_file)
+        if error is not None:
+            output_bytes = 0
+        elif manifest_file.exists():
+            output_bytes = json.loads(manifest_file.read_text(encoding="utf-8"))["total_bytes"]
+        else:
+            output_bytes = output_file.stat().st_size if output_file.exists() else 0
+        return {
+            "query": key,
+            "file": str(output_file),
+            "rows": rows,
+            "bytes": output_bytes,
+            "error": repr(error) if error else None,
+            "timed_out": isinstance(error, QueryTimeoutError),
+        }
+
+    def _export_dict_concurrently(
+        self,
+        db_handler: DatabaseConnectionManager,
+        query_dict: dict[str, str],
+        output_files: dict[str, Path],
+        export_config: dict[str, Any],
+        max_workers: int,
+    ) -> list[dict[str, Any]]:
+        """Exporta as consultas em paralelo, cada worker com a sua própria conexão.
+
+        Falhas em uma consulta são registradas no resultado e não interrompem as demais. Com
+        pool, os workers são limitados a `pool_size`, para que nenhum aguarde uma conexão até
+        `acquire_timeout`.
+        """
+        workers = min(max_workers, len(query_dict))
+        if db_handler.pool is not None:
+            workers = min(workers, db_handler.pool.max_size)
+        self.logger.info(f"Exportando {len(query_dict)} consultas com {workers} workers.")
+        query_results: list[dict[str, Any]] = []
+        failed_queries: list[str] = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exporter") as executor:
+            futures = {
+                executor.submit(
+                    self._process_query_with_own_connection,
                     key=key,
                     value=value,
-                    db_handler=db_handler,
-                    client_folder=client_folder,
+                    db_handler=db_handler.clone(),
+                    output_file=output_files[key],
                     export_config=export_config,
-                )
+                ): key
+                for key, value in query_dict.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    query_results.append(future.result())
+                except Exception as e:  # noqa: BLE001
+                    failed_queries.append(key)
+                    query_results.append(self._build_query_result(key, output_files[key], 0, e))
+        if failed_queries:
+            self.logger.error(
+                f"{len(failed_queries)} de {len(query_dict)} consultas falharam: "
+                f"{', '.join(failed_queries)}"
+            )
+        self.logger.info(
+            f"{len(query_dict) - len(failed_queries)} de {len(query_dict)} consultas exportadas."
+        )
+        return query_results
+
+    def _process_query_with_own_connection(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Abre uma conexão exclusiva para a consulta e a processa dentro dela.
+
+        Com o orçamento de memória, a consulta aguarda uma vaga conforme a concorrência permitida.
+        """
+        cached = self._is_result_cached(key, value, db_handler, export_config)
+        db_handler.stages = self._query_stages(export_config, key)
+        governor: MemoryGovernor | None = export_config.get("memory_governor")
+        with (
+            governor.slot() if governor else nullcontext(),
+            nullcontext() if cached else db_handler,
+        ):
+            query_result = self._process_single_query(
+                key=key,
+                value=value,
+                db_handler=db_handler,
+                output_file=output_file,
+                export_config=export_config,
+            )
+        self._record_completed_query(query_result, export_config)
+        return query_result
 
     def _process_single_query(
         self,
         key: str,
         value: str,
         db_handler: DatabaseConnectionManager,
-        client_folder: Path,
+        output_file: Path,
+        export_config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Processa uma consulta SQL no seu prazo e retorna o seu resultado.
+
+        Com `query_timeout` (ou `-- @timeout: <segundos>` na consulta), a consulta em execução é
+        cancelada no banco ao fim do prazo e `QueryTimeoutError` é lançado. O token da consulta é
+        filho do token da execução, de modo que o prazo da execução também a interrompe.
+        """
+        timeout = self._query_timeout(key, export_config)
+        run_token = db_handler.cancel_token
+        with CancellationToken(parent=run_token) as query_token:
+            query_token.raise_if_cancelled()
+            db_handler.cancel_token = query_token
+            try:
+                with deadline(query_token, timeout, f"prazo da consulta ({timeout:g} s)"):
+                    return self._export_single_query(
+                        key=key,
+                        value=value,
+                        db_handler=db_handler,
+                        output_file=output_file,
+                        export_config=export_config,
+                    )
+            except Exception as e:
+                # Erros encapsulados (ex.: pelas faixas paralelas) causados pelo fim do prazo
+                if query_token.timed_out and not isinstance(e, QueryTimeoutError):
+                    raise QueryTimeoutError(query_token.reason) from e
+                raise
+            finally:
+                db_handler.cancel_token = run_token
+
+    def _wrapping_annotations(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Retorna as anotações da consulta, sem as que o banco não consegue aplicar a ela.
+
+        A watermark, as faixas e a retomada leem a consulta como subconsulta, o que o SQL Server
+        rejeita em consultas com CTE ou `ORDER BY` sem `TOP`. Nesses casos a consulta é exportada
+        por inteiro, sem essas anotações, e um aviso é registrado no log.
+        """
+        annotations = export_config.get("annotations", {}).get(key, {})
+        ignored = [name for name in WRAPPING_ANNOTATIONS if annotations.get(name)]
+        if not ignored or db_handler.can_wrap_query(value):
+            return annotations
+        self.logger.warning(
+            f"Query '{key}': o banco não aceita a consulta como subconsulta (CTE ou ORDER BY sem "
+            f"TOP). Ignorando as anotações {ignored} e exportando a consulta por inteiro."
+        )
+        return {name: item for name, item in annotations.items() if name not in ignored}
+
+    def _query_timeout(self, key: str, export_config: dict[str, Any]) -> float:
+        """Retorna o prazo da consulta, em segundos: a anotação `timeout` ou `query_timeout`."""
+        annotations = export_config.get("annotations", {}).get(key, {})
+        return float(annotations.get("timeout") or export_config.get("query_timeout") or 0)
+
+    def _export_single_query(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Processa uma consulta SQL, salva o resultado em arquivo e retorna o seu resultado."""
+        db_handler.stages = self._query_stages(export_config, key)
+        annotations = self._wrapping_annotations(key, value, db_handler, export_config)
+        watermark_column = annotations.get("watermark")
+        if watermark_column and export_config.get("incremental"):
+            return self._process_incremental_query(
+                key=key,
+                value=value,
+                db_handler=db_handler,
+                output_file=output_file,
+                export_config=export_config,
+                watermark_column=watermark_column,
+            )
+        partition_column = annotations.get("partition")
+        if partition_column and not self._is_result_cached(key, value, db_handler, export_config):
+            return self._process_sharded_query(
+                key=key,
+                value=value,
+                db_handler=db_handler,
+                output_file=output_file,
+                export_config=export_config,
+                partition_column=partition_column,
+            )
+        order_column = annotations.get("order_by")
+        if (
+            order_column
+            and self._is_resumable_format(export_config)
+            # Um resultado em cache é exportado por inteiro, sem consultar o banco
+            and not self._is_result_cached(key, value, db_handler, export_config)
+        ):
+            return self._process_resumable_query(
+                key=key,
+                value=value,
+                db_handler=db_handler,
+                output_file=output_file,
+                export_config=export_config,
+                order_column=order_column,
+            )
+        if (
+            int(export_config.get("chunksize") or 0) > 0
+            or get_export_writer(export_config["output_format"]) is not CsvExportWriter
+            or export_config.get("compression")
+            or export_config.get("cache")
+            or export_config.get("csv_engine") == "native"
+            or export_config.get("split_rows")
+            or export_config.get("split_bytes")
+            # A leitura em lotes permite cancelar a consulta ao fim do prazo
+            or self._query_timeout(key, export_config)
+            or export_config.get("run_timeout")
+        ):
+            rows = self._stream_single_query(
+                key=key,
+                value=value,
+                db_handler=db_handler,
+                output_file=output_file,
+                export_config=export_config,
+            )
+            return self._build_query_result(key, output_file, rows)
+        try:
+            if export_config.get("compact_dtypes"):
+                df_queries = self._read_compact_dataframe(key, value, db_handler, export_config)
+            else:
+                with db_handler.stages.stage("fetch") as metrics:
+                    df_queries = pd.read_sql_query(
+                        sql=value,
+                        con=db_handler.conn,  # type: ignore[reportArgumentType]
+                    )
+                    metrics.rows = len(df_queries)
+                if export_config.get("memory_report"):
+                    self._log_memory_report(key, memory_footprint(df_queries))
+        except (pd.errors.DatabaseError, ValueError, RuntimeError):
+            self.logger.exception(f"Erro ao executar a query '{key}'")
+            raise
+        try:
+            with db_handler.stages.stage("write") as metrics:
+                self._save_dataframe_to_csv(
+                    df=df_queries, output_file=output_file, export_config=export_config
+                )
+                metrics.rows = len(df_queries)
+                metrics.bytes = output_file.stat().st_size if output_file.exists() else 0
+        except RuntimeError:
+            self.logger.exception(f"Erro ao salvar o arquivo CSV '{output_file}'")
+            raise
+        return self._build_query_result(key, output_file, len(df_queries))
+
+    def _read_compact_dataframe(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+    ) -> pd.DataFrame:
+        """Lê o resultado completo com os tipos do plano montado a partir de `cursor.description`.
+
+        Cada lote é convertido antes de ser acumulado, de modo que o resultado nunca é mantido em
+        memória com os tipos inferidos pelo pandas. As colunas de texto de baixa cardinalidade são
+        convertidas em categoria ao final.
+        """
+        memory_report = bool(export_config.get("memory_report"))
+        plan: DtypePlan | None = None
+        frames: list[pd.DataFrame] = []
+        inferred_bytes = 0
+        batch_size = self._fetch_batch_size(export_config, COMPACT_READ_BATCH_ROWS)
+        for batch in db_handler.fetch_batches(value, batch_size):
+            if plan is None:
+                plan = cast(
+                    "DtypePlan", dtype_plan_for(db_handler.column_description(), export_config)
+                )
+            df = pd.DataFrame.from_records(batch, columns=plan.columns)
+            if memory_report:
+                inferred_bytes += memory_footprint(df)
+            frames.append(plan.apply(df))
+        if plan is None:
+            return pd.DataFrame(columns=db_handler.column_names())
+        df_queries = plan.categorize(pd.concat(frames, ignore_index=True))
+        if memory_report:
+            self._log_memory_report(key, inferred_bytes, memory_footprint(df_queries))
+        return df_queries
+
+    def _log_memory_report(
+        self, key: str, inferred_bytes: int, compact_bytes: int | None = None
+    ) -> None:
+        """Registra no log a memória do DataFrame da consulta, antes e depois do plano de tipos."""
+        message = f"Query '{key}': DataFrame com {inferred_bytes / 1024**2:.1f} MB"
+        if compact_bytes is not None:
+            reduction = 1 - compact_bytes / inferred_bytes if inferred_bytes else 0.0
+            message += (
+                f" com os tipos inferidos e {compact_bytes / 1024**2:.1f} MB com o plano de tipos"
+                f" ({reduction:.0%} a menos)"
+            )
+        self.logger.info(f"{message}.")
+
+    def _process_incremental_query(  # noqa: PLR0913
+        self,
+        *,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        watermark_column: str,
+    ) -> dict[str, Any]:
+        """Exporta apenas as linhas com watermark maior que o último valor exportado.
+
+        Na primeira execução a consulta é exportada por completo. Nas seguintes, as linhas novas
+        são gravadas em um arquivo delta (`<nome>_delta_<HHMMSS>`). A watermark só é atualizada
+        após a gravação do arquivo.
+        """
+        client_name = export_config["client_name"]
+        state = self.watermark_store.get(client_name, key)
+        params: tuple[Any, ...] = ()
+        if state and state["column"] == watermark_column:
+            value = INCREMENTAL_QUERY_TEMPLATE.format(
+                query=value.rstrip("; "), column=db_handler.quote_identifier(watermark_column)
+            )
+            params = (state["value"],)
+            suffix = "".join(output_file.suffixes)
+            delta_name = f"{output_file.name.removesuffix(suffix)}_delta_"
+            output_file = output_file.with_name(
+                f"{delta_name}{self._generate_formatted_datetime('%H%M%S')}{suffix}"
+            )
+            self.logger.info(
+                f"Query '{key}': exportando linhas com {watermark_column} > {params[0]}"
+            )
+        tracker = WatermarkTracker(watermark_column)
+        rows = self._stream_single_query(
+            key=key,
+            value=value,
+            db_handler=db_handler,
+            output_file=output_file,
+            export_config=export_config,
+            params=params,
+            on_batch=tracker.update,
+        )
+        if tracker.value is not None:
+            self.watermark_store.save(client_name, key, watermark_column, tracker.value)
+        return self._build_query_result(key, output_file, rows)
+
+    def _process_sharded_query(  # noqa: PLR0913
+        self,
+        *,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        partition_column: str,
+    ) -> dict[str, Any]:
+        """Divide a consulta em faixas da coluna de partição e as lê em conexões paralelas.
+
+        Os limites são calculados na conexão atual. As faixas são gravadas em um único arquivo
+        (`shard_output: merge`) ou cada uma em uma parte (`shard_output: parts`), com manifesto.
+        Com pool, a conexão atual é devolvida a ele durante a leitura das faixas, que utilizam
+        no máximo `pool_size` conexões simultâneas.
+        """
+        annotations = export_config.get("annotations", {}).get(key, {})
+        shards = int(annotations.get("shards") or export_config["shards"])
+        planner = ShardPlanner(
+            partition_column,
+            shards,
+            annotations.get("shard_strategy") or export_config["shard_strategy"],
+        )
+        try:
+            query_shards = planner.plan(db_handler, value)
+        except RuntimeError:
+            self.logger.exception(f"Erro ao calcular as faixas da query '{key}'")
+            raise
+        workers = min(shards, db_handler.pool.max_size) if db_handler.pool else shards
+        self.logger.info(
+            f"Query '{key}': {len(query_shards)} faixas de '{partition_column}' "
+            f"({planner.strategy}) em {workers} conexões."
+        )
+        with db_handler.released():
+            if export_config["shard_output"] == "parts":
+                remove_split_parts(output_file)
+                rows = self._export_shards_as_parts(
+                    key, query_shards, db_handler, output_file, export_config, workers=workers
+                )
+            else:
+                rows = self._export_shards_merged(
+                    key, query_shards, db_handler, output_file, export_config, workers=workers
+                )
+        self.logger.info(f'O arquivo "{output_file.stem}" foi criado com sucesso ({rows} linhas).')
+        return self._build_query_result(key, output_file, rows)
+
+    def _export_shards_merged(  # noqa: PLR0913
+        self,
+        key: str,
+        query_shards: list[QueryShard],
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        *,
+        workers: int,
+    ) -> int:
+        """Lê as faixas em paralelo e grava os lotes, à medida que chegam, em um único arquivo.
+
+        A fila limitada mantém a memória proporcional a poucos lotes por worker. As linhas das
+        faixas ficam intercaladas na ordem de leitura, de modo que o arquivo não é idêntico ao da
+        consulta sem faixas, mas cada linha é idêntica à da consulta original: todas as faixas,
+        inclusive a de `NULL`, são gravadas pelo mesmo escritor, cujo formato de cada coluna é
+        definido uma única vez (`CsvFormatPlan`), e não pelos valores de cada faixa.
+        """
+        batch_queue: queue.Queue[tuple[list[tuple[Any, ...]] | None, Any]] = queue.Queue(
+            maxsize=2 * workers
+        )
+        stop_event = threading.Event()
+        chunksize = self._fetch_batch_size(export_config)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard") as executor:
+            for shard in query_shards:
+                executor.submit(
+                    self._produce_shard_batches,
+                    shard,
+                    self._clone_for_shard(db_handler, export_config, key, shard),
+                    chunksize,
+                    batch_queue,
+                    stop_event,
+                )
+            stages = self._query_stages(export_config, key)
+            writer, errors = self._consume_shard_batches(
+                batch_queue,
+                len(query_shards),
+                stop_event,
+                output_file,
+                export_config,
+                stages=stages,
+            )
+        if writer is not None:
+            with stages.stage("write") as metrics:
+                writer.close()
+                if errors:
+                    writer.discard()
+                else:
+                    writer.commit()
+                    metrics.rows = writer.rows_written
+                    metrics.bytes = writer.output_bytes()
+        if errors:
+            self.logger.error(f"Erro ao exportar as faixas da query '{key}': {errors[0]!r}")
+            raise RuntimeError from errors[0]
+        if writer is None:
+            output_file.unlink(missing_ok=True)
+            self.logger.warning("O resultado da consulta está vazio. Nenhum arquivo será salvo.")
+            return 0
+        return writer.rows_written
+
+    def _consume_shard_batches(  # noqa: PLR0913
+        self,
+        batch_queue: "queue.Queue[tuple[list[tuple[Any, ...]] | None, Any]]",
+        shard_count: int,
+        stop_event: threading.Event,
+        output_file: Path,
         export_config: dict[str, Any],
+        *,
+        stages: QueryStages,
+    ) -> tuple[ExportWriter | None, list[BaseException]]:
+        """Grava os lotes da fila até que todas as faixas terminem.
+
+        O escritor é criado com a descrição das colunas do primeiro lote recebido e grava os
+        lotes de todas as faixas. Retorna o escritor utilizado (`None` se nenhuma linha foi lida)
+        e os erros ocorridos. A fila é sempre esvaziada, para que nenhum worker fique bloqueado
+        em `put`.
+        """
+        writer: ExportWriter | None = None
+        errors: list[BaseException] = []
+        pending_shards = shard_count
+        while pending_shards:
+            description, payload = batch_queue.get()
+            if description is None:
+                pending_shards -= 1
+                if payload is not None:
+                    errors.append(payload)
+                    stop_event.set()
+                continue
+            if errors:
+                continue
+            try:
+                if writer is None:
+                    writer = create_export_writer(output_file, description, export_config)
+                    writer.open()
+                with stages.stage("serialize") as metrics:
+                    writer.write_batch(payload)
+                    metrics.rows = len(payload)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+                stop_event.set()
+        return writer, errors
+
+    def _produce_shard_batches(
+        self,
+        shard: QueryShard,
+        db_handler: DatabaseConnectionManager,
+        chunksize: BatchSize,
+        batch_queue: "queue.Queue[tuple[list[tuple[Any, ...]] | None, Any]]",
+        stop_event: threading.Event,
     ) -> None:
-        """Processa uma única consulta SQL e salva o resultado em CSV."""
+        """Lê uma faixa na sua própria conexão e envia os lotes para a fila.
+
+        Cada lote é enviado com a descrição das colunas. Ao final, envia `(None, erro)`, com o
+        erro ocorrido ou `None`.
+        """
+        error: BaseException | None = None
         try:
-            df_queries = pd.read_sql_query(
-                sql=value,
-                con=db_handler.conn,  # type: ignore[reportArgumentType]
+            with db_handler:
+                for batch in db_handler.fetch_batches(shard.query, chunksize, shard.params):
+                    if stop_event.is_set():
+                        break
+                    batch_queue.put((db_handler.column_description(), batch))
+        except Exception as e:  # noqa: BLE001
+            error = e
+        batch_queue.put((None, error))
+
+    def _export_shards_as_parts(  # noqa: PLR0913
+        self,
+        key: str,
+        query_shards: list[QueryShard],
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        *,
+        workers: int,
+    ) -> int:
+        """Grava cada faixa em uma parte (`<nome>_part0001`, ...) e o manifesto das partes.
+
+        As faixas sem linhas não geram partes. A numeração segue a ordem das faixas.
+        """
+        shard_config = {**export_config, "split_rows": 0, "split_bytes": 0}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard") as executor:
+            futures = [
+                executor.submit(
+                    self._export_shard_to_part,
+                    key,
+                    shard,
+                    self._clone_for_shard(db_handler, export_config, key, shard),
+                    split_part_file(output_file, shard.index),
+                    shard_config,
+                )
+                for shard in query_shards
+            ]
+        try:
+            parts = [future.result() for future in futures]
+        except RuntimeError:
+            remove_split_parts(output_file)
+            self.logger.exception(f"Erro ao exportar as faixas da query '{key}'")
+            raise
+        parts = [part for part in parts if part["rows"]]
+        if parts:
+            write_split_manifest(output_file, parts)
+        return sum(part["rows"] for part in parts)
+
+    def _clone_for_shard(
+        self,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+        key: str,
+        shard: QueryShard,
+    ) -> DatabaseConnectionManager:
+        """Retorna uma conexão própria para a faixa, com as etapas registradas em `key[n]`."""
+        shard_handler = db_handler.clone()
+        shard_handler.stages = self._query_stages(export_config, f"{key}[{shard.index}]")
+        return shard_handler
+
+    def _export_shard_to_part(
+        self,
+        key: str,
+        shard: QueryShard,
+        db_handler: DatabaseConnectionManager,
+        part_file: Path,
+        export_config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Exporta uma faixa na sua própria conexão e retorna o registro da parte gerada."""
+        with db_handler:
+            rows = self._stream_single_query(
+                key=f"{key}[{shard.index}]",
+                value=shard.query,
+                db_handler=db_handler,
+                output_file=part_file,
+                export_config=export_config,
+                params=shard.params,
             )
-        except (pd.errors.DatabaseError, ValueError):
+        return {
+            "file": part_file.name,
+            "rows": rows,
+            "bytes": part_file.stat().st_size if part_file.exists() else 0,
+        }
+
+    def _is_resumable_format(self, export_config: dict[str, Any]) -> bool:
+        """Indica se o formato configurado permite retomar a gravação de um arquivo interrompido.
+
+        Apenas o CSV sem compressão e sem divisão em partes pode ser truncado e continuado.
+        """
+        return (
+            issubclass(resolve_export_writer(export_config), CsvExportWriter)
+            and not export_config.get("compression")
+            and not export_config.get("split_rows")
+            and not export_config.get("split_bytes")
+        )
+
+    def _resumable_checkpoint(
+        self, key: str, output_file: Path, export_config: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Retorna o checkpoint da consulta interrompida, se a gravação puder ser continuada.
+
+        O arquivo temporário é o registrado no journal, e é removido se o checkpoint for inválido.
+        """
+        if not export_config.get("resume"):
+            return None
+        checkpoint = export_config["checkpoint_journal"].get(key)
+        if not checkpoint or checkpoint["status"] != "in_progress":
+            return None
+        temp_file = Path(checkpoint["temp_file"]) if checkpoint.get("temp_file") else None
+        if (
+            checkpoint["file"] != str(output_file)
+            or temp_file is None
+            or not temp_file.exists()
+            or temp_file.stat().st_size < checkpoint["bytes"]
+        ):
+            self.logger.warning(f"Query '{key}': checkpoint inválido. Exportando do início.")
+            if temp_file is not None:
+                temp_file.unlink(missing_ok=True)
+            return None
+        return checkpoint
+
+    def _process_resumable_query(  # noqa: PLR0913
+        self,
+        *,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        order_column: str,
+    ) -> dict[str, Any]:
+        """Exporta a consulta ordenada pela chave, registrando cada lote gravado no journal.
+
+        Com a opção `resume`, uma exportação interrompida continua do último lote confirmado: o
+        arquivo temporário é truncado no tamanho registrado e a consulta é retomada a partir da
+        última chave gravada. A chave de ordenação deve ser única.
+
+        Com a opção `cache`, um resultado em cache é exportado sem passar por este fluxo, e uma
+        exportação completa (não retomada) grava o resultado no cache.
+        """
+        journal: CheckpointJournal = export_config["checkpoint_journal"]
+        checkpoint = self._resumable_checkpoint(key, output_file, export_config)
+        params: tuple[Any, ...] = ()
+        if checkpoint:
+            query = RESUME_QUERY_TEMPLATE.format(
+                query=value.rstrip("; "), column=db_handler.quote_identifier(order_column)
+            )
+            params = (checkpoint["last_key"],)
+            self.logger.info(
+                f"Query '{key}': retomando após {order_column} = {params[0]} "
+                f"({checkpoint['rows']} linhas já gravadas)."
+            )
+        else:
+            query = ORDERED_QUERY_TEMPLATE.format(
+                query=value.rstrip("; "), column=db_handler.quote_identifier(order_column)
+            )
+        chunksize = self._fetch_batch_size(export_config)
+        try:
+            batches = db_handler.fetch_batches(query, chunksize, params)
+            first_batch = next(batches, None)
+        except RuntimeError:
             self.logger.exception(f"Erro ao executar a query '{key}'")
             raise
-        file_name = self._generate_file_name(key)
-        output_file = client_folder / file_name
+        if first_batch is None and not checkpoint:
+            output_file.unlink(missing_ok=True)
+            self.logger.warning("O resultado da consulta está vazio. Nenhum arquivo será salvo.")
+            return self._build_query_result(key, output_file, 0)
+        description = db_handler.column_description()
+        writer = resolve_export_writer(export_config)(output_file, description, export_config)
+        batches = self._cache_resumable_batches(
+            key=key,
+            value=value,
+            db_handler=db_handler,
+            description=description,
+            batches=chain([first_batch] if first_batch else [], batches),
+            export_config=export_config,
+            resumed=bool(checkpoint),
+        )
+        key_index = [column.lower() for column in writer.columns].index(order_column.lower())
+        if checkpoint:
+            cast("CsvExportWriter", writer).resume(
+                Path(checkpoint["temp_file"]), checkpoint["rows"], checkpoint["bytes"]
+            )
+        else:
+            writer.open()
+
+        def write_batch(batch: list[tuple[Any, ...]]) -> None:
+            writer.write_batch(batch)
+            writer.flush()
+            journal.record_chunk(
+                key,
+                file=output_file,
+                temp_file=writer.temp_file,
+                rows=writer.rows_written,
+                size=writer.temp_file.stat().st_size,
+                last_key=batch[-1][key_index],
+            )
+
         try:
-            self._save_dataframe_to_csv(
-                df=df_queries, output_file=output_file, export_config=export_config
+            self._consume_batches(key, batches, write_batch, export_config)
+        except RuntimeError:
+            self.logger.exception(f"Erro ao executar a query '{key}'")
+            raise
+        except Exception as e:
+            self.logger.exception(f"Erro ao salvar o arquivo '{output_file}'")
+            raise RuntimeError from e
+        finally:
+            # O arquivo temporário é mantido para que a exportação possa ser retomada
+            writer.close()
+        with db_handler.stages.stage("write") as metrics:
+            writer.commit()
+            metrics.rows = writer.rows_written
+            metrics.bytes = writer.output_bytes()
+        self.logger.info(
+            f'O arquivo "{output_file.stem}" foi criado com sucesso ({writer.rows_written} linhas).'
+        )
+        return self._build_query_result(key, output_file, writer.rows_written)
+
+    def _cache_resumable_batches(  # noqa: PLR0913
+        self,
+        *,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        description: list[tuple[Any, ...]],
+        batches: Iterator[list[tuple[Any, ...]]],
+        export_config: dict[str, Any],
+        resumed: bool,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Grava no cache os lotes da exportação ordenada, quando a opção `cache` estiver ativa.
+
+        A retomada lê apenas as linhas após o último lote confirmado e, por isso, não é gravada.
+        """
+        cache_key = self._build_cache_key(value, db_handler, export_config)
+        if not cache_key:
+            return batches
+        if resumed:
+            self.logger.info(
+                f"Query '{key}': a retomada lê apenas as linhas restantes; "
+                "o resultado não será gravado no cache."
+            )
+            return batches
+        return self._cache_result_batches(key, cache_key, description, batches, export_config)
+
+    def _stream_single_query(  # noqa: PLR0913
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        output_file: Path,
+        export_config: dict[str, Any],
+        *,
+        params: Sequence[Any] = (),
+        on_batch: Callable[[list[tuple[Any, ...]], list[str]], None] | None = None,
+    ) -> int:
+        """Processa uma consulta SQL em lotes, gravando cada lote no arquivo assim que é lido.
+
+        O pico de memória fica limitado ao tamanho do lote (`chunksize`), e não ao tamanho do
+        resultado. No formato CSV, cabeçalho, aspas e delimitador são idênticos aos de
+        `_save_dataframe_to_csv`.
+        """
+        try:
+            result_batches = self._open_result_batches(
+                key, value, db_handler, export_config, params
             )
         except RuntimeError:
-            self.logger.exception(f"Erro ao salvar o arquivo CSV '{output_file}'")
+            self.logger.exception(f"Erro ao executar a query '{key}'")
+            raise
+        if result_batches is None:
+            output_file.unlink(missing_ok=True)
+            remove_split_parts(output_file)
+            self.logger.warning("O resultado da consulta está vazio. Nenhum arquivo será salvo.")
+            return 0
+        description, batches = result_batches
+        try:
+            with create_export_writer(output_file, description, export_config) as writer:
+                writer.stages = self._query_stages(export_config, key)
+
+                def write_batch(batch: list[tuple[Any, ...]]) -> None:
+                    writer.write_batch(batch)
+                    if on_batch:
+                        on_batch(batch, writer.columns)
+                    self.logger.debug(f"Query '{key}': {writer.rows_written} linhas gravadas.")
+
+                self._consume_batches(key, batches, write_batch, export_config)
+                total_rows = writer.rows_written
+        except RuntimeError:
+            self.logger.exception(f"Erro ao executar a query '{key}'")
             raise
+        except Exception as e:
+            self.logger.exception(f"Erro ao salvar o arquivo '{output_file}'")
+            raise RuntimeError from e
+        self.logger.info(
+            f'O arquivo "{output_file.stem}" foi criado com sucesso ({total_rows} linhas).'
+        )
+        return total_rows
+
+    def _consume_batches(
+        self,
+        key: str,
+        batches: Iterator[list[tuple[Any, ...]]],
+        consume: Callable[[list[tuple[Any, ...]]], None],
+        export_config: dict[str, Any],
+    ) -> None:
+        """Grava os lotes, sobrepondo a leitura do banco e a gravação com `pipeline_depth` > 0.
+
+        No pipeline, os lotes são lidos em uma thread produtora enquanto os anteriores são
+        gravados, e as métricas da fila são registradas no log ao final. A gravação de cada lote
+        é registrada na etapa `serialize` da consulta.
+        """
+        stages = self._query_stages(export_config, key)
+
+        def serialize(batch: list[tuple[Any, ...]]) -> None:
+            with stages.stage("serialize") as metrics:
+                consume(batch)
+                metrics.rows = len(batch)
+
+        pipeline_depth = int(export_config.get("pipeline_depth") or 0)
+        if pipeline_depth <= 0:
+            for batch in batches:
+                serialize(batch)
+            return
+        metrics = BatchPipeline(pipeline_depth).run(batches, serialize)
+        self.logger.info(f"Query '{key}': pipeline com {metrics}.")
+
+    def _fetch_batch_size(
+        self, export_config: dict[str, Any], chunksize: int | None = None
+    ) -> BatchSize:
+        """Retorna o tamanho dos lotes lidos do cursor, ajustado pelo orçamento de memória.
+
+        Sem orçamento (`memory_budget_mb`), o tamanho é fixo e igual a `chunksize` (ou
+        `STREAM_CHUNKSIZE`, na exportação legada).
+        """
+        chunksize = chunksize or int(export_config.get("chunksize") or STREAM_CHUNKSIZE)
+        governor: MemoryGovernor | None = export_config.get("memory_governor")
+        return governor.batch_size_for(chunksize) if governor else chunksize
+
+    def _create_memory_governor(self, export_config: dict[str, Any]) -> MemoryGovernor | None:
+        """Cria o governador do orçamento de memória (`memory_budget_mb`), se configurado."""
+        budget_mb = float(export_config.get("memory_budget_mb") or 0)
+        if budget_mb <= 0:
+            return None
+        return MemoryGovernor(
+            int(budget_mb * 1024**2),
+            max_concurrency=int(export_config.get("max_workers") or 1),
+        )
+
+    def _open_result_batches(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+        params: Sequence[Any],
+    ) -> CachedResult | None:
+        """Retorna a descrição das colunas e os lotes do resultado, do cache ou do banco.
+
+        Retorna `None` quando a consulta não possui linhas. Com a opção `cache` ativa, o
+        resultado lido do banco é gravado no cache à medida que os lotes são exportados.
+        """
+        cache_key = self._build_cache_key(value, db_handler, export_config, params)
+        if cache_key and not export_config.get("refresh_cache"):
+            cached_result = self.result_cache.get(cache_key)
+            if cached_result:
+                self.logger.info(f"Query '{key}': resultado obtido do cache.")
+                return cached_result
+        chunksize = self._fetch_batch_size(export_config)
+        batches = db_handler.fetch_batches(value, chunksize, params)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return None
+        description = db_handler.column_description()
+        if not cache_key:
+            return description, chain([first_batch], batches)
+        return description, self._cache_result_batches(
+            key, cache_key, description, chain([first_batch], batches), export_config
+        )
+
+    def _cache_result_batches(
+        self,
+        key: str,
+        cache_key: str,
+        description: list[tuple[Any, ...]],
+        batches: Iterator[list[tuple[Any, ...]]],
+        export_config: dict[str, Any],
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Retorna os lotes gravando-os em uma nova entrada de cache à medida que são exportados.
+
+        O TTL da entrada é o da anotação `cache_ttl` da consulta ou o da configuração.
+        """
+        ttl = export_config.get("annotations", {}).get(key, {}).get("cache_ttl")
+        cache_entry = self.result_cache.create_entry(
+            cache_key, description, int(ttl or export_config["cache_ttl"])
+        )
+        return self._tee_to_cache(batches, cache_entry)
+
+    def _build_cache_key(
+        self,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+        params: Sequence[Any] = (),
+    ) -> str | None:
+        """Retorna a chave de cache da consulta, ou `None` se o cache não se aplicar a ela.
+
+        A chave inclui os ajustes da leitura que alteram os valores (`output_converters` e
+        `decimal_as`).
+        """
+        # Consultas parametrizadas (ex.: incrementais) dependem do estado e não são cacheadas
+        if not export_config.get("cache") or params:
+            return None
+        return self.result_cache.build_key(
+            db_handler.backend.server_name,
+            db_handler.backend.database,
+            value,
+            FetchTuning.from_options(export_config).value_fingerprint(),
+        )
+
+    def _is_result_cached(
+        self,
+        key: str,
+        value: str,
+        db_handler: DatabaseConnectionManager,
+        export_config: dict[str, Any],
+    ) -> bool:
+        """Indica se o resultado da consulta pode ser obtido do cache, sem acessar o banco."""
+        watermark = export_config.get("annotations", {}).get(key, {}).get("watermark")
+        if export_config.get("refresh_cache") or (watermark and export_config.get("incremental")):
+            return False
+        cache_key = self._build_cache_key(value, db_handler, export_config)
+        return bool(cache_key and self.result_cache.contains(cache_key))
+
+    def _tee_to_cache(
+        self, batches: Iterator[list[tuple[Any, ...]]], cache_entry: CacheEntryWriter
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Repassa os lotes ao exportador e os grava no cache, confirmando a entrada ao final."""
+        with cache_entry:
+            for batch in batches:
+                cache_entry.write_batch(batch)
+                yield batch
+            cache_entry.commit()
 
     def _check_client_key_in_general_rules(self, selected_client: str) -> bool:
         """Verifica se o cliente selecionado está dentro de `general_rules`."""
@@ -201,10 +1452,19 @@ class ExporterService(BaseClass):
             response = input(f"{self.arrow} Digite uma opção válida {self.choice_0_1}: ")
         return str(response)
 
-    def _generate_file_name(self, selected_client: str) -> str:
-        """Gera o nome do arquivo com base na chave selecionada e na escolha do usuário."""
+    def _generate_file_name(
+        self, selected_client: str, *, add_date_to_filename: bool | None = None
+    ) -> str:
+        """Gera o nome do arquivo com base na chave selecionada e na escolha do usuário.
+
+        Quando `add_date_to_filename` é informado, a decisão não é solicitada ao usuário.
+        """
         if not self._check_client_key_in_general_rules(selected_client):
             return f"{selected_client}.csv"
+        if add_date_to_filename is not None:
+            if add_date_to_filename:
+                return f"{self._generate_formatted_datetime()}_{selected_client}.csv"
+            return f"{selected_client}.csv"
         user_decision = self._ensure_valid_response(
             input(
                 f"{self.arrow} Deseja adicionar a data no início do nome do arquivo? "
@@ -230,8 +1490,8 @@ class ExporterService(BaseClass):
             self.logger.debug(f"Resposta capturada: {response}")
             return response == "1"
 
-    def _get_output_path(self, selected_client: str) -> Path:
-        """Retorna o caminho de saída formatado com a data atual."""
+    def _get_output_path(self) -> Path:
+        """Retorna o caminho de saída formatado com a data atual (`EXPORT_DIR/<AAAAMMDD>`)."""
         export_folder = Path(EXPORT_DIR)
 
         if not export_folder.exists():
@@ -239,24 +1499,30 @@ class ExporterService(BaseClass):
             export_folder.mkdir(parents=True, exist_ok=True)
             # (export_folder / ".gitkeep").touch()
 
-        file_name = self._generate_file_name(selected_client)
-        return export_folder / file_name
+        return export_folder / self._generate_formatted_datetime()
 
     def _create_export_config(self, export_config: dict[str, Any]) -> dict[str, Any]:
         """Cria um objeto ExportConfig com base na configuração fornecida."""
         return {
-            "output_path": self._get_output_path(export_config["client_name"]),
+            "output_path": self._get_output_path(),
             "client_name": export_config["client_name"],
-            # "encoding": export_config["encoding"],
-            # quotechar=export_config["quotechar"],
-            # delimiter=export_config["delimiter"],
-            # contains_data=config["contains_data"],
+            **{key: export_config[key] for key in DEFAULT_EXPORT_OPTIONS},
         }
 
     def _initialize_database_handler(
         self, export_config: dict[str, Any]
     ) -> DatabaseConnectionManager:
-        """Cria um handler de banco de dados com base na configuração."""
+        """Cria um handler de banco de dados com base na configuração.
+
+        Com `pool_size` > 0, as conexões são obtidas do pool compartilhado da string de conexão.
+        Os ajustes da leitura (`arraysize`, `output_converters`, `packet_size` e `decimal_as`) são
+        aplicados às conexões ODBC. Nos modos embarcados, o handler abre o arquivo do banco do
+        cliente, sem pool.
+        """
+        if self.execution_mode in EMBEDDED_BACKENDS:
+            return DatabaseConnectionManager(
+                create_embedded_backend(self.execution_mode, export_config["database"])
+            )
         conn_string = ConnectionString(
             server_name=export_config["server_name"],
             username=export_config["username"],
@@ -264,7 +1530,19 @@ class ExporterService(BaseClass):
             database=export_config["database"],
         )
         self.logger.debug(f"conn_string: {conn_string.dump_connection()}")
-        return DatabaseConnectionManager(conn_string)
+        backend = OdbcBackend(conn_string, FetchTuning.from_options(export_config))
+        pool_size = int(export_config.get("pool_size") or 0)
+        if pool_size <= 0:
+            return DatabaseConnectionManager(backend)
+        pool = get_connection_pool(
+            conn_string.connection_string,
+            max_size=pool_size,
+            min_size=int(export_config.get("pool_min_size") or 0),
+            idle_timeout=float(export_config["pool_idle_timeout"]),
+            pre_ping=bool(export_config.get("pool_pre_ping")),
+            attrs_before=backend.tuning.attrs_before(),
+        )
+        return DatabaseConnectionManager(backend, pool)
 
     def dump_export_config(self, export_config: dict[str, Any]) -> str:
         """Retorna a configuração de exportação como uma string JSON."""
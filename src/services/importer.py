@@ -0,0 +1,681 @@
+"""Módulo da importação de arquivos CSV para tabelas do banco de dados dos clientes.
+
+Os arquivos são lidos em lotes (`CsvBatchReader`) e inseridos por `executemany` parametrizado,
+com `fast_executemany` no ODBC, confirmando a transação a cada `commit_batches` lotes. Apenas um
+lote permanece em memória por vez, de modo que o consumo não depende do tamanho do arquivo. Com
+`create_table`, a tabela inexistente é criada com os tipos inferidos dos valores do arquivo. Com
+`max_workers` > 1, os arquivos são importados em paralelo, cada um com a sua própria conexão, e
+com `split_processes` > 1, os arquivos grandes são divididos em trechos importados por processos
+paralelos. Pode ser executado diretamente:
+
+    python -m src.services.importer --client cliente_a
+    python -m src.services.importer --client cliente_a --files vendas.csv --table dbo.VENDAS
+    python -m src.services.importer --client cliente_a --files vendas.csv --ddl-only
+    python -m src.services.importer --client cliente_a --max-workers 8 --create-table
+    python -m src.services.importer --client cliente_a --files grande.csv --split-processes 8
+"""
+
+import argparse
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import repeat
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.common.base.base_class import BaseClass
+from src.common.instrumentation import RunInstrumentation
+from src.common.memory_governor import select_memory_probe
+from src.config.constants import DEFAULT_IMPORT_OPTIONS, IMPORT_DIR
+from src.infrastructure.logger import LoggerSingleton
+from src.repositories.csv_reader import CsvBatchReader
+from src.repositories.csv_splitter import ByteRange, split_csv_ranges
+from src.repositories.encoding_detector import AUTO_ENCODING, detect_encoding
+from src.repositories.schema_inference import TableSchema, infer_csv_schema
+from src.services.exporter import ExporterService
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from src.infrastructure.database.database_connection_manager import DatabaseConnectionManager
+
+INSERT_QUERY_TEMPLATE: str = "INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+"""Instrução parametrizada que insere uma linha do CSV na tabela de destino."""
+
+
+def import_range_worker(
+    client_name: str,
+    csv_file: Path,
+    table: str,
+    options: dict[str, Any],
+    byte_range: ByteRange,
+) -> dict[str, Any]:
+    """Importa um trecho do arquivo em um processo worker e retorna o seu resumo.
+
+    Erros são devolvidos no resumo (`error`), como em `import_file_summary`, para que a falha de
+    um trecho não dependa da serialização da exceção entre processos.
+    """
+    summary = ImporterService().import_file_summary(
+        client_name, csv_file, table, options, byte_range=byte_range
+    )
+    summary["range"] = list(byte_range)
+    return summary
+
+
+class ImportProgress:
+    """Progresso acumulado da importação de vários arquivos, atualizado a cada arquivo concluído."""
+
+    def __init__(self, total: int) -> None:
+        """Inicializa o progresso com a quantidade de arquivos a importar."""
+        self.total: int = total
+        """Quantidade de arquivos a importar."""
+
+        self.done: int = 0
+        """Quantidade de arquivos concluídos, com ou sem erro."""
+
+        self.failed: int = 0
+        """Quantidade de arquivos com erro."""
+
+        self.rows: int = 0
+        """Linhas importadas dos arquivos concluídos."""
+
+        self.bytes: int = 0
+        """Bytes dos arquivos importados."""
+
+        self.started_at: float = time.perf_counter()
+        """Início da importação, para o cálculo da vazão acumulada."""
+
+    def add(self, summary: dict[str, Any]) -> None:
+        """Acumula o resumo de um arquivo concluído."""
+        self.done += 1
+        self.failed += bool(summary["error"])
+        self.rows += summary["rows"]
+        self.bytes += summary["bytes"]
+
+    def describe(self) -> str:
+        """Descreve os arquivos concluídos, as linhas e a vazão acumulada desde o início."""
+        elapsed = time.perf_counter() - self.started_at
+        rows_per_second = self.rows / elapsed if elapsed else 0.0
+        megabytes_per_second = self.bytes / 1024**2 / elapsed if elapsed else 0.0
+        return (
+            f"Progresso: {self.done}/{self.total} arquivos ({self.failed} com erro), "
+            f"{self.rows} linhas, {rows_per_second:,.0f} linhas/s, "
+            f"{megabytes_per_second:.1f} MB/s."
+        )
+
+
+class ImporterService(BaseClass):
+    """Importa arquivos CSV para tabelas do banco de dados de um cliente, sem interação."""
+
+    def __init__(self, exporter: ExporterService | None = None) -> None:
+        """Inicializa o serviço com a configuração e as conexões dos clientes."""
+        self.logger: Logger = LoggerSingleton.logger or LoggerSingleton.get_logger()
+        """Logger singleton para registrar eventos e erros."""
+
+        self.exporter: ExporterService = exporter or ExporterService()
+        """Serviço de exportação, que fornece a configuração e a conexão dos clientes."""
+
+        self._table_locks: dict[str, threading.Lock] = {}
+        self._table_locks_guard = threading.Lock()
+
+    def import_client(
+        self, client_name: str, options: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Importa os arquivos `.csv` da pasta do cliente em `IMPORT_DIR` e retorna os resumos.
+
+        Cada arquivo é importado para a tabela com o seu nome, como em `import_files`.
+        """
+        csv_files = sorted((Path(IMPORT_DIR) / client_name).glob("*.csv"))
+        if not csv_files:
+            self.logger.warning(f"Nenhum arquivo CSV em '{Path(IMPORT_DIR) / client_name}'.")
+        return self.import_files(client_name, csv_files, options=options)
+
+    def import_files(
+        self,
+        client_name: str,
+        csv_files: list[Path],
+        table: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Importa os arquivos e retorna os resumos na ordem dos arquivos.
+
+        Com `max_workers` > 1, até `max_workers` arquivos são importados simultaneamente, cada um
+        com a sua própria conexão; com pool, os workers são limitados a `pool_size`, para que
+        nenhum aguarde uma conexão até `acquire_timeout`. A falha de um arquivo é registrada no
+        seu resumo (`error`) e não interrompe os demais. O progresso e a vazão acumulada são
+        registrados a cada arquivo concluído.
+        """
+        import_config = self._resolve_import_options(client_name, options)
+        workers = self._limit_workers_to_pool(
+            client_name, min(int(import_config["max_workers"] or 1), len(csv_files))
+        )
+        progress = ImportProgress(len(csv_files))
+        summaries: list[dict[str, Any] | None] = [None] * len(csv_files)
+        completed = (
+            self._import_concurrently(client_name, csv_files, table, options, workers)
+            if workers > 1
+            else (
+                (index, self.import_file_summary(client_name, csv_file, table, options))
+                for index, csv_file in enumerate(csv_files)
+            )
+        )
+        for index, summary in completed:
+            summaries[index] = summary
+            progress.add(summary)
+            self.logger.info(progress.describe())
+        if progress.failed:
+            failures = "".join(
+                f"\n  {Path(summary['file']).name} ({summary['table']}): {summary['error']}"
+                for summary in summaries
+                if summary is not None and summary["error"]
+            )
+            self.logger.error(f"{progress.failed} de {progress.total} arquivos falharam:{failures}")
+        return [summary for summary in summaries if summary is not None]
+
+    def _limit_workers_to_pool(self, client_name: str, workers: int) -> int:
+        """Limita os workers ao tamanho do pool de conexões do cliente, quando houver."""
+        if workers <= 1:
+            return workers
+        try:
+            pool = self.exporter.client_database_handler(client_name).pool
+        except KeyError:
+            # O cliente inexistente é registrado no resumo de cada arquivo
+            return workers
+        if pool is None or workers <= pool.max_size:
+            return workers
+        self.logger.warning(
+            f"max_workers ({workers}) limitado ao tamanho do pool de conexões ({pool.max_size})."
+        )
+        return pool.max_size
+
+    def import_file_summary(
+        self,
+        client_name: str,
+        csv_file: Path,
+        table: str | None = None,
+        options: dict[str, Any] | None = None,
+        *,
+        byte_range: ByteRange | None = None,
+    ) -> dict[str, Any]:
+        """Importa o arquivo como `import_file`, devolvendo o erro no resumo em vez de lançá-lo.
+
+        O erro registrado é o original do driver (ex.: coluna inexistente), e não o `RuntimeError`
+        que o encapsula no `DatabaseConnectionManager`.
+        """
+        started_at = time.perf_counter()
+        try:
+            return self.import_file(client_name, csv_file, table, options, byte_range=byte_range)
+        except Exception as e:
+            self.logger.exception(f"Erro ao importar o arquivo '{csv_file}'.")
+            return {
+                "file": str(csv_file),
+                "table": table or csv_file.stem,
+                "rows": 0,
+                "batches": 0,
+                "bytes": 0,
+                "elapsed": round(time.perf_counter() - started_at, 3),
+                "rows_per_second": 0.0,
+                "peak_memory_mb": 0.0,
+                "encoding": None,
+                "created_table": False,
+                "ddl": None,
+                "inference_time": 0.0,
+                "error": repr(e.__cause__ or e),
+            }
+
+    def import_file(
+        self,
+        client_name: str,
+        csv_file: Path,
+        table: str | None = None,
+        options: dict[str, Any] | None = None,
+        *,
+        byte_range: ByteRange | None = None,
+    ) -> dict[str, Any]:
+        """Importa um arquivo CSV para a tabela (por padrão, o nome do arquivo) do cliente.
+
+        A tabela deve existir, com as colunas do cabeçalho do arquivo, ou é criada com os tipos
+        inferidos se `create_table` estiver ativo; o nome pode incluir o schema (ex.:
+        `dbo.VENDAS`). Retorna um resumo com as linhas, o tempo decorrido, a vazão
+        (linhas/s), o pico de memória do processo e as etapas de leitura, inserção e confirmação.
+
+        Com `split_processes` > 1, o arquivo com pelo menos `split_min_mb` MB é importado em
+        trechos paralelos (ver `_import_file_ranges`). Com `byte_range`, apenas os registros do
+        trecho são importados.
+        """
+        import_config = self._resolve_file_encoding(
+            csv_file, self._resolve_import_options(client_name, options)
+        )
+        table = table or csv_file.stem
+        processes = int(import_config["split_processes"] or 1)
+        if (
+            byte_range is None
+            and processes > 1
+            and csv_file.stat().st_size >= float(import_config["split_min_mb"]) * 1024**2
+        ):
+            return self._import_file_ranges(client_name, csv_file, table, import_config, processes)
+        db_handler = self.exporter.client_database_handler(client_name)
+        instrumentation = RunInstrumentation()
+        db_handler.stages = instrumentation.for_query(table)
+        summary = self._load_file(db_handler, csv_file, table, import_config, byte_range)
+        summary["stages"] = instrumentation.query_stages(table)
+        return summary
+
+    def infer_schema(
+        self,
+        client_name: str,
+        csv_file: Path,
+        table: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[TableSchema, str]:
+        """Infere o esquema do arquivo e retorna-o com o `CREATE TABLE` da tabela, sem executá-lo.
+
+        A conexão do cliente não é aberta: apenas a delimitação dos nomes do banco é utilizada.
+        """
+        import_config = self._resolve_file_encoding(
+            csv_file, self._resolve_import_options(client_name, options)
+        )
+        db_handler = self.exporter.client_database_handler(client_name)
+        schema = self._infer_schema(csv_file, import_config)
+        ddl = schema.create_table_ddl(
+            self._quote_table(db_handler, table or csv_file.stem), db_handler.quote_identifier
+        )
+        return schema, ddl
+
+    def _import_concurrently(
+        self,
+        client_name: str,
+        csv_files: list[Path],
+        table: str | None,
+        options: dict[str, Any] | None,
+        workers: int,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Importa os arquivos em `workers` threads e retorna a posição e o resumo de cada um.
+
+        Os arquivos são submetidos dos maiores para os menores, para que um arquivo grande
+        submetido por último não prolongue a importação com os demais workers ociosos.
+        """
+        self.logger.info(f"Importando {len(csv_files)} arquivos com {workers} workers.")
+        sizes = [csv_file.stat().st_size if csv_file.is_file() else 0 for csv_file in csv_files]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="importer") as executor:
+            futures = {
+                executor.submit(
+                    self.import_file_summary, client_name, csv_files[index], table, options
+                ): index
+                for index in sorted(range(len(csv_files)), key=sizes.__getitem__, reverse=True)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    @contextmanager
+    def _table_lock(self, table: str) -> Iterator[None]:
+        """Bloqueia a tabela para os demais workers (ex.: durante a verificação e a criação)."""
+        with self._table_locks_guard:
+            lock = self._table_locks.setdefault(table.casefold(), threading.Lock())
+        with lock:
+            yield
+
+    def _resolve_file_encoding(
+        self, csv_file: Path, import_config: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Substitui `encoding: auto` pela codificação detectada do arquivo (ver `detect_encoding`).
+
+        Os trechos de um arquivo dividido recebem a codificação já detectada.
+        """
+        if import_config["encoding"] != AUTO_ENCODING:
+            return import_config
+        started_at = time.perf_counter()
+        detected = detect_encoding(csv_file)
+        self.logger.info(
+            f"Codificação de '{csv_file.name}': {detected.encoding} ({detected.method}, "
+            f"confiança {detected.confidence:.2f}) em {time.perf_counter() - started_at:.3f} s."
+        )
+        return {**import_config, "encoding": detected.encoding}
+
+    def _import_file_ranges(
+        self,
+        client_name: str,
+        csv_file: Path,
+        table: str,
+        import_config: dict[str, Any],
+        processes: int,
+    ) -> dict[str, Any]:
+        """Importa o arquivo dividido em até `processes` trechos, cada um em um processo.
+
+        A tabela é criada (com `create_table`) antes da divisão. Cada processo abre a sua conexão
+        e confirma as suas transações; a falha de um trecho é registrada no resumo (`error`), e as
+        linhas dos demais permanecem na tabela. As linhas do resumo são a soma das linhas de cada
+        trecho, e o pico de memória, a soma dos picos dos processos.
+        """
+        started_at = time.perf_counter()
+        schema: TableSchema | None = None
+        ddl: str | None = None
+        if import_config["create_table"]:
+            db_handler = self.exporter.client_database_handler(client_name)
+            with db_handler:
+                schema, ddl = self._create_missing_table(db_handler, csv_file, table, import_config)
+        byte_ranges = split_csv_ranges(
+            csv_file, processes, import_config["encoding"], import_config["quotechar"]
+        )
+        self.logger.info(
+            f"Importando '{csv_file}' em {len(byte_ranges)} trechos, em processos paralelos."
+        )
+        range_options = {**import_config, "create_table": False, "split_processes": 1}
+        with ProcessPoolExecutor(max_workers=max(len(byte_ranges), 1)) as executor:
+            range_summaries = list(
+                executor.map(
+                    import_range_worker,
+                    repeat(client_name),
+                    repeat(csv_file),
+                    repeat(table),
+                    repeat(range_options),
+                    byte_ranges,
+                )
+            )
+        rows = sum(summary["rows"] for summary in range_summaries)
+        errors = [
+            f"trecho {summary['range']}: {summary['error']}"
+            for summary in range_summaries
+            if summary["error"]
+        ]
+        if errors:
+            self.logger.error(
+                f"{len(errors)} de {len(byte_ranges)} trechos de '{csv_file}' falharam; as "
+                f"{rows} linhas dos demais permanecem na tabela."
+            )
+        elapsed = time.perf_counter() - started_at
+        rows_per_second = rows / elapsed if elapsed else 0.0
+        self.logger.info(
+            f"Arquivo '{csv_file.name}' importado em '{table}' por {len(byte_ranges)} processos: "
+            f"{rows} linhas em {elapsed:.3f} s ({rows_per_second:,.0f} linhas/s)."
+        )
+        return {
+            "file": str(csv_file),
+            "table": table,
+            "rows": rows,
+            "batches": sum(summary["batches"] for summary in range_summaries),
+            "bytes": csv_file.stat().st_size,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(rows_per_second, 1),
+            "peak_memory_mb": round(
+                sum(summary["peak_memory_mb"] for summary in range_summaries), 1
+            ),
+            "encoding": import_config["encoding"],
+            "created_table": schema is not None,
+            "ddl": ddl,
+            "inference_time": round(schema.elapsed, 3) if schema else 0.0,
+            "error": "; ".join(errors) or None,
+            "ranges": range_summaries,
+        }
+
+    def _resolve_import_options(
+        self, client_name: str, options: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        """Mescla as opções de importação padrão, globais (`import`), do cliente e informadas."""
+        import_options = DEFAULT_IMPORT_OPTIONS.copy()
+        import_options.update(self.exporter.global_config.get("import") or {})
+        client_config = self.exporter.data_sources_config.get(client_name) or {}
+        import_options.update(client_config.get("import") or {})
+        import_options.update(options or {})
+        return import_options
+
+    def _load_file(
+        self,
+        db_handler: "DatabaseConnectionManager",
+        csv_file: Path,
+        table: str,
+        import_config: dict[str, Any],
+        byte_range: ByteRange | None = None,
+    ) -> dict[str, Any]:
+        """Insere o arquivo (ou o trecho) na tabela em lotes, a cada `commit_batches` lotes.
+
+        Em caso de erro, a transação em andamento é desfeita; os lotes já confirmados permanecem
+        na tabela. Com `create_table`, a tabela inexistente é criada (e confirmada) antes do
+        primeiro lote.
+        """
+        batch_size = int(import_config["batch_size"])
+        commit_batches = max(int(import_config["commit_batches"]), 1)
+        stages = db_handler.stages
+        _, memory_usage = select_memory_probe()
+        peak_memory = memory_usage()
+        rows = batches = committed_rows = 0
+        schema: TableSchema | None = None
+        ddl: str | None = None
+        started_at = time.perf_counter()
+        self.logger.info(f"Importando '{csv_file}' para a tabela '{table}'...")
+        with (
+            CsvBatchReader.from_options(csv_file, import_config, byte_range) as reader,
+            db_handler,
+        ):
+            quoted_table = self._quote_table(db_handler, table)
+            insert_query = self._insert_query(db_handler, quoted_table, reader.columns)
+            batch_iterator = reader.batches(batch_size)
+            try:
+                if import_config["create_table"]:
+                    schema, ddl = self._create_missing_table(
+                        db_handler, csv_file, table, import_config
+                    )
+                while True:
+                    with stages.stage("read") as metrics:
+                        batch = next(batch_iterator, None)
+                        metrics.rows = len(batch or ())
+                    if not batch:
+                        break
+                    with stages.stage("insert") as metrics:
+                        db_handler.execute_many(insert_query, batch)
+                        metrics.rows = len(batch)
+                    rows += len(batch)
+                    batches += 1
+                    if batches % commit_batches == 0:
+                        with stages.stage("commit"):
+                            db_handler.commit()
+                        committed_rows = rows
+                    peak_memory = max(peak_memory, memory_usage())
+                with stages.stage("commit"):
+                    db_handler.commit()
+            except BaseException:
+                db_handler.rollback()
+                self.logger.error(  # noqa: TRY400
+                    f"Importação de '{csv_file}' interrompida: {committed_rows} linhas "
+                    "confirmadas permanecem na tabela."
+                )
+                raise
+        elapsed = time.perf_counter() - started_at
+        rows_per_second = rows / elapsed if elapsed else 0.0
+        self.logger.info(
+            f"Arquivo '{csv_file.name}' importado em '{table}': {rows} linhas em {elapsed:.3f} s "
+            f"({rows_per_second:,.0f} linhas/s, pico de {peak_memory / 1024**2:.1f} MB)."
+        )
+        return {
+            "file": str(csv_file),
+            "table": table,
+            "rows": rows,
+            "batches": batches,
+            "bytes": byte_range[1] - byte_range[0] if byte_range else csv_file.stat().st_size,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(rows_per_second, 1),
+            "peak_memory_mb": round(peak_memory / 1024**2, 1),
+            "encoding": import_config["encoding"],
+            "created_table": schema is not None,
+            "ddl": ddl,
+            "inference_time": round(schema.elapsed, 3) if schema else 0.0,
+            "error": None,
+        }
+
+    def _create_missing_table(
+        self,
+        db_handler: "DatabaseConnectionManager",
+        csv_file: Path,
+        table: str,
+        import_config: dict[str, Any],
+    ) -> tuple[TableSchema | None, str | None]:
+        """Cria a tabela com os tipos inferidos do arquivo, se ela não existir.
+
+        Retorna o esquema inferido e o `CREATE TABLE` executado, ou `None` se a tabela já existia.
+        Os arquivos importados simultaneamente para a mesma tabela aguardam a sua criação.
+        """
+        quoted_table = self._quote_table(db_handler, table)
+        with self._table_lock(table):
+            if db_handler.table_exists(quoted_table):
+                return None, None
+            with db_handler.stages.stage("infer") as metrics:
+                schema = self._infer_schema(csv_file, import_config)
+                metrics.rows = schema.rows
+            ddl = schema.create_table_ddl(quoted_table, db_handler.quote_identifier)
+            self.logger.info(f"Criando a tabela '{table}':\n{ddl}")
+            db_handler.execute(ddl)
+            db_handler.commit()
+        return schema, ddl
+
+    def _infer_schema(self, csv_file: Path, import_config: dict[str, Any]) -> TableSchema:
+        """Infere os tipos das colunas do arquivo, com a amostra de `infer_rows` linhas."""
+        self.logger.info(f"Inferindo os tipos das colunas de '{csv_file}'...")
+        schema = infer_csv_schema(
+            csv_file, import_config, max_rows=int(import_config["infer_rows"] or 0)
+        )
+        self.logger.info(
+            f"Tipos de {len(schema.columns)} colunas inferidos de {schema.rows} linhas em "
+            f"{schema.elapsed:.3f} s."
+        )
+        return schema
+
+    @staticmethod
+    def _quote_table(db_handler: "DatabaseConnectionManager", table: str) -> str:
+        """Delimita cada parte do nome da tabela (ex.: `dbo.VENDAS` -> `[dbo].[VENDAS]`)."""
+        return ".".join(db_handler.quote_identifier(part) for part in table.split("."))
+
+    def _insert_query(
+        self, db_handler: "DatabaseConnectionManager", table: str, columns: list[str]
+    ) -> str:
+        """Monta o `INSERT` parametrizado da tabela (já delimitada), com as colunas delimitadas."""
+        return INSERT_QUERY_TEMPLATE.format(
+            table=table,
+            columns=", ".join(db_handler.quote_identifier(column) for column in columns),
+            placeholders=", ".join("?" * len(columns)),
+        )
+
+    def print_summary(self, summaries: list[dict[str, Any]], elapsed: float | None = None) -> None:
+        """Imprime o resumo por arquivo, o total e os erros dos arquivos que falharam.
+
+        Cada erro é listado com o arquivo, a tabela de destino e a causa informada pelo banco.
+
+        Com `elapsed` (tempo total da importação), o total inclui a vazão acumulada.
+        """
+        super()._separator_line()
+        print(
+            f"{'Arquivo':<30} {'Tabela':<24} {'Status':<8} {'Linhas':>14} {'Linhas/s':>12} "
+            f"{'Tempo (s)':>10}"
+        )
+        for summary in summaries:
+            status = "ERRO" if summary["error"] else "OK"
+            print(
+                f"{Path(summary['file']).name:<30} {summary['table']:<24} {status:<8} "
+                f"{summary['rows']:>14} {summary['rows_per_second']:>12,.0f} "
+                f"{summary['elapsed']:>10}"
+            )
+        super()._separator_line()
+        total_rows = sum(summary["rows"] for summary in summaries)
+        failures = [summary for summary in summaries if summary["error"]]
+        throughput = f", {total_rows / elapsed:,.0f} linhas/s em {elapsed:.3f} s" if elapsed else ""
+        print(
+            f"Total: {len(summaries) - len(failures)} de {len(summaries)} arquivos importados, "
+            f"{total_rows} linhas{throughput}."
+        )
+        for summary in failures:
+            print(f"  ERRO {summary['file']} ({summary['table']}): {summary['error']}")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Interpreta os argumentos de linha de comando da importação."""
+    parser = argparse.ArgumentParser(description="Importa arquivos CSV para o banco do cliente.")
+    parser.add_argument("--client", required=True, help="Cliente de `data_sources` de destino.")
+    parser.add_argument(
+        "--files",
+        nargs="+",
+        type=Path,
+        help="Arquivos CSV importados (padrão: os `.csv` da pasta do cliente em `IMPORT_DIR`).",
+    )
+    parser.add_argument("--table", help="Tabela de destino dos arquivos de `--files`.")
+    parser.add_argument("--batch-size", type=int, help="Linhas inseridas por lote.")
+    parser.add_argument("--commit-batches", type=int, help="Lotes por transação.")
+    parser.add_argument("--max-workers", type=int, help="Arquivos importados em paralelo.")
+    parser.add_argument(
+        "--split-processes", type=int, help="Processos que importam trechos de um arquivo grande."
+    )
+    parser.add_argument(
+        "--split-min-mb", type=float, help="Tamanho mínimo (MB) do arquivo dividido em trechos."
+    )
+    parser.add_argument("--encoding", help="Codificação dos arquivos ('auto' para detectá-la).")
+    parser.add_argument("--delimiter", help="Delimitador dos arquivos.")
+    parser.add_argument("--quotechar", help="Caractere de aspas dos arquivos.")
+    parser.add_argument(
+        "--keep-empty", action="store_true", help="Grava os campos vazios como texto vazio."
+    )
+    parser.add_argument(
+        "--create-table",
+        action="store_true",
+        help="Cria as tabelas inexistentes com os tipos inferidos dos arquivos.",
+    )
+    parser.add_argument(
+        "--infer-rows", type=int, help="Linhas analisadas na inferência (0 para todas)."
+    )
+    parser.add_argument(
+        "--ddl-only",
+        action="store_true",
+        help="Apenas imprime o `CREATE TABLE` inferido de cada arquivo, sem importá-lo.",
+    )
+    parser.add_argument("--summary-file", type=Path, help="Grava o resumo em um arquivo JSON.")
+    args = parser.parse_args(argv)
+    if args.table and not args.files:
+        parser.error("--table requer os arquivos em --files.")
+    if args.ddl_only and not args.files:
+        parser.error("--ddl-only requer os arquivos em --files.")
+    return args
+
+
+def _build_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Converte os argumentos informados em opções de importação."""
+    options: dict[str, Any] = {
+        "batch_size": args.batch_size,
+        "commit_batches": args.commit_batches,
+        "max_workers": args.max_workers,
+        "split_processes": args.split_processes,
+        "split_min_mb": args.split_min_mb,
+        "encoding": args.encoding,
+        "delimiter": args.delimiter,
+        "quotechar": args.quotechar,
+        "empty_as_null": False if args.keep_empty else None,
+        "create_table": True if args.create_table else None,
+        "infer_rows": args.infer_rows,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Executa a importação e retorna `1` caso algum arquivo tenha falhado."""
+    args = _parse_args(argv)
+    importer = ImporterService()
+    options = _build_options(args)
+    if args.ddl_only:
+        for csv_file in args.files:
+            _, ddl = importer.infer_schema(args.client, csv_file, args.table, options)
+            print(f"{ddl};")
+        return 0
+    started_at = time.perf_counter()
+    if args.files:
+        summaries = importer.import_files(args.client, args.files, args.table, options)
+    else:
+        summaries = importer.import_client(args.client, options)
+    importer.print_summary(summaries, time.perf_counter() - started_at)
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        args.summary_file.write_text(json.dumps(summaries, indent=4), encoding="utf-8")
+    return int(any(summary["error"] for summary in summaries))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Scripts de medição de desempenho da exportação, executados fora da aplicação."""
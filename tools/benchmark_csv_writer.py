@@ -0,0 +1,180 @@
+"""Compara a vazão (linhas/s) dos escritores de CSV via pandas e via módulo `csv`.
+
+Gera com o `faker` lotes de linhas no formato retornado pelo cursor (tuplas com inteiros, textos,
+decimais, datas e `NULL`), grava o mesmo resultado com os dois escritores e confere se os
+arquivos gerados são idênticos. Compara também, coluna a coluna, o CSV do módulo `csv` com o da
+exportação legada (`pd.read_sql_query` e `to_csv`), listando as colunas que diferem com um
+exemplo. Execute a partir da raiz do projeto:
+
+    python -m tools.benchmark_csv_writer --rows 500000 --chunksize 50000
+"""
+
+import argparse
+import csv
+import datetime as dt
+import decimal
+from itertools import chain
+from pathlib import Path
+import random
+import tempfile
+import time
+from typing import Any
+
+from faker import Faker
+import pandas as pd
+
+from src.config.constants import DEFAULT_EXPORT_OPTIONS, STREAM_CHUNKSIZE
+from src.repositories.export_writers import (
+    CsvExportWriter,
+    ExportWriter,
+    NativeCsvExportWriter,
+    get_csv_quote_params,
+)
+
+DESCRIPTION: list[tuple[Any, ...]] = [
+    ("id", int, None, 10, 10, 0, False),
+    ("nome", str, None, 100, 100, 0, False),
+    ("email", str, None, 100, 100, 0, True),
+    ("valor", decimal.Decimal, None, 18, 18, 2, True),
+    ("quantidade", int, None, 10, 10, 0, True),
+    ("desconto", float, None, 53, 53, 0, True),
+    ("criado_em", dt.datetime, None, 23, 23, 3, False),
+    ("atualizado_em", dt.datetime, None, 27, 27, 7, True),
+    ("nascimento", dt.date, None, 10, 10, 0, True),
+    ("ativo", bool, None, 1, 1, 0, False),
+]
+"""Descrição das colunas geradas, no formato de `cursor.description`."""
+
+
+def generate_batches(rows: int, chunksize: int, seed: int = 42) -> list[list[tuple[Any, ...]]]:
+    """Gera os lotes de linhas falsas, com cerca de 10% de `NULL` nas colunas anuláveis."""
+    fake = Faker("pt_BR")
+    Faker.seed(seed)
+    rng = random.Random(seed)  # noqa: S311
+
+    def nullable(value: Any) -> Any:
+        return None if rng.random() < 0.1 else value  # noqa: PLR2004
+
+    batches: list[list[tuple[Any, ...]]] = []
+    for start in range(0, rows, chunksize):
+        batches.append(
+            [
+                (
+                    row_id,
+                    fake.name(),
+                    nullable(fake.email()),
+                    nullable(decimal.Decimal(rng.randint(0, 10_000_000)) / 100),
+                    nullable(rng.randint(0, 1_000)),
+                    nullable(round(rng.random(), 4)),
+                    fake.date_time_between("-5y").replace(microsecond=rng.randint(0, 999) * 1000),
+                    nullable(
+                        fake.date_time_between("-1y").replace(microsecond=rng.randint(1, 10**6 - 1))
+                    ),
+                    nullable(fake.date_of_birth()),
+                    rng.random() < 0.5,  # noqa: PLR2004
+                )
+                for row_id in range(start, min(start + chunksize, rows))
+            ]
+        )
+    return batches
+
+
+def run_writer(
+    writer_class: type[ExportWriter],
+    output_file: Path,
+    batches: list[list[tuple[Any, ...]]],
+    export_config: dict[str, Any],
+) -> float:
+    """Grava os lotes com o escritor informado e retorna o tempo decorrido, em segundos."""
+    started_at = time.perf_counter()
+    with writer_class(output_file, DESCRIPTION, export_config) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return time.perf_counter() - started_at
+
+
+def write_legacy_csv(
+    output_file: Path, batches: list[list[tuple[Any, ...]]], export_config: dict[str, Any]
+) -> None:
+    """Grava o resultado completo como a exportação legada, via `DataFrame.to_csv`.
+
+    O DataFrame é montado como no `pd.read_sql_query`, com os decimais convertidos em `float`.
+    """
+    df = pd.DataFrame.from_records(
+        list(chain.from_iterable(batches)),
+        columns=[column[0] for column in DESCRIPTION],
+        coerce_float=True,
+    )
+    df.to_csv(
+        output_file,
+        encoding=export_config["encoding"],
+        index=False,
+        sep=export_config["delimiter"],
+        **get_csv_quote_params(export_config),
+    )
+
+
+def compare_columns(
+    legacy_file: Path, output_file: Path, export_config: dict[str, Any]
+) -> dict[str, tuple[str, str]]:
+    """Compara os arquivos coluna a coluna e retorna as colunas que diferem, com um exemplo."""
+    options = {"delimiter": export_config["delimiter"]}
+    with (
+        legacy_file.open(encoding=export_config["encoding"], newline="") as legacy,
+        output_file.open(encoding=export_config["encoding"], newline="") as output,
+    ):
+        differences: dict[str, tuple[str, str]] = {}
+        for legacy_row, output_row in zip(
+            csv.reader(legacy, **options), csv.reader(output, **options), strict=True
+        ):
+            for column, legacy_value, output_value in zip(
+                DESCRIPTION, legacy_row, output_row, strict=True
+            ):
+                if legacy_value != output_value:
+                    differences.setdefault(column[0], (legacy_value, output_value))
+    return differences
+
+
+def main() -> None:
+    """Executa o benchmark e imprime a vazão de cada escritor."""
+    parser = argparse.ArgumentParser(description="Benchmark dos escritores de CSV.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Quantidade de linhas.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=STREAM_CHUNKSIZE,
+        help="Linhas por lote.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada escritor.")
+    args = parser.parse_args()
+
+    print(f"Gerando {args.rows} linhas em lotes de {args.chunksize}...")
+    batches = generate_batches(args.rows, args.chunksize)
+    export_config = {**DEFAULT_EXPORT_OPTIONS, "compression": None}
+    writers: dict[str, type[ExportWriter]] = {
+        "pandas": CsvExportWriter,
+        "native": NativeCsvExportWriter,
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_files = {name: Path(temp_dir) / f"{name}.csv" for name in writers}
+        for name, writer_class in writers.items():
+            best = min(
+                run_writer(writer_class, output_files[name], batches, export_config)
+                for _ in range(args.repeat)
+            )
+            print(f"{name:<8} {best:>8.3f} s {args.rows / best:>14,.0f} linhas/s")
+        identical = output_files["pandas"].read_bytes() == output_files["native"].read_bytes()
+        print(f"Arquivos idênticos: {'sim' if identical else 'NÃO'}")
+        legacy_file = Path(temp_dir) / "legacy.csv"
+        write_legacy_csv(legacy_file, batches, export_config)
+        differences = compare_columns(legacy_file, output_files["native"], export_config)
+        print(
+            "Colunas diferentes da exportação legada: "
+            + ("nenhuma" if not differences else "(ver `CsvFormatPlan`)")
+        )
+        for column, (legacy_value, output_value) in differences.items():
+            print(f"  {column:<14} legado {legacy_value!r:<28} native {output_value!r}")
+
+
+if __name__ == "__main__":
+    main()
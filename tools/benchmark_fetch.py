@@ -0,0 +1,161 @@
+"""Compara a vazão (linhas/s) da leitura das consultas com cada ajuste de `FetchTuning`.
+
+Com `--client`, executa as consultas do `.sql` do cliente no banco configurado no `settings.yaml`
+uma vez para cada ajuste (`arraysize`, `packet_size`, `decimal_as` e `output_converters`),
+lendo o resultado completo via `fetchmany`, e imprime as linhas/s de cada um em relação ao
+padrão do driver. Sem `--client`, mede apenas o custo dos conversores de saída sobre valores
+brutos gerados localmente. Execute a partir da raiz do projeto:
+
+    python -m tools.benchmark_fetch --client cliente_a --chunksize 50000
+"""
+
+import argparse
+import decimal
+from pathlib import Path
+import random
+import time
+from typing import Any
+
+from src.config.constants import SQL_DIR, STREAM_CHUNKSIZE
+from src.infrastructure.database.fetch_tuning import (
+    DATETIMEOFFSET_STRUCT,
+    convert_datetimeoffset,
+    convert_decimal_to_float,
+    convert_nvarchar_max,
+)
+from src.repositories.sql_handler import SqlHandler
+from src.services.exporter import ExporterService
+
+TUNING_VARIANTS: dict[str, dict[str, Any]] = {
+    "padrão": {},
+    "arraysize": {"arraysize": 10_000},
+    "packet_size": {"packet_size": 32_767},
+    "decimal_float": {"decimal_as": "float"},
+    "nvarchar_max": {"output_converters": ["datetimeoffset", "nvarchar_max"]},
+    "todos": {
+        "arraysize": 10_000,
+        "packet_size": 32_767,
+        "decimal_as": "float",
+        "output_converters": ["datetimeoffset", "nvarchar_max"],
+    },
+}
+"""Ajustes comparados, aplicados sobre as opções do cliente sem os ajustes de leitura."""
+
+BASELINE_OPTIONS: dict[str, Any] = {
+    "arraysize": 0,
+    "packet_size": 0,
+    "decimal_as": "decimal",
+    "output_converters": ["datetimeoffset"],
+    "pool_size": 0,
+}
+"""Opções do ajuste `padrão`: padrões do driver e uma conexão nova por medição."""
+
+
+def generate_raw_values(rows: int, seed: int = 42) -> dict[str, list[bytes]]:
+    """Gera os bytes brutos recebidos pelos conversores de saída para cada tipo SQL."""
+    rng = random.Random(seed)  # noqa: S311
+    numeric_structs = [
+        bytes([18, 2, rng.random() < 0.9])  # noqa: PLR2004
+        + rng.randint(0, 10**12).to_bytes(16, "little")
+        for _ in range(rows)
+    ]
+    offsets = [
+        DATETIMEOFFSET_STRUCT.pack(
+            rng.randint(2000, 2030),
+            rng.randint(1, 12),
+            rng.randint(1, 28),
+            rng.randint(0, 23),
+            rng.randint(0, 59),
+            rng.randint(0, 59),
+            rng.randint(0, 999_999) * 1000,
+            -3,
+            0,
+        )
+        for _ in range(rows)
+    ]
+    texts = [
+        (f"Descrição {index} " * rng.randint(1, 20)).encode("utf-16-le") for index in range(rows)
+    ]
+    return {"decimal": numeric_structs, "datetimeoffset": offsets, "nvarchar_max": texts}
+
+
+def benchmark_converters(rows: int, repeat: int) -> None:
+    """Imprime a vazão de cada conversor de saída e da criação de `Decimal` equivalente."""
+    values = generate_raw_values(rows)
+    decimal_texts = [str(convert_decimal_to_float(value)) for value in values["decimal"]]
+    cases = {
+        "Decimal (padrão)": (decimal.Decimal, decimal_texts),
+        "decimal_as: float": (convert_decimal_to_float, values["decimal"]),
+        "datetimeoffset": (convert_datetimeoffset, values["datetimeoffset"]),
+        "nvarchar_max": (convert_nvarchar_max, values["nvarchar_max"]),
+    }
+    print(f"Conversores de saída ({rows} valores):")
+    for name, (converter, raw_values) in cases.items():
+        best = min(_time_converter(converter, raw_values) for _ in range(repeat))
+        print(f"  {name:<20} {best:>8.3f} s {rows / best:>14,.0f} valores/s")
+
+
+def _time_converter(converter: Any, raw_values: list[Any]) -> float:
+    """Aplica o conversor a todos os valores e retorna o tempo decorrido, em segundos."""
+    started_at = time.perf_counter()
+    for value in raw_values:
+        converter(value)
+    return time.perf_counter() - started_at
+
+
+def benchmark_client(client: str, chunksize: int, repeat: int) -> None:
+    """Lê as consultas do cliente com cada ajuste e imprime as linhas/s em relação ao padrão."""
+    exporter = ExporterService()
+    client_config = exporter._build_client_config(client)  # noqa: SLF001
+    queries = SqlHandler().sql_to_dict(Path(SQL_DIR) / f"{client}.sql")
+    print(f"Cliente '{client}' ({len(queries)} consultas, lotes de {chunksize} linhas):")
+    baseline = 0.0
+    for name, variant in TUNING_VARIANTS.items():
+        export_config = {**client_config, **BASELINE_OPTIONS, **variant}
+        db_handler = exporter._initialize_database_handler(export_config)  # noqa: SLF001
+        try:
+            rows, best = min(
+                (_time_fetch(db_handler, queries, chunksize) for _ in range(repeat)),
+                key=lambda result: result[1],
+            )
+        except (ConnectionError, RuntimeError) as e:
+            print(f"  {name:<14} falhou: {e.__cause__ or e}")
+            continue
+        throughput = rows / best if best else 0.0
+        baseline = baseline or throughput
+        gain = throughput / baseline - 1 if baseline else 0.0
+        print(f"  {name:<14} {best:>8.3f} s {throughput:>14,.0f} linhas/s {gain:>+8.1%}")
+
+
+def _time_fetch(db_handler: Any, queries: dict[str, str], chunksize: int) -> tuple[int, float]:
+    """Lê o resultado completo das consultas e retorna as linhas e o tempo decorrido."""
+    rows = 0
+    started_at = time.perf_counter()
+    with db_handler:
+        for query in queries.values():
+            for batch in db_handler.fetch_batches(query, chunksize):
+                rows += len(batch)
+    return rows, time.perf_counter() - started_at
+
+
+def main() -> None:
+    """Executa o benchmark dos conversores e, com `--client`, o da leitura das consultas."""
+    parser = argparse.ArgumentParser(description="Benchmark dos ajustes de leitura via ODBC.")
+    parser.add_argument("--client", help="Cliente do `settings.yaml` cujas consultas são lidas.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Valores por conversor.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=STREAM_CHUNKSIZE,
+        help="Linhas por lote.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada ajuste.")
+    args = parser.parse_args()
+
+    benchmark_converters(args.rows, args.repeat)
+    if args.client:
+        benchmark_client(args.client, args.chunksize, args.repeat)
+
+
+if __name__ == "__main__":
+    main()